@@ -1,15 +1,46 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Path, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST
 import asyncio
 import logging
 from datetime import datetime
+from typing import Optional
+from urllib.parse import urlsplit
 from main import BookRecommendationCrawler
+from jobs import Job, JobAlreadyActive, JobManager, JobQueueFull
+from resources import ResourcePool
+from config import Config
+from reddit_crawler import REDDIT_HOST
+from readability import LEVELS
+import metrics
+
+# 크롤링 작업은 요청 처리와 분리된 워커 풀에서 실행됩니다
+job_manager = JobManager()
+
+# HTTP 커넥션 풀과 Reddit 클라이언트는 서버가 떠 있는 동안 모든 작업이 공유합니다
+resources = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global resources
+    resources = ResourcePool()
+    resources.daily_snapshot.load()
+    # 카탈로그 색인은 수 초가 걸리므로 서버 시작을 막지 않고 백그라운드에서 만듭니다
+    similarity_task = asyncio.create_task(resources.build_similarity_index())
+    await job_manager.start()
+    yield
+    similarity_task.cancel()
+    await job_manager.stop()
+    await resources.close()
 
 # FastAPI 애플리케이션 생성
 app = FastAPI(
     title="구텐베르크 책 추천 크롤링 API",
     description="영어 수준별 및 필사용 추천 도서 크롤링 서비스",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -44,89 +75,150 @@ async def health_check():
         "service": "gutenberg-book-crawler"
     }
 
+async def _run_job(job: Job, method_name: str, **kwargs):
+    """작업 워커에서 공유 자원을 빌린 크롤러를 만들어 실행합니다."""
+    crawler = BookRecommendationCrawler(progress=job, resources=resources)
+    try:
+        await getattr(crawler, method_name)(**kwargs)
+    finally:
+        await crawler.close()
+
+def _enqueue(kind: str, method_name: str, message: str, exclusive: bool = False, **kwargs):
+    """크롤링 작업을 큐에 넣고 작업 ID를 바로 반환합니다. kwargs는 실행 메서드에 그대로 넘깁니다.
+
+    exclusive=True면 같은 종류의 작업이 대기/실행 중일 때 409를 반환합니다.
+    """
+    try:
+        job = job_manager.submit(kind, lambda job: _run_job(job, method_name, **kwargs), exclusive=exclusive)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except JobAlreadyActive as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return JSONResponse(status_code=202, content={
+        "status": "accepted",
+        "message": message,
+        "job_id": job.id,
+        "status_url": f"/jobs/{job.id}",
+        "timestamp": datetime.now().isoformat()
+    })
+
 @app.post("/daily-update")
 async def daily_update():
-    """일일 추천 도서 업데이트 실행"""
+    """일일 추천 도서 업데이트 작업 등록"""
     logger.info("일일 업데이트 API 호출됨")
-    
-    try:
-        crawler = BookRecommendationCrawler()
-        await crawler.run_daily_update()
-        
-        return {
-            "status": "success",
-            "message": "일일 추천 도서 업데이트 완료",
-            "timestamp": datetime.now().isoformat()
-        }
-        
-    except Exception as e:
-        logger.error(f"일일 업데이트 실행 중 오류: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"일일 업데이트 실행 실패: {str(e)}"
-        )
+    return _enqueue("daily-update", "run_daily_update", "일일 추천 도서 업데이트 작업이 등록되었습니다")
 
 @app.post("/full-crawl")
-async def full_crawl():
-    """전체 크롤링 실행"""
+async def full_crawl(resume: bool = False):
+    """전체 크롤링 작업 등록 (resume=true면 중단된 실행을 마지막 체크포인트부터 이어서)"""
     logger.info("전체 크롤링 API 호출됨")
-    
-    try:
-        crawler = BookRecommendationCrawler()
-        await crawler.run_full_crawl()
-        
-        return {
-            "status": "success",
-            "message": "전체 크롤링 완료",
-            "timestamp": datetime.now().isoformat()
-        }
-        
-    except Exception as e:
-        logger.error(f"전체 크롤링 실행 중 오류: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"전체 크롤링 실행 실패: {str(e)}"
-        )
+    # 체크포인트를 같은 기록에 쓰므로 전체 크롤링은 한 번에 하나만 실행합니다
+    return _enqueue("full-crawl", "run_full_crawl", "전체 크롤링 작업이 등록되었습니다", exclusive=True, resume=resume)
 
 @app.post("/incremental-crawl")
 async def incremental_crawl():
-    """증분 크롤링 실행"""
+    """증분 크롤링 작업 등록"""
     logger.info("증분 크롤링 API 호출됨")
+    return _enqueue("incremental-crawl", "run_incremental_crawl", "증분 크롤링 작업이 등록되었습니다")
+
+@app.post("/readability-update")
+async def readability_update():
+    """카탈로그 도서 가독성 점수/영어 수준 일괄 계산 작업 등록"""
+    logger.info("가독성 분석 API 호출됨")
+    return _enqueue("readability-update", "run_readability_update", "가독성 분석 작업이 등록되었습니다")
+
+@app.get("/daily-recommendations")
+async def get_daily_recommendations(request: Request):
+    """미리 만들어 둔 일일 추천 스냅샷 (크롤링 없이 메모리에서 바로 응답)"""
+    snapshot = resources.daily_snapshot.current
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="아직 생성된 일일 추천이 없습니다")
     
-    try:
-        crawler = BookRecommendationCrawler()
-        await crawler.run_incremental_crawl()
-        
-        return {
-            "status": "success",
-            "message": "증분 크롤링 완료",
-            "timestamp": datetime.now().isoformat()
-        }
-        
-    except Exception as e:
-        logger.error(f"증분 크롤링 실행 중 오류: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"증분 크롤링 실행 실패: {str(e)}"
-        )
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding"
+    }
+    if snapshot.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=snapshot.gzipped, media_type="application/json", headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+@app.get("/books/{book_id}/similar")
+async def get_similar_books(book_id: str = Path(..., pattern=r'^\d+$'), k: int = Query(10, ge=1, le=100)):
+    """주제어/서재/장르가 비슷한 책 (TF-IDF 코사인 유사도 상위 k권)"""
+    index = resources.similarity
+    if index is None:
+        raise HTTPException(status_code=503, detail="유사 도서 색인이 아직 준비되지 않았습니다")
+    
+    book = index.book(book_id)
+    if book is None:
+        raise HTTPException(status_code=404, detail="색인에 없는 책입니다")
+    
+    return {
+        "book": book,
+        "similar": index.similar(book_id, k),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/books/{book_id}/passages")
+async def get_passages(book_id: str = Path(..., pattern=r'^\d+$'), page: int = Query(1, ge=1), difficulty: Optional[str] = None):
+    """필사 연습 구간 (미리 만든 구간 색인과 mmap 본문에서 페이지 단위로 제공)"""
+    if difficulty is not None and difficulty not in LEVELS:
+        raise HTTPException(status_code=400, detail=f"difficulty는 {', '.join(LEVELS)} 중 하나여야 합니다")
+    
+    result = await resources.passages.page(book_id, page, difficulty)
+    if result is None:
+        raise HTTPException(status_code=404, detail="본문이 아직 준비되지 않은 책입니다")
+    if page > max(result['pages'], 1):
+        raise HTTPException(status_code=404, detail="페이지 범위를 벗어났습니다")
+    
+    return result
+
+@app.get("/jobs")
+async def list_jobs():
+    """최근 작업 목록"""
+    return {
+        "jobs": [job.to_dict() for job in reversed(job_manager.jobs.values())],
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """작업 진행 상황 (단계, 처리 건수, 처리 속도, 남은 시간)"""
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    return job.to_dict()
 
 @app.get("/status")
 async def get_status():
-    """크롤링 서비스 상태 확인"""
+    """크롤링 서비스 상태 확인 (호스트별 최근 요청 결과와 실행별 마지막 성공 시각)"""
     try:
-        # 간단한 테스트로 서비스 상태 확인
-        crawler = BookRecommendationCrawler()
+        # 크롤러를 새로 만들지 않고 공유 자원과 수집된 메트릭만 확인합니다
+        gutenberg_host = urlsplit(Config.GUTENBERG_BASE_URL).netloc
+        goodreads_host = urlsplit(Config.GOODREADS_BASE_URL).netloc
+        last_success = {
+            run: datetime.fromtimestamp(ts).isoformat()
+            for run, ts in metrics.last_success.items()
+        }
         
         return {
             "status": "operational",
             "services": {
-                "gutenberg_crawler": "available",
-                "reddit_crawler": "available",
-                "goodreads_crawler": "available",
-                "curated_recommendations": "available"
+                "gutenberg_crawler": metrics.host_status(gutenberg_host),
+                "reddit_crawler": metrics.host_status(REDDIT_HOST) if Config.REDDIT_CLIENT_ID else "not_configured",
+                "goodreads_crawler": metrics.host_status(goodreads_host),
+                "curated_recommendations": "available" if "daily_update" in last_success else "unknown"
             },
+            "resources": resources.status(),
             "timestamp": datetime.now().isoformat(),
-            "last_update": "미구현"  # 실제로는 마지막 크롤링 시간을 DB에서 조회
+            "last_update": max(last_success.values()) if last_success else None,
+            "last_success": last_success
         }
         
     except Exception as e:
@@ -137,6 +229,11 @@ async def get_status():
             "timestamp": datetime.now().isoformat()
         }
 
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus 텍스트 형식 메트릭 (호스트별 요청/지연/오류/바이트, 단계별 소요 시간, 마지막 성공 시각)"""
+    return Response(content=metrics.render(), media_type=CONTENT_TYPE_LATEST)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
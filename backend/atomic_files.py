@@ -0,0 +1,26 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+def temp_path(path: str, suffix: str = '.tmp') -> str:
+    """path와 같은 디렉터리에 고유한 임시 파일을 만들어 경로를 반환합니다.
+
+    같은 파일 시스템에 있어야 os.replace가 원자적이고, 이름이 고유해야 같은 파일을 동시에 써도
+    서로의 임시 파일을 덮어쓰지 않습니다.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=f"{os.path.basename(path)}.", suffix=suffix)
+    os.close(fd)
+    return tmp_path
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'wb', **kwargs) -> Iterator[IO]:
+    """임시 파일을 열어 주고, 블록이 끝나면 path로 바꿔 넣습니다. 블록에서 예외가 나면 임시 파일만 지웁니다."""
+    tmp_path = temp_path(path)
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,50 @@
+import gzip
+import json
+import logging
+from typing import Dict, Iterable, Iterator
+from config import Config
+
+class BackupWriter:
+    """레코드를 gzip 압축 NDJSON 파일에 한 줄씩 추가합니다.
+
+    레코드 형식은 업로드와 같은 {'kind': ..., 'data': ...}이므로 백업 파일을 그대로 재전송할 수 있습니다.
+    파일은 첫 레코드를 쓸 때 열리므로, 쓸 것이 없으면 빈 백업 파일이 생기지 않습니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._file = None
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+
+    def write(self, record: Dict):
+        if self._file is None:
+            self._file = gzip.open(self.path, 'at', encoding='utf-8')
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        self.count += 1
+
+    def write_many(self, records: Iterable[Dict]):
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self.logger.info(f"로컬 백업 저장 완료: {self.path} ({self.count}건)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def iter_backup(path: str) -> Iterator[Dict]:
+    """백업 파일의 레코드를 한 줄씩 읽습니다. 이전 형식(들여쓴 .json)은 지원하지 않습니다."""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,151 @@
+"""Gutenberg 상세 페이지 메타데이터 추출: 필드별 탐색 vs 한 번 훑기 비교 벤치마크입니다.
+
+먼저 저장된 페이지 옆에 기대 결과(같은 이름의 .json)가 있으면 한 번 훑기 결과가 그와 같은지 확인하고,
+다르면 종료 코드 1로 끝냅니다. (파서 회귀 확인용, --check면 확인만 합니다)
+이어서 페이지마다 두 방식의 결과를 필드 단위로 비교하고,
+추출 단계만의 처리량과 파싱을 포함한 전체 처리량(pages/s)을 출력합니다.
+
+필드별 탐색은 크롤러가 한 번 훑기로 바뀌기 전의 구현을 비교용으로 옮겨 둔 것입니다.
+'Language' 등의 텍스트가 th 안에 있어 tr 문자열 검색에 걸리지 않으므로 언어/출간일/서재는 늘 비어 있습니다.
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.bibrec_benchmark                       # benchmarks/pages/ebooks_*.html
+    python -m benchmarks.bibrec_benchmark --check
+    python -m benchmarks.bibrec_benchmark pages/ebooks_*.html
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+from config import Config
+from gutenberg_crawler import GutenbergCrawler
+from html_parsing import make_soup, GUTENBERG_BOOK_STRAINER
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), 'pages')
+
+def parse_book_details_multipass(crawler: GutenbergCrawler, book_id: str, soup) -> Dict:
+    """필드마다 트리를 따로 탐색하는 이전 방식입니다."""
+    return {
+        'id': book_id,
+        'subjects': _extract_subjects(soup),
+        'language': _extract_language(soup),
+        'release_date': _extract_release_date(soup),
+        'bookshelves': _extract_bookshelves(soup),
+        'download_links': crawler._extract_download_links(soup)
+    }
+
+def _extract_subjects(soup) -> List[str]:
+    subjects = []
+    subject_table = soup.find('table', class_='bibrec')
+    if subject_table:
+        for row in subject_table.find_all('tr'):
+            if 'Subject' in row.get_text():
+                subjects.extend([link.get_text(strip=True) for link in row.find_all('a')])
+    return subjects
+
+def _extract_language(soup) -> str:
+    lang_elem = soup.find('tr', string=lambda text: 'Language' in text if text else False)
+    if lang_elem:
+        return lang_elem.find_next('td').get_text(strip=True)
+    return 'Unknown'
+
+def _extract_release_date(soup) -> str:
+    date_elem = soup.find('tr', string=lambda text: 'Release Date' in text if text else False)
+    if date_elem:
+        return date_elem.find_next('td').get_text(strip=True)
+    return 'Unknown'
+
+def _extract_bookshelves(soup) -> List[str]:
+    shelf_elem = soup.find('tr', string=lambda text: 'Bookshelf' in text if text else False)
+    if shelf_elem:
+        return [link.get_text(strip=True) for link in shelf_elem.find_next('td').find_all('a')]
+    return []
+
+def check(crawler: GutenbergCrawler, paths, soups) -> bool:
+    """기대 결과 파일이 있는 페이지마다 한 번 훑기 결과가 같은지 확인합니다."""
+    ok = True
+    for path, soup in zip(paths, soups):
+        expected_path = os.path.splitext(path)[0] + '.json'
+        if not os.path.exists(expected_path):
+            continue
+
+        with open(expected_path, 'r', encoding='utf-8') as f:
+            expected = json.load(f)
+        actual = crawler.parse_book_details('0', soup)
+        diffs = [key for key in expected if expected[key] != actual.get(key)]
+
+        print(f"  {path}: {'일치' if not diffs else '불일치'}")
+        for key in diffs:
+            print(f"    {key}: 기대={expected[key]!r} / 결과={actual.get(key)!r}")
+        ok = ok and not diffs
+    return ok
+
+def compare(crawler: GutenbergCrawler, paths, soups):
+    """두 방식의 결과가 다른 필드를 출력하고 일치한 페이지 수를 반환합니다."""
+    matched = 0
+    for path, soup in zip(paths, soups):
+        legacy = parse_book_details_multipass(crawler, '0', soup)
+        single = crawler.parse_book_details('0', soup)
+
+        diffs = [key for key in legacy if legacy[key] != single.get(key)]
+        if not diffs:
+            matched += 1
+            continue
+
+        print(f"  {path}")
+        for key in diffs:
+            print(f"    {key}: 이전={legacy[key]!r} / 한 번 훑기={single[key]!r}")
+
+    return matched
+
+def throughput(extract, soups, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for soup in soups:
+            extract('0', soup)
+    return (repeat * len(soups)) / (time.perf_counter() - started)
+
+def run(paths, repeat: int, check_only: bool):
+    # 네트워크를 쓰지 않으므로 디스크 캐시도 만들지 않습니다
+    Config.HTTP_CACHE_ENABLED = False
+    crawler = GutenbergCrawler()
+
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+
+    soups = [make_soup(page, GUTENBERG_BOOK_STRAINER) for page in pages]
+
+    print("기대 결과 확인")
+    if not check(crawler, paths, soups):
+        sys.exit(1)
+    if check_only:
+        return
+
+    print(f"{len(pages)}개 페이지 결과 비교")
+    matched = compare(crawler, paths, soups)
+    print(f"  일치: {matched}/{len(pages)}")
+
+    print(f"추출 처리량 ({repeat}회 반복)")
+    legacy = lambda book_id, soup: parse_book_details_multipass(crawler, book_id, soup)
+    for label, extract in [('필드별 탐색', legacy), ('한 번 훑기', crawler.parse_book_details)]:
+        print(f"  {label:<10} {throughput(extract, soups, repeat):10.1f} pages/s")
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            crawler.parse_book_details('0', make_soup(page, GUTENBERG_BOOK_STRAINER))
+    print(f"  파싱 포함 전체  {(repeat * len(pages)) / (time.perf_counter() - started):10.1f} pages/s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="bibrec 추출 벤치마크")
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--check', action='store_true', help="기대 결과와 같은지만 확인")
+    parser.add_argument('paths', nargs='*', help="저장된 Gutenberg 상세 페이지 파일 (기본: benchmarks/pages/ebooks_*.html)")
+    args = parser.parse_args()
+
+    run(args.paths or sorted(glob.glob(os.path.join(PAGES_DIR, 'ebooks_*.html'))), args.repeat, args.check)
@@ -0,0 +1,126 @@
+"""카탈로그 제목/작가 매칭 처리량과 정확도 벤치마크입니다.
+
+일괄 카탈로그의 책마다 제목을 조금씩 바꾼 질의(관사/부제 제거, 발음 구별 기호 제거, 글자 하나 누락)를 만들고,
+TitleMatcher가 원래 책(또는 같은 정규화 제목의 다른 판본)을 찾는 비율과 초당 처리 건수를 출력합니다.
+
+먼저 고정 질의와 바꾼 질의 일부에 대해 match()가 모든 책에 점수를 매기는 기준 구현과 같은 책/점수를
+반환하는지 확인하고, 다르면 종료 코드 1로 끝냅니다. (prefix filtering이 후보를 놓치지 않는지 확인, --check면 확인만)
+카탈로그를 주지 않으면 benchmarks/samples/pg_catalog_sample.csv 를 씁니다.
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.matcher_benchmark --check
+    python -m benchmarks.matcher_benchmark pg_catalog.csv --queries 5000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import unicodedata
+from typing import Dict, Optional, Tuple
+from catalog_loader import CatalogLoader
+from title_matcher import TitleMatcher, author_surnames, normalize_title, trigrams
+
+SAMPLE_CATALOG = os.path.join(os.path.dirname(__file__), 'samples', 'pg_catalog_sample.csv')
+
+# 카탈로그와 상관없이 늘 확인하는 (제목, 작가) 질의: 줄임/부제/발음 구별 기호/같은 제목의 다른 작가/오타
+FIXED_QUERIES = [
+    ('Pride and Prejudice', 'Jane Austen'), ('Emma', None), ('Emma', 'Austen'),
+    ('Jane Eyre', 'Charlotte Bronte'), ('Moby-Dick', 'Herman Melville'), ('Dr Jekyll and Mr Hyde', 'Stevenson'),
+    ('Alice in Wonderland', 'Lewis Carroll'), ('Sherlock Holmes', 'Doyle'), ('Adventures of Sherlock Holmes', None),
+    ('The Memoirs of Sherlock Holmes', 'Arthur Conan Doyle'), ('Jungle Book', 'Kipling'), ('Second Jungle Book', None),
+    ('Poems', 'Wilfred Owen'), ('Poems', 'Emily Dickinson'), ('Poems', None), ('Peter Pan', 'Barrie'),
+    ('Les Miserables', 'Victor Hugo'), ('Don Quixote', None), ('Ulysses', 'James Joyce'), ('Ulysses', 'Alfred Tennyson'),
+    ('The Great Gatsby', 'F. Scott Fitzgerald'), ('Walden', 'Thoreau'), ('Tom Sawyer', 'Mark Twain'),
+    ('Huckleberry Finn', 'Twain'), ('Frankenstien', 'Mary Shelley'), ('Little Women', 'Alcott'),
+]
+
+def perturb(title: str, rng: random.Random) -> str:
+    title = re.split(r'[;:]', title)[0]
+    if rng.random() < 0.5:
+        title = unicodedata.normalize('NFKD', title).encode('ascii', 'ignore').decode()
+    if rng.random() < 0.3 and len(title) > 8:
+        i = rng.randrange(len(title))
+        title = title[:i] + title[i + 1:]
+    return title
+
+def match_exhaustive(matcher: TitleMatcher, title: str, author: str = None) -> Optional[Tuple[Dict, float]]:
+    """후보를 좁히지 않고 모든 책에 같은 점수를 매기는 기준 구현입니다."""
+    query = normalize_title(title)
+    if not query:
+        return None
+    surnames = {name: trigrams(name) for name in author_surnames(author)} if author else {}
+    query_grams = trigrams(query)
+    needed = matcher._needed_title_score(bool(surnames))
+
+    best, best_key = None, None
+    for doc_id in range(len(matcher)):
+        score = matcher._score(doc_id, query, query_grams, surnames, needed)
+        if score < matcher.min_score:
+            continue
+        key = (score, matcher.books[doc_id].get('downloads') or 0, -doc_id)
+        if best_key is None or key > best_key:
+            best, best_key = doc_id, key
+
+    if best is None:
+        return None
+    return matcher.books[best], best_key[0]
+
+def check(matcher: TitleMatcher, queries) -> int:
+    """match()와 기준 구현의 결과(책 ID, 점수)가 다른 질의를 출력하고 그 수를 반환합니다."""
+    def result(match):
+        return (match[0]['id'], round(match[1], 9)) if match else None
+
+    mismatches = 0
+    for title, author in queries:
+        fast, exhaustive = result(matcher.match(title, author)), result(match_exhaustive(matcher, title, author))
+        if fast != exhaustive:
+            mismatches += 1
+            print(f"  불일치 {title!r} / {author!r}: match={fast} / 전체 비교={exhaustive}")
+    return mismatches
+
+def run(path: str, queries: int, seed: int, check_queries: int, check_only: bool):
+    books = CatalogLoader(path).load()
+
+    started = time.perf_counter()
+    matcher = TitleMatcher()
+    for book in books:
+        matcher.add(book)
+    print(f"{len(matcher)}권 색인: {time.perf_counter() - started:.1f}초")
+
+    rng = random.Random(seed)
+    sample = rng.sample(books, min(queries, len(books)))
+    cases = [(book, perturb(book['title'], rng), book['author'] if rng.random() < 0.8 else None) for book in sample]
+
+    checked = FIXED_QUERIES + [(title, author) for _, title, author in cases[:check_queries]]
+    mismatches = check(matcher, checked)
+    print(f"전체 비교 기준 구현과 결과 확인: {len(checked) - mismatches}/{len(checked)} 일치")
+    if mismatches:
+        sys.exit(1)
+    if check_only:
+        return
+
+    found = correct = 0
+    started = time.perf_counter()
+    for book, title, author in cases:
+        match = matcher.match(title, author)
+        if match:
+            found += 1
+            if match[0]['id'] == book['id'] or normalize_title(match[0]['title']) == normalize_title(book['title']):
+                correct += 1
+    elapsed = time.perf_counter() - started
+
+    print(f"질의 {len(cases)}건: {len(cases) / elapsed:.0f} lookups/s")
+    print(f"  찾음 {found / len(cases):.1%}, 찾은 것 중 정확 {correct / max(found, 1):.1%}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="제목/작가 매칭 벤치마크")
+    parser.add_argument('--queries', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--check-queries', type=int, default=200, help="기준 구현과 비교할 바꾼 질의 수")
+    parser.add_argument('--check', action='store_true', help="기준 구현과 같은지만 확인")
+    parser.add_argument('path', nargs='?', default=SAMPLE_CATALOG, help="pg_catalog.csv 또는 rdf-files.tar(.bz2)")
+    args = parser.parse_args()
+
+    run(args.path, args.queries, args.seed, args.check_queries, args.check)
@@ -0,0 +1,139 @@
+"""게시물 속 카탈로그 도서 언급 탐색(MentionResolver) 결과 확인과 처리량 벤치마크입니다.
+
+- 고정 문장: 겹치는/포함되는/붙어 있는 제목, 작가 성이 필요한 제목, 따옴표 속 제목에서
+  찾은 책 ID와 찾지 못한 제목이 기대값과 같은지 확인합니다. (표본 카탈로그를 쓸 때만)
+- 임의 문장: 카탈로그 제목 조각과 흔한 단어를 섞은 문장마다 Aho-Corasick 탐색(_scan) 결과가
+  모든 제목을 모든 위치에 대 보는 단순 탐색과 같은지 확인합니다.
+다르면 종료 코드 1로 끝내고(--check면 확인만), 이어서 초당 처리 문장 수를 출력합니다.
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.mention_benchmark --check
+    python -m benchmarks.mention_benchmark pg_catalog.csv --texts 2000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Tuple
+from catalog_loader import CatalogLoader
+from mention_resolver import MentionResolver
+from title_matcher import TitleMatcher, fold
+
+SAMPLE_CATALOG = os.path.join(os.path.dirname(__file__), 'samples', 'pg_catalog_sample.csv')
+
+# (문장, 찾아야 할 책 ID (찾은 순서), 찾지 못한 따옴표 속 제목) - 표본 카탈로그 기준
+FIXED_CASES = [
+    # 포함되는 제목: 같은 위치에서는 긴 제목이 이기고, 뒤에 따로 나온 짧은 제목도 찾습니다
+    ("Peter Pan in Kensington Gardens is better than Peter Pan", ['26654', '16'], []),
+    # 겹치는 제목: 왼쪽에서 먼저 시작한 'adventures of tom sawyer' 만 인정합니다
+    ("The Adventures of Tom Sawyer Abroad", ['74'], []),
+    ("Tom Sawyer Abroad", ['91'], []),
+    # 뒤쪽 제목의 접미사 'jungle book' 은 'second jungle book' 에 겹치므로 버립니다
+    ("The Jungle Book and The Second Jungle Book by Kipling", ['236', '1937'], []),
+    # 붙어 있는 제목들
+    ("pride and prejudice and sense and sensibility", ['1342', '161'], []),
+    ("The Iliad The Odyssey Ulysses, Homer and Joyce", ['6130', '1727', '4300'], []),
+    ("jane eyre wuthering heights, both brontes", ['1260', '768'], []),
+    # 한 단어 제목은 작가 성이 있어야 합니다 ("Dracula's" 는 'draculas' 로 접힙니다)
+    ("Dracula's Guest was cut from Dracula", ['10150'], []),
+    ("Stoker: Dracula's Guest, then Dracula", ['10150', '345'], []),
+    # 같은 제목의 여러 판본은 성이 나온 작가의 책을 고릅니다
+    ("Poems by Owen are grim; Poems are nice", ['1034'], []),
+    ("Poems are nice", [], []),
+    # 따옴표 속 제목은 퍼지 매칭하고, 카탈로그에 없으면 찾지 못한 제목으로 돌려줍니다
+    ('Has anyone read "The Hound of the Baskervilles"? or "Some Modern Novel"', ['2852'], ['some modern novel']),
+    ('Just finished "The Pictures of Dorian Gray"', ['174'], []),
+    ('"Alice in Wonderland"', [], ['alice in wonderland']),
+]
+
+FILLER = ['the', 'and', 'of', 'a', 'i', 'read', 'book', 'loved', 'by', 'in', 'it', 'just', 'finished']
+
+def scan_naive(titles: List[str], tokens: List[str]) -> List[Tuple[int, int, int]]:
+    """모든 제목을 모든 위치에 대 보는 기준 구현입니다. (시작 위치, 끝 위치, 패턴 번호)"""
+    by_first: Dict[str, List[Tuple[int, List[str]]]] = {}
+    for pattern_id, title in enumerate(titles):
+        words = title.split()
+        by_first.setdefault(words[0], []).append((pattern_id, words))
+
+    matches = []
+    for start, token in enumerate(tokens):
+        for pattern_id, words in by_first.get(token, ()):
+            if tokens[start:start + len(words)] == words:
+                matches.append((start, start + len(words) - 1, pattern_id))
+    return matches
+
+def random_texts(titles: List[str], count: int, rng: random.Random) -> List[str]:
+    """제목 전체/앞부분/뒷부분과 흔한 단어를 섞어, 겹치거나 붙어 있는 일치가 많은 문장을 만듭니다."""
+    texts = []
+    for _ in range(count):
+        parts = []
+        for _ in range(rng.randint(1, 8)):
+            words = rng.choice(titles).split()
+            cut = rng.randint(1, len(words))
+            parts.extend(rng.choice([words, words[:cut], words[-cut:]]))
+            if rng.random() < 0.5:
+                parts.append(rng.choice(FILLER))
+        texts.append(' '.join(parts))
+    return texts
+
+def check_fixed(resolver: MentionResolver) -> int:
+    mismatches = 0
+    for text, expected_ids, expected_unmatched in FIXED_CASES:
+        books, unmatched = resolver.resolve(text)
+        ids = [book['id'] for book in books]
+        if ids != expected_ids or unmatched != expected_unmatched:
+            mismatches += 1
+            print(f"  불일치 {text!r}: {ids} {unmatched} (기대 {expected_ids} {expected_unmatched})")
+    return mismatches
+
+def check_scan(resolver: MentionResolver, titles: List[str], texts: List[str]) -> int:
+    mismatches = 0
+    for text in texts:
+        tokens = fold(text).split()
+        if sorted(resolver._scan(tokens)) != sorted(scan_naive(titles, tokens)):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"  불일치 {text!r}")
+    return mismatches
+
+def run(path: str, texts: int, seed: int, check_only: bool):
+    matcher = TitleMatcher()
+    for book in CatalogLoader(path).load():
+        matcher.add(book)
+
+    started = time.perf_counter()
+    resolver = MentionResolver(matcher)
+    print(f"{len(matcher)}권 오토마톤: {time.perf_counter() - started:.1f}초")
+
+    # MentionResolver는 정규화된 제목이 처음 나온 순서대로 패턴 번호를 매깁니다
+    titles = list(dict.fromkeys(title for _, title, _ in matcher.entries()))
+    samples = random_texts(titles, texts, random.Random(seed))
+
+    mismatches = 0
+    if os.path.abspath(path) == os.path.abspath(SAMPLE_CATALOG):
+        fixed = check_fixed(resolver)
+        print(f"고정 문장 확인: {len(FIXED_CASES) - fixed}/{len(FIXED_CASES)} 일치")
+        mismatches += fixed
+    scanned = check_scan(resolver, titles, samples)
+    print(f"단순 탐색 기준 구현과 결과 확인: {len(samples) - scanned}/{len(samples)} 일치")
+    mismatches += scanned
+
+    if mismatches:
+        sys.exit(1)
+    if check_only:
+        return
+
+    started = time.perf_counter()
+    resolver.resolve_many(samples)
+    print(f"문장 {len(samples)}건: {len(samples) / (time.perf_counter() - started):.0f} texts/s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="도서 언급 탐색 벤치마크")
+    parser.add_argument('--texts', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--check', action='store_true', help="기준 구현/기대값과 같은지만 확인")
+    parser.add_argument('path', nargs='?', default=SAMPLE_CATALOG, help="pg_catalog.csv 또는 rdf-files.tar(.bz2)")
+    args = parser.parse_args()
+
+    run(args.path, args.texts, args.seed, args.check)
@@ -0,0 +1,71 @@
+"""HTML 파싱 방식별 페이지당 CPU 시간을 비교하는 벤치마크입니다.
+
+저장해 둔 페이지로 html.parser 전체 파싱, lxml 전체 파싱, lxml + SoupStrainer 부분 파싱을
+각각 실행하고, 세 방식의 추출 결과가 같은지도 확인합니다.
+
+사용법 (backend 디렉터리에서):
+    python -m benchmarks.parser_benchmark --kind gutenberg-book pages/ebooks_1342.html ...
+"""
+import argparse
+import time
+from bs4 import BeautifulSoup
+from config import Config
+from gutenberg_crawler import GutenbergCrawler
+from goodreads_crawler import GoodreadsCrawler
+from html_parsing import GUTENBERG_CATALOG_STRAINER, GUTENBERG_BOOK_STRAINER, GOODREADS_SEARCH_STRAINER
+
+MODES = [
+    ('html.parser (전체)', 'html.parser', False),
+    ('lxml (전체)', 'lxml', False),
+    ('lxml + SoupStrainer', 'lxml', True),
+]
+
+def _extractors():
+    # 네트워크를 쓰지 않으므로 디스크 캐시도 만들지 않습니다
+    Config.HTTP_CACHE_ENABLED = False
+    gutenberg = GutenbergCrawler()
+    goodreads = GoodreadsCrawler()
+
+    return {
+        'gutenberg-catalog': (GUTENBERG_CATALOG_STRAINER, gutenberg.parse_catalog),
+        'gutenberg-book': (GUTENBERG_BOOK_STRAINER, lambda soup: gutenberg.parse_book_details('0', soup)),
+        'goodreads-search': (GOODREADS_SEARCH_STRAINER, goodreads.parse_search_results),
+        'goodreads-book': (None, goodreads.parse_book_details),
+    }
+
+def run(kind: str, paths, repeat: int):
+    strainer, extract = _extractors()[kind]
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+
+    baseline = None
+    print(f"{kind}: {len(pages)}개 페이지 x {repeat}회")
+
+    for label, parser, strained in MODES:
+        parse_only = strainer if strained else None
+
+        results = [extract(BeautifulSoup(page, parser, parse_only=parse_only)) for page in pages]
+        if baseline is None:
+            baseline = results
+        matches = results == baseline
+
+        started = time.process_time()
+        for _ in range(repeat):
+            for page in pages:
+                extract(BeautifulSoup(page, parser, parse_only=parse_only))
+        elapsed = time.process_time() - started
+
+        per_page = elapsed / (repeat * len(pages))
+        print(f"  {label:<22} {per_page * 1000:8.2f} ms/page  {1 / per_page:8.1f} pages/s  "
+              f"결과 일치: {'예' if matches else '아니오'}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HTML 파서 벤치마크")
+    parser.add_argument('--kind', required=True, choices=['gutenberg-catalog', 'gutenberg-book', 'goodreads-search', 'goodreads-book'])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('paths', nargs='+', help="저장된 HTML 페이지 파일")
+    args = parser.parse_args()
+
+    run(args.kind, args.paths, args.repeat)
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from gutenberg_crawler import GutenbergCrawler
+from catalog_loader import CatalogLoader
+from title_matcher import TitleMatcher
+from mention_resolver import MentionResolver
+from config import Config
+
+class CatalogIndex:
+    """한 번의 실행 동안 공유되는 Gutenberg 카탈로그 인메모리 색인입니다.
+
+    카탈로그 페이지는 처음 조회할 때 한 번만 내려받고(GUTENBERG_CATALOG_PATH가 있으면 로컬 파일에서 읽고),
+    이후의 조회는 TitleMatcher의 트라이그램 색인과 점수 계산으로 처리합니다.
+    """
+
+    def __init__(self, gutenberg: GutenbergCrawler, max_pages: int = None):
+        self.gutenberg = gutenberg
+        self.max_pages = max_pages or Config.CATALOG_INDEX_PAGES
+
+        self.matcher = TitleMatcher()
+        self._mention_resolver: Optional[MentionResolver] = None
+
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+
+    async def ensure_loaded(self):
+        """카탈로그가 아직 없으면 모든 페이지를 동시에 내려받아 색인합니다."""
+        if self._loaded:
+            return
+
+        async with self._lock:
+            if self._loaded:
+                return
+
+            if Config.GUTENBERG_CATALOG_PATH:
+                loader = CatalogLoader()
+                downloads = await self.gutenberg.get_download_counts(self.max_pages) if loader.needs_downloads else None
+                pages = [await asyncio.to_thread(loader.load, downloads)]
+            else:
+                pages = await asyncio.gather(
+                    *(self.gutenberg.get_book_catalog(page) for page in range(1, self.max_pages + 1))
+                )
+
+            for books in pages:
+                for book in books:
+                    self.add(book)
+
+            self._loaded = True
+            self.logger.info(f"카탈로그 색인 완료: {self.size}권")
+
+    async def get_mention_resolver(self) -> MentionResolver:
+        """카탈로그 제목으로 만든 언급 탐색 오토마톤입니다. 카탈로그당 한 번만 만듭니다."""
+        await self.ensure_loaded()
+
+        async with self._lock:
+            if self._mention_resolver is None:
+                self._mention_resolver = await asyncio.to_thread(MentionResolver, self.matcher)
+        return self._mention_resolver
+
+    @property
+    def size(self) -> int:
+        return len(self.matcher)
+
+    @property
+    def books(self) -> List[Dict]:
+        """색인된 책들 (카탈로그 순서, 즉 다운로드 수 내림차순)"""
+        return self.matcher.books
+
+    def add(self, book: Dict):
+        """책 한 권을 색인에 추가합니다."""
+        self.matcher.add(book)
+
+    def lookup(self, title: str, author: str) -> Optional[Dict]:
+        """제목과 작가로 가장 잘 맞는 책을 찾아 사본을 반환합니다."""
+        match = self.matcher.match(title, author)
+        if not match:
+            return None
+
+        book, score = match
+        self.logger.debug(f"'{title}' -> '{book.get('title')}' (점수 {score:.2f})")
+        return dict(book)
@@ -0,0 +1,226 @@
+import csv
+import heapq
+import logging
+import re
+import tarfile
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from config import Config
+
+# get_book_details의 download_links에서 쓰는 Gutenberg 파일 형식 이름
+PLAIN_TEXT_FORMAT = 'Plain Text UTF-8'
+
+MIME_FORMATS = {
+    'text/plain; charset=utf-8': PLAIN_TEXT_FORMAT,
+    'text/plain': 'Plain Text',
+    'text/html': 'HTML',
+    'application/epub+zip': 'EPUB',
+    'application/x-mobipocket-ebook': 'Kindle',
+}
+
+LANGUAGE_NAMES = {
+    'en': 'English', 'fr': 'French', 'de': 'German', 'es': 'Spanish', 'it': 'Italian',
+    'fi': 'Finnish', 'nl': 'Dutch', 'pt': 'Portuguese', 'zh': 'Chinese', 'ja': 'Japanese',
+    'ko': 'Korean', 'la': 'Latin', 'el': 'Greek', 'ru': 'Russian', 'sv': 'Swedish',
+}
+
+NS = {
+    'rdf': 'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
+    'dcterms': 'http://purl.org/dc/terms/',
+    'pgterms': 'http://www.gutenberg.org/2009/pgterms/',
+}
+
+RDF_ABOUT = f"{{{NS['rdf']}}}about"
+RDF_RESOURCE = f"{{{NS['rdf']}}}resource"
+
+class CatalogLoader:
+    """Gutenberg 일괄 카탈로그(pg_catalog.csv 또는 rdf-files.tar.bz2)를 스트리밍으로 읽습니다.
+
+    책 단위로 레코드를 yield하므로 메모리 사용량은 카탈로그 크기와 무관하게 일정합니다.
+    레코드는 get_book_catalog + get_book_details 결과와 같은 형태입니다.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or Config.GUTENBERG_CATALOG_PATH
+        self.base_url = Config.GUTENBERG_BASE_URL
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+
+    def iter_books(self) -> Iterator[Dict]:
+        """파일 형식에 맞춰 도서 레코드를 하나씩 반환합니다."""
+        if self.path.endswith('.csv'):
+            return self._iter_csv()
+        if '.tar' in self.path:
+            return self._iter_rdf_tarball()
+        raise ValueError(f"지원하지 않는 카탈로그 형식입니다: {self.path}")
+
+    @property
+    def needs_downloads(self) -> bool:
+        """pg_catalog.csv에는 다운로드 수 열이 없어 다른 곳에서 채워야 합니다."""
+        return self.path.endswith('.csv')
+
+    def load(self, downloads: Dict[str, int] = None, limit: int = None) -> List[Dict]:
+        """카탈로그를 다운로드 수 내림차순 목록으로 읽습니다.
+
+        limit이 있으면 스트림에서 상위 limit권만 힙으로 골라 메모리 사용량이 limit에 비례합니다.
+        없으면 카탈로그 전체를 목록으로 만듭니다. (모든 책을 색인하는 CatalogIndex처럼 전체가 필요할 때)
+        downloads({book_id: 다운로드 수})가 있으면 다운로드 수가 없는 책에 채우고,
+        채우지 못한 책은 0이며 파일 순서(ID 순)대로 뒤에 옵니다.
+        """
+        total = counted = 0
+
+        def books() -> Iterator[Dict]:
+            nonlocal total, counted
+            for book in self.iter_books():
+                if downloads and not book['downloads']:
+                    book['downloads'] = downloads.get(book['id'], 0)
+                total += 1
+                counted += bool(book['downloads'])
+                yield book
+
+        key = lambda book: book['downloads']
+        result = heapq.nlargest(limit, books(), key=key) if limit else sorted(books(), key=key, reverse=True)
+
+        if not counted:
+            self.logger.warning(f"카탈로그에 다운로드 수가 없어 인기순으로 정렬하지 못했습니다: {self.path}")
+        self.logger.info(f"로컬 카탈로그에서 {len(result)}권 로드 (전체 {total}권): {self.path}")
+        return result
+
+    def _iter_csv(self) -> Iterator[Dict]:
+        with open(self.path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                if row.get('Type', 'Text') != 'Text':
+                    continue
+
+                book_id = row.get('Text#', '').strip()
+                if not book_id:
+                    continue
+
+                yield self._make_record(
+                    book_id=book_id,
+                    title=row.get('Title', ''),
+                    authors=_split_list(row.get('Authors', '')),
+                    language_codes=_split_list(row.get('Language', '')),
+                    issued=row.get('Issued', ''),
+                    subjects=_split_list(row.get('Subjects', '')),
+                    bookshelves=_split_list(row.get('Bookshelves', '')),
+                    download_links=self._default_download_links(book_id),
+                    downloads=0
+                )
+
+    def _iter_rdf_tarball(self) -> Iterator[Dict]:
+        # 'r|*' 는 앞에서부터 순차적으로 읽는 스트림 모드라 아카이브 전체를 메모리에 올리지 않습니다
+        with tarfile.open(self.path, 'r|*') as archive:
+            for member in archive:
+                if not member.isfile() or not member.name.endswith('.rdf'):
+                    continue
+
+                f = archive.extractfile(member)
+                if f is None:
+                    continue
+
+                try:
+                    record = self._parse_rdf(ET.parse(f).getroot())
+                except ET.ParseError as e:
+                    self.logger.warning(f"RDF 파싱 실패 ({member.name}): {e}")
+                    continue
+
+                if record:
+                    yield record
+
+    def _parse_rdf(self, root) -> Optional[Dict]:
+        ebook = root.find('pgterms:ebook', NS)
+        if ebook is None:
+            return None
+
+        book_id = ebook.get(RDF_ABOUT, '').rsplit('/', 1)[-1]
+        if not book_id.isdigit():
+            return None
+
+        title = ebook.findtext('dcterms:title', default='', namespaces=NS)
+        authors = [name.text for name in ebook.findall('dcterms:creator/pgterms:agent/pgterms:name', NS) if name.text]
+
+        download_links = {}
+        for file_elem in ebook.findall('dcterms:hasFormat/pgterms:file', NS):
+            mime = file_elem.findtext('dcterms:format/rdf:Description/rdf:value', default='', namespaces=NS)
+            format_type = MIME_FORMATS.get(mime)
+            if format_type and format_type not in download_links:
+                download_links[format_type] = file_elem.get(RDF_ABOUT, '')
+
+        downloads = ebook.findtext('pgterms:downloads', default='0', namespaces=NS)
+
+        return self._make_record(
+            book_id=book_id,
+            title=title,
+            authors=authors,
+            language_codes=[_rdf_value(elem) for elem in ebook.findall('dcterms:language', NS)],
+            issued=ebook.findtext('dcterms:issued', default='', namespaces=NS),
+            subjects=[_rdf_value(elem) for elem in ebook.findall('dcterms:subject', NS)],
+            bookshelves=[_rdf_value(elem) for elem in ebook.findall('pgterms:bookshelf', NS)],
+            download_links=download_links or self._default_download_links(book_id),
+            downloads=int(downloads) if downloads.isdigit() else 0
+        )
+
+    def _make_record(self, book_id: str, title: str, authors: List[str], language_codes: List[str],
+                     issued: str, subjects: List[str], bookshelves: List[str],
+                     download_links: Dict[str, str], downloads: int) -> Dict:
+        """크롤러가 만드는 것과 같은 형태의 도서 레코드를 만듭니다."""
+        return {
+            'id': book_id,
+            'title': ' '.join(title.split()),
+            'author': ', '.join(_display_name(author) for author in authors) or 'Unknown',
+            'url': f"{self.base_url}/ebooks/{book_id}",
+            'downloads': downloads,
+            'subjects': [subject for subject in subjects if subject],
+            'language': ', '.join(LANGUAGE_NAMES.get(code, code) for code in language_codes if code) or 'Unknown',
+            'release_date': _format_release_date(issued),
+            'bookshelves': [_strip_category(shelf) for shelf in bookshelves if shelf],
+            'download_links': download_links
+        }
+
+    def _default_download_links(self, book_id: str) -> Dict[str, str]:
+        return {
+            'HTML': f"{self.base_url}/ebooks/{book_id}.html.images",
+            'EPUB': f"{self.base_url}/ebooks/{book_id}.epub3.images",
+            PLAIN_TEXT_FORMAT: f"{self.base_url}/ebooks/{book_id}.txt.utf-8"
+        }
+
+def _split_list(value: str) -> List[str]:
+    return [item.strip() for item in value.split(';') if item.strip()]
+
+def _rdf_value(elem) -> str:
+    return elem.findtext('rdf:Description/rdf:value', default='', namespaces=NS)
+
+def _display_name(author: str) -> str:
+    """'Austen, Jane, 1775-1817' 을 목록 페이지와 같은 'Jane Austen' 형태로 바꿉니다."""
+    author = re.sub(r'\s*\[[^\]]*\]', '', author)
+    parts = [part.strip() for part in author.split(',') if part.strip() and not re.search(r'\d', part)]
+    if len(parts) >= 2:
+        return f"{' '.join(parts[1:])} {parts[0]}"
+    return parts[0] if parts else author.strip()
+
+def _strip_category(shelf: str) -> str:
+    # 최신 카탈로그는 'Category: Novels' 형태로 서재 이름을 표기합니다
+    return shelf.split(':', 1)[1].strip() if shelf.startswith('Category:') else shelf
+
+def _format_release_date(issued: str) -> str:
+    """'1998-06-01' 을 상세 페이지와 같은 'Jun 1, 1998' 형태로 바꿉니다."""
+    try:
+        date = datetime.strptime(issued.strip(), '%Y-%m-%d')
+        return f"{date:%b} {date.day}, {date.year}"
+    except ValueError:
+        return issued.strip() or 'Unknown'
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) < 2:
+        print("사용법: python catalog_loader.py <pg_catalog.csv | rdf-files.tar.bz2>")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    count = sum(1 for _ in CatalogLoader(sys.argv[1]).iter_books())
+    print(f"{count}권, {time.perf_counter() - started:.1f}초")
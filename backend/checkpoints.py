@@ -0,0 +1,177 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from config import Config
+
+class Checkpoint:
+    """실행 중간 결과를 기록하는 인터페이스입니다. 기본 구현은 아무것도 기록하지 않습니다."""
+
+    def stage_result(self, stage: str) -> Optional[Any]:
+        return None
+
+    def complete_stage(self, stage: str, result: Any):
+        pass
+
+    def items(self, stage: str) -> Dict[str, Any]:
+        return {}
+
+    def record_item(self, stage: str, key: str, value: Any):
+        pass
+
+    def flush(self):
+        pass
+
+    def finish(self):
+        pass
+
+class RunCheckpoint(Checkpoint):
+    """CheckpointStore에 기록되는 실행 하나의 체크포인트입니다.
+
+    단계가 끝나면 그 결과를, 단계 안에서는 항목별 결과를 every건마다 모아서 기록합니다.
+    """
+
+    def __init__(self, store: 'CheckpointStore', run_id: str, every: int = None):
+        self.store = store
+        self.run_id = run_id
+        self.every = every or Config.CHECKPOINT_EVERY
+        self._pending: List[Tuple[str, str, Any]] = []
+
+    def stage_result(self, stage: str) -> Optional[Any]:
+        return self.store.stage_result(self.run_id, stage)
+
+    def complete_stage(self, stage: str, result: Any):
+        self.flush()
+        self.store.save_stage(self.run_id, stage, result)
+
+    def items(self, stage: str) -> Dict[str, Any]:
+        return self.store.items(self.run_id, stage)
+
+    def record_item(self, stage: str, key: str, value: Any):
+        self._pending.append((stage, str(key), value))
+        if len(self._pending) >= self.every:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self.store.save_items(self.run_id, self._pending)
+            self._pending = []
+
+    def finish(self):
+        self._pending = []
+        self.store.finish(self.run_id)
+
+class CheckpointStore:
+    """실행 종류(kind)별로 마지막 미완료 실행의 단계/항목 결과를 SQLite에 보관합니다.
+
+    실행이 끝나면 기록을 지우고, 같은 종류의 새 실행을 시작하면 stale_after초 넘게 갱신되지 않은
+    이전 미완료 기록도 지웁니다. (최근에 갱신된 기록은 다른 프로세스에서 실행 중일 수 있습니다)
+    """
+
+    def __init__(self, path: str = None, stale_after: float = None):
+        self.path = path or Config.CHECKPOINT_PATH
+        self.stale_after = Config.CHECKPOINT_STALE_SECONDS if stale_after is None else stale_after
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                started_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS stages (
+                run_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                result TEXT NOT NULL,
+                PRIMARY KEY (run_id, stage)
+            );
+            CREATE TABLE IF NOT EXISTS items (
+                run_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (run_id, stage, key)
+            );
+        """)
+        self._db.commit()
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+
+    def start(self, kind: str) -> RunCheckpoint:
+        """새 실행을 시작합니다. 같은 종류의 오래된 미완료 기록은 지웁니다."""
+        run_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            old_runs = self._db.execute(
+                "SELECT run_id FROM runs WHERE kind = ? AND updated_at < ?", (kind, now - self.stale_after)
+            ).fetchall()
+            for (old_run,) in old_runs:
+                self._delete(old_run)
+            self._db.execute("INSERT INTO runs VALUES (?, ?, ?, ?)", (run_id, kind, now, now))
+            self._db.commit()
+        return RunCheckpoint(self, run_id)
+
+    def resume(self, kind: str) -> Optional[RunCheckpoint]:
+        """가장 최근의 미완료 실행을 이어서 기록합니다. 없으면 None입니다."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT run_id, started_at FROM runs WHERE kind = ? ORDER BY started_at DESC LIMIT 1", (kind,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        self.logger.info(f"체크포인트에서 이어서 실행합니다 ({kind}, 시작: {time.ctime(row[1])})")
+        return RunCheckpoint(self, row[0])
+
+    def stage_result(self, run_id: str, stage: str) -> Optional[Any]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result FROM stages WHERE run_id = ? AND stage = ?", (run_id, stage)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_stage(self, run_id: str, stage: str, result: Any):
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO stages VALUES (?, ?, ?)",
+                             (run_id, stage, json.dumps(result, ensure_ascii=False, default=str)))
+            self._touch(run_id)
+            self._db.commit()
+
+    def items(self, run_id: str, stage: str) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, value FROM items WHERE run_id = ? AND stage = ?", (run_id, stage)
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def save_items(self, run_id: str, items: List[Tuple[str, str, Any]]):
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?)",
+                [(run_id, stage, key, json.dumps(value, ensure_ascii=False, default=str))
+                 for stage, key, value in items]
+            )
+            self._touch(run_id)
+            self._db.commit()
+
+    def finish(self, run_id: str):
+        with self._lock:
+            self._delete(run_id)
+            self._db.commit()
+
+    def _touch(self, run_id: str):
+        self._db.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (time.time(), run_id))
+
+    def _delete(self, run_id: str):
+        for table in ('items', 'stages', 'runs'):
+            self._db.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+
+    def close(self):
+        with self._lock:
+            self._db.close()
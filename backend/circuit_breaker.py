@@ -0,0 +1,100 @@
+import logging
+import time
+from typing import Dict, List
+import metrics
+from config import Config
+
+class CircuitOpenError(Exception):
+    """회로가 열린 호스트로 요청을 보내려 할 때 발생합니다. (네트워크를 거치지 않고 바로 실패)"""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"{host} 요청 차단 중 ({retry_in:.0f}초 후 재시도)")
+        self.host = host
+        self.retry_in = retry_in
+
+class CircuitBreaker:
+    """호스트 하나의 연속 실패를 세다가 threshold번에 이르면 reset_timeout 동안 요청을 막습니다.
+
+    시간이 지나면 반열림(half-open) 상태에서 요청 하나만 보내 보고, 성공하면 닫고 실패하면 다시 엽니다.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = 'closed', 'half_open', 'open'
+
+    def __init__(self, host: str, threshold: int, reset_timeout: float):
+        self.host = host
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._probe_started = None
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def blocked_for(self) -> float:
+        """회로가 열려 있으면 남은 시간(초), 아니면 0입니다."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def raise_if_open(self):
+        """회로가 열려 있으면 CircuitOpenError를 던집니다. (대기열에 들어가기 전/기다리는 중 확인용)"""
+        blocked = self.blocked_for()
+        if blocked > 0:
+            metrics.observe_circuit_rejection(self.host)
+            raise CircuitOpenError(self.host, blocked)
+
+    def acquire(self):
+        """요청을 보내기 직전에 확인합니다. 반열림 상태에서는 시험 요청 하나만 통과시킵니다."""
+        self.raise_if_open()
+
+        if self.state == self.HALF_OPEN:
+            now = time.monotonic()
+            # 시험 요청이 취소되어 결과가 기록되지 않아도 reset_timeout이 지나면 다시 시험합니다
+            if self._probe_started is not None and now - self._probe_started < self.reset_timeout:
+                metrics.observe_circuit_rejection(self.host)
+                raise CircuitOpenError(self.host, self._probe_started + self.reset_timeout - now)
+            self._probe_started = now
+
+    def record_success(self):
+        if self.opened_at is not None:
+            self.logger.info(f"{self.host} 요청 재개")
+            metrics.observe_circuit(self.host, self.CLOSED)
+        self.failures = 0
+        self.opened_at = None
+        self._probe_started = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.threshold:
+            if self.opened_at is None:
+                self.logger.warning(f"{self.host} 연속 {self.failures}회 실패, {self.reset_timeout:.0f}초 동안 요청 중단")
+            self.opened_at = time.monotonic()
+            self._probe_started = None
+            metrics.observe_circuit(self.host, self.OPEN)
+
+class HostCircuitBreaker:
+    """호스트별 회로 차단기를 관리합니다. (HostRateLimiter처럼 공유 HTTP 클라이언트가 하나를 가집니다)"""
+
+    def __init__(self, threshold: int = None, reset_timeout: float = None):
+        self.threshold = threshold or Config.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_timeout = Config.CIRCUIT_RESET_TIMEOUT if reset_timeout is None else reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(host, self.threshold, self.reset_timeout)
+            self._breakers[host] = breaker
+        return breaker
+
+    def open_hosts(self) -> List[str]:
+        return [host for host, breaker in self._breakers.items() if breaker.state != CircuitBreaker.CLOSED]
@@ -7,13 +7,97 @@ class Config:
     REDDIT_CLIENT_ID = os.getenv('REDDIT_CLIENT_ID')
     REDDIT_CLIENT_SECRET = os.getenv('REDDIT_CLIENT_SECRET')
     REDDIT_USER_AGENT = os.getenv('REDDIT_USER_AGENT', 'BookRecommendationBot/1.0')
+    # 동시에 보낼 Reddit 요청 수, 남은 한도가 이 값 이하이면 리셋까지 대기
+    REDDIT_CONCURRENCY = int(os.getenv('REDDIT_CONCURRENCY', '8'))
+    REDDIT_MIN_REMAINING = float(os.getenv('REDDIT_MIN_REMAINING', '5'))
     
     FIREBASE_ADMIN_SDK_PATH = os.getenv('FIREBASE_ADMIN_SDK_PATH')
     
     GUTENBERG_BASE_URL = 'https://www.gutenberg.org'
     GOODREADS_BASE_URL = 'https://www.goodreads.com'
     
+    # Gutenberg 일괄 카탈로그 파일 경로 (pg_catalog.csv 또는 rdf-files.tar.bz2). 지정하면 HTML 크롤링 대신 사용
+    GUTENBERG_CATALOG_PATH = os.getenv('GUTENBERG_CATALOG_PATH')
+    
     REQUEST_DELAY = float(os.getenv('REQUEST_DELAY', '1.0'))
+    
+    # 호스트별 초당 요청 수 (기본값은 REQUEST_DELAY에서 계산, 0이면 제한 없음)
+    RATE_LIMIT_RPS = float(os.getenv('RATE_LIMIT_RPS', str(1 / REQUEST_DELAY if REQUEST_DELAY > 0 else 0)))
+    RATE_LIMIT_BURST = int(os.getenv('RATE_LIMIT_BURST', '1'))
+    # 예: www.gutenberg.org=2:4,www.goodreads.com=0.5
+    # Reddit OAuth 한도는 분당 100회이므로 초당 1.6회, 한 번에 30회까지 허용합니다
+    RATE_LIMIT_OVERRIDES = os.getenv('RATE_LIMIT_OVERRIDES', 'oauth.reddit.com=1.6:30')
+    
+    # 일시적인 실패(429/5xx, 연결 오류) 재시도 횟수와 지수 백오프 기본/최대 대기 시간(초)
+    # Retry-After가 RETRY_MAX_DELAY보다 길면 다시 보내지 않습니다
     MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))
+    RETRY_BACKOFF_BASE = float(os.getenv('RETRY_BACKOFF_BASE', '0.5'))
+    RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', '30'))
+    # 호스트가 연속으로 이만큼 실패하면 CIRCUIT_RESET_TIMEOUT초 동안 요청을 보내지 않습니다
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5'))
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv('CIRCUIT_RESET_TIMEOUT', '30'))
+    
+    HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', '64'))
+    HTTP_MAX_PER_HOST = int(os.getenv('HTTP_MAX_PER_HOST', '8'))
+    HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '10'))
+    
+    # 디스크 HTTP 응답 캐시 (TTL 단위: 초)
+    HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE_ENABLED', 'true').lower() == 'true'
+    HTTP_CACHE_DIR = os.getenv('HTTP_CACHE_DIR', '.http_cache')
+    HTTP_CACHE_MAX_BYTES = int(os.getenv('HTTP_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+    HTTP_CACHE_DEFAULT_TTL = float(os.getenv('HTTP_CACHE_DEFAULT_TTL', '3600'))
+    HTTP_CACHE_TTLS = os.getenv('HTTP_CACHE_TTLS', 'www.gutenberg.org=604800,www.goodreads.com=86400')
+    
+    # 전체 크롤링 체크포인트 (SQLite), 단계 안에서 항목 결과를 기록하는 간격(건),
+    # 새 실행을 시작할 때 지우는 이전 기록의 최소 미갱신 시간(초, 이보다 최근이면 실행 중으로 봅니다)
+    CHECKPOINT_PATH = os.getenv('CHECKPOINT_PATH', 'crawl_checkpoints.sqlite')
+    CHECKPOINT_EVERY = int(os.getenv('CHECKPOINT_EVERY', '25'))
+    CHECKPOINT_STALE_SECONDS = float(os.getenv('CHECKPOINT_STALE_SECONDS', '21600'))
+    
+    # 증분 크롤링 워터마크 파일, 새 도서를 찾을 때 넘겨볼 최대 목록 페이지 수
+    WATERMARK_PATH = os.getenv('WATERMARK_PATH', 'crawl_watermarks.json')
+    INCREMENTAL_MAX_PAGES = int(os.getenv('INCREMENTAL_MAX_PAGES', '20'))
+    
+    # API가 메모리에서 제공하는 일일 추천 스냅샷 파일 (gzip 압축 JSON)
+    DAILY_SNAPSHOT_PATH = os.getenv('DAILY_SNAPSHOT_PATH', 'daily_recommendations.json.gz')
+    
+    # Gutenberg 전문 저장 디렉터리, 파일 하나를 내려받을 때의 제한 시간(초)
+    CORPUS_DIR = os.getenv('CORPUS_DIR', 'corpus')
+    CORPUS_DOWNLOAD_TIMEOUT = float(os.getenv('CORPUS_DOWNLOAD_TIMEOUT', '120'))
+    # mmap으로 열어 둘 본문 파일 수 (최근에 읽은 책 순)
+    CORPUS_OPEN_BOOKS = int(os.getenv('CORPUS_OPEN_BOOKS', '64'))
+    
+    # 필사 연습 구간 목표 크기(바이트), 페이지당 구간 수, 구간/색인 LRU 캐시 크기(바이트)
+    PASSAGE_BYTES = int(os.getenv('PASSAGE_BYTES', '800'))
+    PASSAGES_PER_PAGE = int(os.getenv('PASSAGES_PER_PAGE', '3'))
+    PASSAGE_CACHE_BYTES = int(os.getenv('PASSAGE_CACHE_BYTES', str(64 * 1024 * 1024)))
+    
+    # 본문 분석(가독성 점수, 명문장 추출)에 함께 쓰는 프로세스 풀의 워커 수 (0이면 CPU 수)
+    PROCESS_WORKERS = int(os.getenv('PROCESS_WORKERS', '0'))
+    
+    # 가독성 점수 파일, 한 번에 점수를 매길 최대 도서 수, 흔한 단어 기준 도서 수
+    READABILITY_PATH = os.getenv('READABILITY_PATH', 'readability_scores.json')
+    READABILITY_MAX_BOOKS = int(os.getenv('READABILITY_MAX_BOOKS', '500'))
+    READABILITY_REFERENCE_BOOKS = int(os.getenv('READABILITY_REFERENCE_BOOKS', '200'))
+    
+    # 일일 업데이트에서 책마다 뽑을 명문장 수
+    QUOTES_PER_BOOK = int(os.getenv('QUOTES_PER_BOOK', '3'))
+    
+    # 크롤링 결과 업로드 (청크당 레코드 수, 동시에 올릴 청크 수, 재시도 기본 대기 시간(초))
+    UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', '500'))
+    UPLOAD_CONCURRENCY = int(os.getenv('UPLOAD_CONCURRENCY', '4'))
+    UPLOAD_RETRY_BACKOFF = float(os.getenv('UPLOAD_RETRY_BACKOFF', '1.0'))
+    
+    # HTML 파서 (lxml이 없으면 html.parser 사용), 필요한 영역만 파싱할지 여부
+    HTML_PARSER = os.getenv('HTML_PARSER', 'lxml')
+    HTML_PARSE_ONLY = os.getenv('HTML_PARSE_ONLY', 'true').lower() == 'true'
+    
+    # 큐레이션 도서 검색에 사용할 카탈로그 페이지 수 (페이지당 25권)
+    CATALOG_INDEX_PAGES = int(os.getenv('CATALOG_INDEX_PAGES', '5'))
+    
+    # 백그라운드 크롤링 작업 (동시 실행 워커 수, 대기열 크기, 보관할 완료 작업 수)
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+    JOB_QUEUE_SIZE = int(os.getenv('JOB_QUEUE_SIZE', '10'))
+    JOB_HISTORY = int(os.getenv('JOB_HISTORY', '100'))
     
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
\ No newline at end of file
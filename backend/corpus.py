@@ -0,0 +1,280 @@
+import asyncio
+import io
+import logging
+import mmap
+import os
+import re
+import tempfile
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from config import Config
+from http_client import AsyncHttpClient
+from catalog_loader import PLAIN_TEXT_FORMAT
+
+# 본문 앞뒤의 Project Gutenberg 머리말/라이선스 경계 (옛 파일은 'THIS', 'EBOOK' 대신 'E-BOOK' 표기도 씁니다)
+START_MARKER = re.compile(r'^\*\*\*\s*START OF (?:THE|THIS) PROJECT GUTENBERG E-?BOOK.*$',
+                          re.IGNORECASE | re.MULTILINE)
+END_MARKER = re.compile(r'^(?:\*\*\*\s*END OF (?:THE|THIS) PROJECT GUTENBERG E-?BOOK'
+                        r'|End of (?:the )?Project Gutenberg)',
+                        re.IGNORECASE | re.MULTILINE)
+
+# 장 제목 문단: 'CHAPTER I.', 'Chapter One', 'STAVE III', 'BOOK 2' 또는 번호만 있는 줄 ('XII.', '7')
+NUMBER = (r'(?:[ivxlcdm]+|\d+|one|two|three|four|five|six|seven|eight|nine|ten|eleven|twelve|\w+teen'
+          r'|twenty\S*|thirty\S*|forty\S*|fifty\S*|first|second|third|fourth|fifth|last|the\s+\w+)')
+HEADING = re.compile(rf'^(?:(?:chapter|book|part|stave|volume|canto|act)\s+{NUMBER}\b.*|[ivxlc]+\.?|\d{{1,3}}\.?)$',
+                     re.IGNORECASE | re.DOTALL)
+# 이보다 긴 문단은 장 제목으로 보지 않습니다 (바이트)
+MAX_HEADING_BYTES = 100
+# 다음 장 제목까지 본문이 이보다 짧으면 목차 항목으로 보고 버립니다 (바이트)
+MIN_CHAPTER_BYTES = 500
+
+def build_index(raw: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """본문 바이트에서 문단 [시작, 끝) 바이트 위치 (n x 2)와 장 제목 문단 번호들을 찾습니다.
+
+    줄 경계와 빈 줄 여부를 numpy로 한 번에 계산하므로 파이썬 반복은 짧은 제목 후보에만 씁니다.
+    """
+    newlines = np.flatnonzero(raw == ord('\n'))
+    line_starts = np.concatenate(([0], newlines + 1))
+    line_ends = np.concatenate((newlines, [len(raw)]))
+    visible = np.concatenate(([0], np.cumsum(~np.isin(raw, (ord(' '), ord('\t'), ord('\r'))))))
+    blank = visible[line_ends] == visible[line_starts]
+
+    first = np.flatnonzero(~blank & np.concatenate(([True], blank[:-1])))
+    last = np.flatnonzero(~blank & np.concatenate((blank[1:], [True])))
+    paragraphs = np.stack([line_starts[first], line_ends[last]], axis=1).astype(np.int64)
+
+    short = np.flatnonzero(paragraphs[:, 1] - paragraphs[:, 0] <= MAX_HEADING_BYTES)
+    headings = np.array([
+        index for index in short
+        if HEADING.match(bytes(raw[paragraphs[index, 0]:paragraphs[index, 1]]).decode('utf-8', errors='replace').strip())
+    ], dtype=np.int64)
+
+    if len(headings):
+        # 목차처럼 제목만 연달아 나오는 곳은 장으로 보지 않습니다
+        next_start = np.append(paragraphs[headings[1:], 0], len(raw))
+        headings = headings[next_start - paragraphs[headings, 1] >= MIN_CHAPTER_BYTES]
+
+    return paragraphs, headings
+
+class CorpusText:
+    """mmap으로 연 본문 하나와 문단/장 색인입니다.
+
+    slice/paragraph는 파일을 읽거나 복사하지 않고 mmap의 memoryview를 반환합니다.
+    """
+
+    def __init__(self, path: str, paragraphs: np.ndarray, chapters: np.ndarray):
+        self.path = path
+        self.paragraphs = paragraphs
+        self.chapters = chapters
+
+        with open(path, 'rb') as f:
+            self._mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b''
+        self._view = memoryview(self._mapped)
+
+    def __len__(self) -> int:
+        return len(self.paragraphs)
+
+    @property
+    def size(self) -> int:
+        return len(self._view)
+
+    def slice(self, start: int, end: int) -> memoryview:
+        return self._view[start:end]
+
+    def paragraph(self, index: int) -> memoryview:
+        start, end = self.paragraphs[index]
+        return self._view[start:end]
+
+    def paragraph_range(self, first: int, count: int) -> memoryview:
+        """first번째 문단부터 count개 문단을 (사이의 빈 줄 포함) 하나의 구간으로 반환합니다."""
+        last = min(first + count, len(self.paragraphs)) - 1
+        return self._view[self.paragraphs[first, 0]:self.paragraphs[last, 1]]
+
+    def chapter_of(self, paragraph_index: int) -> int:
+        """문단이 속한 장 번호입니다. 첫 장 제목 앞이면 -1 입니다."""
+        return int(np.searchsorted(self.chapters, paragraph_index, side='right')) - 1
+
+    def chapter_title(self, chapter: int) -> Optional[str]:
+        if chapter < 0 or chapter >= len(self.chapters):
+            return None
+        return ' '.join(bytes(self.paragraph(self.chapters[chapter])).decode('utf-8', errors='replace').split())
+
+    def close(self):
+        self._view.release()
+        if isinstance(self._mapped, mmap.mmap):
+            self._mapped.close()
+
+def plain_text_url(book: Dict) -> Optional[str]:
+    """상세 페이지의 다운로드 링크(_extract_download_links)에서 UTF-8 텍스트 파일 주소를 고릅니다."""
+    links = book.get('download_links') or {}
+    for format_type in (PLAIN_TEXT_FORMAT, 'Plain Text'):
+        if links.get(format_type):
+            return links[format_type]
+    for format_type, url in links.items():
+        if format_type.startswith('Plain Text'):
+            return url
+
+    # 목록 페이지에서만 본 책은 링크가 없으므로 ID로 만든 주소를 씁니다
+    if str(book.get('id', '')).isdigit():
+        return f"{Config.GUTENBERG_BASE_URL}/ebooks/{book['id']}.txt.utf-8"
+    return None
+
+def strip_boilerplate(text: str) -> str:
+    """Project Gutenberg 머리말과 끝의 라이선스를 떼고 본문만 남깁니다. 경계가 없으면 그대로 둡니다."""
+    start = START_MARKER.search(text)
+    body_start = start.end() if start else 0
+    end = END_MARKER.search(text, body_start)
+    body_end = end.start() if end else len(text)
+    return text[body_start:body_end].strip('\r\n') + '\n'
+
+class TextCorpus:
+    """Gutenberg 전문(plain text)을 책마다 한 번만 내려받아 로컬 디렉터리에 보관합니다.
+
+    파일은 응답 캐시를 거치지 않고 스트리밍으로 받은 뒤 머리말/라이선스를 떼어
+    '{CORPUS_DIR}/{book_id}.txt' (UTF-8, LF 줄바꿈)로 저장하고, 문단/장 바이트 위치 색인을
+    '{book_id}.idx.npz' 로 함께 저장합니다. 읽을 때는 최근에 연 책 몇 권을 mmap으로 열어 둡니다.
+    """
+
+    def __init__(self, http: AsyncHttpClient, directory: str = None, max_open: int = None):
+        self.http = http
+        self.directory = directory or Config.CORPUS_DIR
+        self.max_open = max_open or Config.CORPUS_OPEN_BOOKS
+        self._open: 'OrderedDict[str, CorpusText]' = OrderedDict()
+        self._fetching: Dict[str, asyncio.Task] = {}
+        os.makedirs(self.directory, exist_ok=True)
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+
+    def path(self, book_id) -> str:
+        return os.path.join(self.directory, f"{book_id}.txt")
+
+    def index_path(self, book_id) -> str:
+        return os.path.join(self.directory, f"{book_id}.idx.npz")
+
+    def has(self, book_id) -> bool:
+        return os.path.exists(self.path(book_id))
+
+    async def fetch(self, book: Dict) -> Optional[str]:
+        """책의 본문 파일 경로를 반환합니다. 아직 없으면 내려받고, 실패하면 None입니다."""
+        book_id = book.get('id')
+        if not book_id:
+            return None
+
+        path = self.path(book_id)
+        if os.path.exists(path):
+            return path
+
+        # 같은 책을 동시에 요청하면 한 번만 내려받고 결과를 나눠 씁니다
+        book_id = str(book_id)
+        task = self._fetching.get(book_id)
+        if task is None:
+            task = asyncio.ensure_future(self._download(book_id, book))
+            self._fetching[book_id] = task
+            task.add_done_callback(lambda _, book_id=book_id: self._fetching.pop(book_id, None))
+        return await asyncio.shield(task)
+
+    async def _download(self, book_id: str, book: Dict) -> Optional[str]:
+        url = plain_text_url(book)
+        if not url:
+            return None
+
+        raw_path = self._temp_path(self.path(book_id), '.raw')
+        try:
+            size = await self.http.download(url, raw_path, timeout=Config.CORPUS_DOWNLOAD_TIMEOUT)
+            await asyncio.to_thread(self._finalize, book_id, raw_path)
+        except Exception as e:
+            self.logger.warning(f"본문 다운로드 실패 (ID: {book_id}): {e}")
+            return None
+        finally:
+            if os.path.exists(raw_path):
+                os.remove(raw_path)
+
+        self.logger.debug(f"본문 저장: {self.path(book_id)} ({size} bytes)")
+        return self.path(book_id)
+
+    async def fetch_many(self, books: List[Dict], on_fetched: Callable[[], None] = None) -> Dict[str, str]:
+        """여러 책의 본문을 동시에 준비하고 {book_id: 파일 경로}를 반환합니다. (호스트별 속도 제한 적용)"""
+        async def fetch(book):
+            try:
+                return await self.fetch(book)
+            finally:
+                if on_fetched:
+                    on_fetched()
+
+        paths = await asyncio.gather(*(fetch(book) for book in books))
+        return {str(book['id']): path for book, path in zip(books, paths) if path}
+
+    def open(self, book_id) -> Optional[CorpusText]:
+        """저장된 본문을 mmap으로 엽니다. 최근에 연 max_open권은 열어 둔 채로 재사용합니다."""
+        book_id = str(book_id)
+        text = self._open.get(book_id)
+        if text is not None:
+            self._open.move_to_end(book_id)
+            return text
+
+        path = self.path(book_id)
+        if not os.path.exists(path):
+            return None
+
+        self.ensure_index(book_id)
+        with np.load(self.index_path(book_id)) as index:
+            text = CorpusText(path, index['paragraphs'], index['chapters'])
+
+        self._open[book_id] = text
+        while len(self._open) > self.max_open:
+            _, evicted = self._open.popitem(last=False)
+            self._close(evicted)
+        return text
+
+    def ensure_index(self, book_id):
+        """색인이 없는 예전 파일이면 색인을 만듭니다. (파일만 다루므로 워커 스레드에서 불러도 됩니다)"""
+        if not os.path.exists(self.index_path(book_id)):
+            self._write_index(str(book_id))
+
+    def close(self):
+        for text in self._open.values():
+            self._close(text)
+        self._open.clear()
+
+    def _close(self, text: CorpusText):
+        try:
+            text.close()
+        except BufferError:
+            # 아직 누군가 구간(memoryview)을 들고 있으면 참조가 사라질 때 정리됩니다
+            pass
+
+    def _finalize(self, book_id: str, raw_path: str):
+        with open(raw_path, 'r', encoding='utf-8-sig', errors='replace', newline=None) as f:
+            data = strip_boilerplate(f.read()).encode('utf-8')
+
+        # 색인을 먼저 저장해야 본문 파일이 보이는 순간부터 색인도 있습니다
+        self._write_index(book_id, data)
+        self._write_file(self.path(book_id), data)
+
+    def _write_index(self, book_id: str, data: bytes = None):
+        if data is None:
+            with open(self.path(book_id), 'rb') as f:
+                data = f.read()
+        paragraphs, chapters = build_index(np.frombuffer(data, dtype=np.uint8))
+
+        buffer = io.BytesIO()
+        np.savez(buffer, paragraphs=paragraphs, chapters=chapters)
+        self._write_file(self.index_path(book_id), buffer.getvalue())
+
+    def _write_file(self, path: str, data: bytes):
+        """같은 디렉터리의 고유한 임시 파일에 쓴 뒤 바꿔 넣습니다. (같은 책을 동시에 써도 서로 덮어쓰지 않습니다)"""
+        tmp_path = self._temp_path(path, '.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _temp_path(self, path: str, suffix: str) -> str:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f"{os.path.basename(path)}.", suffix=suffix)
+        os.close(fd)
+        return tmp_path
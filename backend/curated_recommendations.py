@@ -1,18 +1,40 @@
+import asyncio
 import logging
-from typing import Dict, List
+from concurrent.futures import Executor
+from typing import Callable, Dict, List, Optional
 from gutenberg_crawler import GutenbergCrawler
 from goodreads_crawler import GoodreadsCrawler
+from http_client import AsyncHttpClient
+from catalog_index import CatalogIndex
+from title_matcher import normalize_title, fold
+from memoize import SingleFlightCache
+from readability import LEVELS, ReadabilityStore
+from corpus import TextCorpus
+from quotes import QuoteMiner
 from config import Config
 
+TRANSCRIPTION_DIFFICULTY = {
+    'beginner': '초급 (쉬운 문체)',
+    'intermediate': '중급 (적당한 문체)',
+    'advanced': '고급 (복잡한 문체)'
+}
+
 class CuratedRecommendations:
-    def __init__(self):
-        self.gutenberg = GutenbergCrawler()
-        self.goodreads = GoodreadsCrawler()
+    def __init__(self, session: AsyncHttpClient = None, corpus: TextCorpus = None):
+        self.session = session or AsyncHttpClient()
+        self.corpus = corpus or TextCorpus(self.session)
+        self.gutenberg = GutenbergCrawler(self.session)
+        self.goodreads = GoodreadsCrawler(self.session)
+        self.catalog = CatalogIndex(self.gutenberg)
+        # (제목, 작가) -> 보강된 도서 정보. 수준별/필사용 목록에 중복된 책은 한 번만 수집합니다
+        self.enriched_books = SingleFlightCache()
+        # 본문 분석으로 매긴 가독성 점수와 수준 (python main.py readability 로 갱신)
+        self.readability = ReadabilityStore()
         
         logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
         self.logger = logging.getLogger(__name__)
 
-    def get_books_by_english_level(self) -> Dict[str, List[Dict]]:
+    async def get_books_by_english_level(self) -> Dict[str, List[Dict]]:
         """영어 수준별 추천 도서를 가져옵니다."""
         
         recommendations = {
@@ -69,43 +91,73 @@ class CuratedRecommendations:
             'advanced': advanced_books
         }
         
+        # 가독성 분석 결과가 있으면 수동 목록 대신 분석된 카탈로그에서 수준별 인기 도서를 고릅니다
+        if self.readability.books:
+            book_lists = {
+                level: [(book['title'], book['author']) for book in self.readability.books_by_level(level, 10)]
+                for level in LEVELS
+            }
+        
         for level, book_list in book_lists.items():
             self.logger.info(f"{level} 수준 도서 검색 시작")
             
-            for title, author in book_list:
-                try:
-                    # Gutenberg에서 책 검색
-                    book_data = self._search_gutenberg_book(title, author)
-                    
-                    if book_data:
-                        # Goodreads에서 추가 정보 수집
-                        goodreads_info = self.goodreads.search_book(title, author)
-                        if goodreads_info:
-                            book_data.update(goodreads_info)
-                            
-                            # 상세 정보 추가
-                            if goodreads_info.get('goodreads_url'):
-                                details = self.goodreads.get_book_details(goodreads_info['goodreads_url'])
-                                if details:
-                                    book_data.update(details)
-                        
-                        book_data['english_level'] = level
-                        book_data['recommended_for'] = f"{level} 영어 학습자"
-                        
-                        recommendations[level].append(book_data)
-                        
-                        if len(recommendations[level]) >= 10:
-                            break
-                    
-                except Exception as e:
-                    self.logger.warning(f"'{title}' by {author} 검색 실패: {e}")
+            # 같은 수준의 책들은 동시에 검색합니다
+            results = await asyncio.gather(*(
+                self._collect_book(title, author) for title, author in book_list
+            ))
+            
+            for book_data in results:
+                if not book_data:
                     continue
+                
+                book_data['english_level'] = level
+                book_data['recommended_for'] = f"{level} 영어 학습자"
+                scores = self.readability.get(book_data.get('id'))
+                if scores:
+                    book_data['readability'] = scores
+                
+                recommendations[level].append(book_data)
+                
+                if len(recommendations[level]) >= 10:
+                    break
             
             self.logger.info(f"{level} 수준 도서 {len(recommendations[level])}권 수집 완료")
         
         return recommendations
 
-    def get_transcription_books(self) -> List[Dict]:
+    async def _collect_book(self, title: str, author: str) -> Optional[Dict]:
+        """Gutenberg에서 책을 찾고 Goodreads 정보를 덧붙입니다. (실행당 한 번만 수집)"""
+        key = (normalize_title(title), fold(author))
+        book_data = await self.enriched_books.get(key, lambda: self._fetch_book(title, author))
+        
+        # 호출 측에서 수준/필사 정보를 덧붙이므로 사본을 반환합니다
+        return dict(book_data) if book_data else None
+
+    async def _fetch_book(self, title: str, author: str) -> Optional[Dict]:
+        """Gutenberg/Goodreads에서 책 정보를 실제로 수집합니다."""
+        try:
+            # Gutenberg에서 책 검색
+            book_data = await self._search_gutenberg_book(title, author)
+            
+            if book_data:
+                # Goodreads에서 추가 정보 수집
+                goodreads_info = await self.goodreads.search_book(title, author)
+                if goodreads_info:
+                    book_data.update(goodreads_info)
+                    
+                    # 상세 정보 추가
+                    if goodreads_info.get('goodreads_url'):
+                        details = await self.goodreads.get_book_details(goodreads_info['goodreads_url'])
+                        if details:
+                            book_data.update(details)
+            
+            return book_data
+            
+        except Exception as e:
+            self.logger.warning(f"'{title}' by {author} 검색 실패: {e}")
+            return None
+
+    async def get_transcription_books(self) -> List[Dict]:
         """필사용 추천 도서를 가져옵니다."""
         
         self.logger.info("필사용 추천 도서 검색 시작")
@@ -128,71 +180,50 @@ class CuratedRecommendations:
         
         transcription_books = []
         
-        for title, author, writing_style in transcription_candidates:
-            try:
-                # Gutenberg에서 책 검색
-                book_data = self._search_gutenberg_book(title, author)
-                
-                if book_data:
-                    # Goodreads에서 추가 정보
-                    goodreads_info = self.goodreads.search_book(title, author)
-                    if goodreads_info:
-                        book_data.update(goodreads_info)
-                        
-                        if goodreads_info.get('goodreads_url'):
-                            details = self.goodreads.get_book_details(goodreads_info['goodreads_url'])
-                            if details:
-                                book_data.update(details)
-                    
-                    book_data['recommended_for'] = '필사 연습'
-                    book_data['writing_style'] = writing_style
-                    book_data['transcription_difficulty'] = self._assess_transcription_difficulty(title, author)
-                    
-                    transcription_books.append(book_data)
-                    
-                    if len(transcription_books) >= 12:
-                        break
-                
-            except Exception as e:
-                self.logger.warning(f"'{title}' by {author} 필사용 도서 검색 실패: {e}")
+        results = await asyncio.gather(*(
+            self._collect_book(title, author) for title, author, _ in transcription_candidates
+        ))
+        
+        for (title, author, writing_style), book_data in zip(transcription_candidates, results):
+            if not book_data:
                 continue
+            
+            book_data['recommended_for'] = '필사 연습'
+            book_data['writing_style'] = writing_style
+            book_data['transcription_difficulty'] = self._assess_transcription_difficulty(title, author, book_data.get('id'))
+            
+            transcription_books.append(book_data)
+            
+            if len(transcription_books) >= 12:
+                break
         
         self.logger.info(f"필사용 도서 {len(transcription_books)}권 수집 완료")
         return transcription_books
 
-    def _search_gutenberg_book(self, title: str, author: str) -> Dict:
+    async def _search_gutenberg_book(self, title: str, author: str) -> Dict:
         """Gutenberg에서 특정 책을 검색합니다."""
         
-        # 여러 페이지를 검색하여 해당 책을 찾습니다
-        for page in range(1, 6):  # 최대 5페이지까지 검색
-            try:
-                books = self.gutenberg.get_book_catalog(page)
-                
-                for book in books:
-                    book_title = book.get('title', '').lower()
-                    book_author = book.get('author', '').lower()
-                    
-                    # 제목과 작가가 포함되어 있는지 확인
-                    if (title.lower() in book_title or 
-                        any(word in book_title for word in title.lower().split()) and
-                        author.lower().split()[-1] in book_author):  # 성으로 검색
-                        
-                        # 상세 정보 가져오기
-                        if book.get('id'):
-                            details = self.gutenberg.get_book_details(book['id'])
-                            if details:
-                                book.update(details)
-                        
-                        return book
-                
-            except Exception as e:
-                self.logger.warning(f"페이지 {page} 검색 실패: {e}")
-                continue
+        # 카탈로그는 실행당 한 번만 내려받고 이후에는 색인에서 찾습니다
+        await self.catalog.ensure_loaded()
+        
+        book = self.catalog.lookup(title, author)
+        if not book:
+            return None
+        
+        # 상세 정보 가져오기 (로컬 카탈로그에서 읽은 책은 이미 포함)
+        if book.get('id') and 'subjects' not in book:
+            details = await self.gutenberg.get_book_details(book['id'])
+            if details:
+                book.update(details)
         
-        return None
+        return book
 
-    def _assess_transcription_difficulty(self, title: str, author: str) -> str:
-        """필사 난이도를 평가합니다."""
+    def _assess_transcription_difficulty(self, title: str, author: str, book_id: str = None) -> str:
+        """필사 난이도를 평가합니다. (가독성 분석 결과가 있으면 그 수준, 없으면 작가별 기준)"""
+        
+        scores = self.readability.get(book_id)
+        if scores and scores.get('level'):
+            return TRANSCRIPTION_DIFFICULTY[scores['level']]
         
         # 작가별 난이도 설정
         easy_authors = ['l. m. montgomery', 'frances hodgson burnett', 'louisa may alcott']
@@ -202,28 +233,31 @@ class CuratedRecommendations:
         author_lower = author.lower()
         
         if any(easy_author in author_lower for easy_author in easy_authors):
-            return '초급 (쉬운 문체)'
+            return TRANSCRIPTION_DIFFICULTY['beginner']
         elif any(medium_author in author_lower for medium_author in medium_authors):
-            return '중급 (적당한 문체)'
+            return TRANSCRIPTION_DIFFICULTY['intermediate']
         elif any(hard_author in author_lower for hard_author in hard_authors):
-            return '고급 (복잡한 문체)'
+            return TRANSCRIPTION_DIFFICULTY['advanced']
         else:
-            return '중급 (적당한 문체)'
+            return TRANSCRIPTION_DIFFICULTY['intermediate']
 
-    def get_daily_recommendations(self) -> Dict:
+    async def get_daily_recommendations(self) -> Dict:
         """매일 업데이트할 추천 도서 목록을 생성합니다."""
         
         self.logger.info("일일 추천 도서 생성 시작")
         
-        # 영어 수준별 추천
-        level_books = self.get_books_by_english_level()
+        # 영어 수준별 추천과 필사용 추천을 동시에 수집
+        level_books, transcription_books = await asyncio.gather(
+            self.get_books_by_english_level(),
+            self.get_transcription_books()
+        )
         
-        # 필사용 추천
-        transcription_books = self.get_transcription_books()
+        self.logger.info(f"중복 제외 {len(self.enriched_books)}권 수집 "
+                         f"(캐시 적중 {self.enriched_books.hits}회)")
         
         # 오늘의 추천 (각 카테고리에서 3권씩 선별)
         import random
-        from datetime import datetime
+        from datetime import datetime, timedelta
         
         today = datetime.now()
         random.seed(today.day)  # 날짜를 시드로 사용하여 일관된 결과
@@ -241,47 +275,22 @@ class CuratedRecommendations:
             },
             'generated_at': today.isoformat(),
             'next_update': (today.replace(hour=2, minute=0, second=0) + 
-                          (datetime.timedelta(days=1) if today.hour >= 2 else datetime.timedelta(days=0))).isoformat()
+                          (timedelta(days=1) if today.hour >= 2 else timedelta(days=0))).isoformat()
         }
         
         self.logger.info("일일 추천 도서 생성 완료")
         return daily_picks
 
-    def get_featured_quotes(self, books: List[Dict]) -> List[Dict]:
-        """추천 도서에서 명문장을 추출합니다."""
-        
-        famous_quotes = {
-            "pride and prejudice": [
-                "It is a truth universally acknowledged, that a single man in possession of a good fortune, must be in want of a wife.",
-                "I declare after all there is no enjoyment like reading!"
-            ],
-            "jane eyre": [
-                "I am no bird; and no net ensnares me: I am a free human being with an independent will.",
-                "I would always rather be happy than dignified."
-            ],
-            "alice's adventures in wonderland": [
-                "We're all mad here.",
-                "Who in the world am I? Ah, that's the great puzzle!"
-            ],
-            "the picture of dorian gray": [
-                "We are all in the gutter, but some of us are looking at the stars.",
-                "I can resist everything except temptation."
-            ]
-        }
+    async def get_featured_quotes(self, books: List[Dict], executor: Executor,
+                                  on_progress: Callable[[], None] = None) -> List[Dict]:
+        """추천 도서 본문에서 명문장을 executor(공유 프로세스 풀)로 추출합니다. (본문은 책마다 한 번만 내려받아 corpus에 보관)"""
         
-        quotes_collection = []
+        # 수준별/필사용 목록에 함께 오른 책은 한 번만 처리합니다
+        unique_books = list({book['id']: book for book in books if book.get('id')}.values())
         
-        for book in books:
-            title = book.get('title', '').lower()
-            
-            for quote_title, quotes in famous_quotes.items():
-                if quote_title in title:
-                    for quote in quotes:
-                        quotes_collection.append({
-                            'book_title': book.get('title'),
-                            'author': book.get('author'),
-                            'quote': quote,
-                            'book_id': book.get('id')
-                        })
-        
-        return quotes_collection
\ No newline at end of file
+        paths = await self.corpus.fetch_many(unique_books)
+        miner = QuoteMiner(executor, self.readability.common_words)
+        quotes = await miner.mine(unique_books, paths, on_mined=on_progress)
+        
+        self.logger.info(f"명문장 {len(quotes)}개 추출 ({len(paths)}/{len(unique_books)}권 본문)")
+        return quotes
@@ -1,23 +1,22 @@
-import requests
-import time
 import logging
-from bs4 import BeautifulSoup
 from typing import Dict, List, Optional
 from urllib.parse import quote
 from config import Config
+from http_client import AsyncHttpClient
+from html_parsing import make_soup, GOODREADS_SEARCH_STRAINER
 
 class GoodreadsCrawler:
-    def __init__(self):
+    def __init__(self, session: AsyncHttpClient = None):
         self.base_url = Config.GOODREADS_BASE_URL
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = session or AsyncHttpClient()
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        }
         
         logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
         self.logger = logging.getLogger(__name__)
 
-    def search_book(self, title: str, author: str = None) -> Optional[Dict]:
+    async def search_book(self, title: str, author: str = None) -> Optional[Dict]:
         """Goodreads에서 책을 검색합니다."""
         search_query = title
         if author:
@@ -27,17 +26,13 @@ class GoodreadsCrawler:
         url = f"{self.base_url}/search?q={encoded_query}"
         
         try:
-            response = self.session.get(url, timeout=10)
+            response = await self.session.get(url, headers=self.headers)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content, GOODREADS_SEARCH_STRAINER)
             
-            # 첫 번째 검색 결과 선택
-            first_result = soup.find('tr', {'itemtype': 'http://schema.org/Book'})
-            
-            if first_result:
-                book_data = self._parse_search_result(first_result)
-                time.sleep(Config.REQUEST_DELAY)
+            book_data = self.parse_search_results(soup)
+            if book_data is not None:
                 return book_data
             
             self.logger.warning(f"'{title}'에 대한 검색 결과를 찾을 수 없습니다.")
@@ -47,6 +42,13 @@ class GoodreadsCrawler:
             self.logger.error(f"Goodreads 검색 실패: {e}")
             return None
 
+    def parse_search_results(self, soup) -> Optional[Dict]:
+        """검색 결과 페이지에서 첫 번째 책 정보를 추출합니다."""
+        first_result = soup.find('tr', {'itemtype': 'http://schema.org/Book'})
+        if first_result:
+            return self._parse_search_result(first_result)
+        return None
+
     def _parse_search_result(self, result_elem) -> Dict:
         """검색 결과에서 책 정보를 파싱합니다."""
         try:
@@ -104,31 +106,31 @@ class GoodreadsCrawler:
         except:
             return 0
 
-    def get_book_details(self, goodreads_url: str) -> Optional[Dict]:
+    async def get_book_details(self, goodreads_url: str) -> Optional[Dict]:
         """Goodreads 책 페이지에서 상세 정보를 가져옵니다."""
         try:
-            response = self.session.get(goodreads_url, timeout=10)
+            response = await self.session.get(goodreads_url, headers=self.headers)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            details = {
-                'description': self._extract_description(soup),
-                'genres': self._extract_genres(soup),
-                'publication_info': self._extract_publication_info(soup),
-                'series_info': self._extract_series_info(soup),
-                'awards': self._extract_awards(soup),
-                'similar_books': self._extract_similar_books(soup),
-                'reviews_sample': self._extract_review_sample(soup)
-            }
-            
-            time.sleep(Config.REQUEST_DELAY)
-            return details
+            soup = make_soup(response.content)
+            return self.parse_book_details(soup)
             
         except Exception as e:
             self.logger.error(f"책 상세정보 크롤링 실패: {e}")
             return None
 
+    def parse_book_details(self, soup) -> Dict:
+        """책 페이지에서 상세 정보를 추출합니다."""
+        return {
+            'description': self._extract_description(soup),
+            'genres': self._extract_genres(soup),
+            'publication_info': self._extract_publication_info(soup),
+            'series_info': self._extract_series_info(soup),
+            'awards': self._extract_awards(soup),
+            'similar_books': self._extract_similar_books(soup),
+            'reviews_sample': self._extract_review_sample(soup)
+        }
+
     def _extract_description(self, soup) -> str:
         """책 설명을 추출합니다."""
         try:
@@ -281,16 +283,16 @@ class GoodreadsCrawler:
         except:
             return 0
 
-    def get_book_lists(self, query: str = "best books", limit: int = 5) -> List[Dict]:
+    async def get_book_lists(self, query: str = "best books", limit: int = 5) -> List[Dict]:
         """Goodreads 책 리스트를 검색합니다."""
         try:
             encoded_query = quote(f"{query} list")
             url = f"{self.base_url}/search?q={encoded_query}&search_type=lists"
             
-            response = self.session.get(url, timeout=10)
+            response = await self.session.get(url, headers=self.headers)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = make_soup(response.content)
             
             lists = []
             list_elements = soup.find_all('div', class_='listItem')[:limit]
@@ -300,7 +302,6 @@ class GoodreadsCrawler:
                 if list_data:
                     lists.append(list_data)
             
-            time.sleep(Config.REQUEST_DELAY)
             return lists
             
         except Exception as e:
@@ -1,41 +1,33 @@
-import requests
-import time
+import asyncio
 import logging
-from bs4 import BeautifulSoup
 from typing import Dict, List, Optional
 from config import Config
+from http_client import AsyncHttpClient
+from html_parsing import make_soup, GUTENBERG_CATALOG_STRAINER, GUTENBERG_BOOK_STRAINER
 
 class GutenbergCrawler:
-    def __init__(self):
+    def __init__(self, session: AsyncHttpClient = None):
         self.base_url = Config.GUTENBERG_BASE_URL
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = session or AsyncHttpClient()
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        }
         
         logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
         self.logger = logging.getLogger(__name__)
 
-    def get_book_catalog(self, page: int = 1) -> List[Dict]:
-        """Project Gutenberg 도서 목록을 가져옵니다."""
-        url = f"{self.base_url}/ebooks/search/?sort_order=downloads&start_index={((page-1) * 25) + 1}"
+    async def get_book_catalog(self, page: int = 1, sort_order: str = 'downloads') -> List[Dict]:
+        """Project Gutenberg 도서 목록을 가져옵니다. (sort_order: downloads 또는 release_date)"""
+        url = f"{self.base_url}/ebooks/search/?sort_order={sort_order}&start_index={((page-1) * 25) + 1}"
         
         try:
-            response = self.session.get(url, timeout=10)
+            response = await self.session.get(url, headers=self.headers)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            books = []
-            
-            book_items = soup.find_all('li', class_='booklink')
-            
-            for item in book_items:
-                book_data = self._parse_book_item(item)
-                if book_data:
-                    books.append(book_data)
+            soup = make_soup(response.content, GUTENBERG_CATALOG_STRAINER)
+            books = self.parse_catalog(soup)
             
             self.logger.info(f"페이지 {page}에서 {len(books)}권의 도서를 찾았습니다.")
-            time.sleep(Config.REQUEST_DELAY)
             
             return books
             
@@ -43,6 +35,22 @@ class GutenbergCrawler:
             self.logger.error(f"도서 목록 크롤링 실패: {e}")
             return []
 
+    async def get_download_counts(self, max_pages: int = 5) -> Dict[str, int]:
+        """인기순 목록 페이지들에서 {book_id: 다운로드 수}를 모읍니다. (다운로드 수가 없는 CSV 카탈로그용)"""
+        pages = await asyncio.gather(*(self.get_book_catalog(page) for page in range(1, max_pages + 1)))
+        return {book['id']: book['downloads'] for books in pages for book in books if book['downloads']}
+
+    def parse_catalog(self, soup) -> List[Dict]:
+        """검색 결과 페이지에서 도서 목록을 추출합니다."""
+        books = []
+        
+        for item in soup.find_all('li', class_='booklink'):
+            book_data = self._parse_book_item(item)
+            if book_data:
+                books.append(book_data)
+        
+        return books
+
     def _parse_book_item(self, item) -> Optional[Dict]:
         """개별 도서 정보를 파싱합니다."""
         try:
@@ -85,66 +93,63 @@ class GutenbergCrawler:
         except:
             return 0
 
-    def get_book_details(self, book_id: str) -> Optional[Dict]:
+    async def get_book_details(self, book_id: str) -> Optional[Dict]:
         """특정 도서의 상세 정보를 가져옵니다."""
         url = f"{self.base_url}/ebooks/{book_id}"
         
         try:
-            response = self.session.get(url, timeout=10)
+            response = await self.session.get(url, headers=self.headers)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            details = {
-                'id': book_id,
-                'subjects': self._extract_subjects(soup),
-                'language': self._extract_language(soup),
-                'release_date': self._extract_release_date(soup),
-                'bookshelves': self._extract_bookshelves(soup),
-                'download_links': self._extract_download_links(soup)
-            }
-            
-            time.sleep(Config.REQUEST_DELAY)
-            return details
+            soup = make_soup(response.content, GUTENBERG_BOOK_STRAINER)
+            return self.parse_book_details(book_id, soup)
             
         except Exception as e:
             self.logger.error(f"도서 상세정보 크롤링 실패 (ID: {book_id}): {e}")
             return None
 
-    def _extract_subjects(self, soup) -> List[str]:
-        """주제/장르 정보를 추출합니다."""
-        subjects = []
-        subject_table = soup.find('table', class_='bibrec')
-        if subject_table:
-            subject_rows = subject_table.find_all('tr')
-            for row in subject_rows:
-                if 'Subject' in row.get_text():
-                    links = row.find_all('a')
-                    subjects.extend([link.get_text(strip=True) for link in links])
-        return subjects
-
-    def _extract_language(self, soup) -> str:
-        """언어 정보를 추출합니다."""
-        lang_elem = soup.find('tr', string=lambda text: 'Language' in text if text else False)
-        if lang_elem:
-            return lang_elem.find_next('td').get_text(strip=True)
-        return 'Unknown'
-
-    def _extract_release_date(self, soup) -> str:
-        """출간일 정보를 추출합니다."""
-        date_elem = soup.find('tr', string=lambda text: 'Release Date' in text if text else False)
-        if date_elem:
-            return date_elem.find_next('td').get_text(strip=True)
-        return 'Unknown'
+    def parse_book_details(self, book_id: str, soup) -> Dict:
+        """도서 상세 페이지에서 메타데이터를 추출합니다."""
+        return {
+            'id': book_id,
+            **self._extract_bibrec(soup),
+            'download_links': self._extract_download_links(soup)
+        }
 
-    def _extract_bookshelves(self, soup) -> List[str]:
-        """서재 카테고리를 추출합니다."""
-        bookshelves = []
-        shelf_elem = soup.find('tr', string=lambda text: 'Bookshelf' in text if text else False)
-        if shelf_elem:
-            links = shelf_elem.find_next('td').find_all('a')
-            bookshelves = [link.get_text(strip=True) for link in links]
-        return bookshelves
+    def _extract_bibrec(self, soup) -> Dict:
+        """bibrec 표를 한 번만 훑으면서 주제/언어/출간일/서재 정보를 함께 추출합니다."""
+        fields = {
+            'subjects': [],
+            'language': 'Unknown',
+            'release_date': 'Unknown',
+            'bookshelves': []
+        }
+        
+        table = soup.find('table', class_='bibrec')
+        if not table:
+            return fields
+        
+        for row in table.find_all('tr'):
+            header = value = None
+            for cell in row.children:
+                if cell.name == 'th':
+                    header = cell
+                elif cell.name == 'td':
+                    value = cell
+            if header is None or value is None:
+                continue
+            
+            label = header.string.strip() if header.string else header.get_text(strip=True)
+            if label == 'Subject':
+                fields['subjects'].extend(link.get_text(strip=True) for link in value.find_all('a'))
+            elif label == 'Language' and fields['language'] == 'Unknown':
+                fields['language'] = value.get_text(strip=True)
+            elif label == 'Release Date' and fields['release_date'] == 'Unknown':
+                fields['release_date'] = value.get_text(strip=True)
+            elif label == 'Bookshelf':
+                fields['bookshelves'].extend(link.get_text(strip=True) for link in value.find_all('a'))
+        
+        return fields
 
     def _extract_download_links(self, soup) -> Dict[str, str]:
         """다운로드 링크를 추출합니다."""
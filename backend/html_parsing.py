@@ -0,0 +1,31 @@
+import logging
+from bs4 import BeautifulSoup, SoupStrainer
+from config import Config
+
+# 크롤러의 추출 함수들이 실제로 사용하는 영역만 파싱하기 위한 필터
+GUTENBERG_CATALOG_STRAINER = SoupStrainer('li', class_='booklink')
+GUTENBERG_BOOK_STRAINER = SoupStrainer('table', class_=['bibrec', 'files'])
+GOODREADS_SEARCH_STRAINER = SoupStrainer('tr', attrs={'itemtype': 'http://schema.org/Book'})
+
+logger = logging.getLogger(__name__)
+
+def _resolve_parser(name: str) -> str:
+    """설정된 파서를 쓸 수 없으면 내장 html.parser로 대체합니다."""
+    if name == 'lxml':
+        try:
+            import lxml  # noqa: F401
+        except ImportError:
+            logger.warning("lxml을 찾을 수 없어 html.parser를 사용합니다.")
+            return 'html.parser'
+    return name
+
+HTML_PARSER = _resolve_parser(Config.HTML_PARSER)
+
+def make_soup(content, parse_only: SoupStrainer = None, parser: str = None) -> BeautifulSoup:
+    """설정된 파서로 HTML을 파싱합니다.
+
+    parse_only가 주어지고 HTML_PARSE_ONLY가 켜져 있으면 해당 영역만 트리로 만듭니다.
+    """
+    if not Config.HTML_PARSE_ONLY:
+        parse_only = None
+    return BeautifulSoup(content, parser or HTML_PARSER, parse_only=parse_only)
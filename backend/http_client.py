@@ -0,0 +1,352 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+from requests.structures import CaseInsensitiveDict
+
+import metrics
+from config import Config
+from rate_limiter import HostRateLimiter
+from response_cache import ResponseCache
+from circuit_breaker import CircuitBreaker, HostCircuitBreaker
+
+# 다시 보내면 성공할 수 있는 응답. 본문이 처리되지 않았다고 알려 주는 429/503만 POST도 다시 보냅니다
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+UNPROCESSED_STATUS = {429, 503}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+# 연결 실패/시간 초과처럼 호스트 상태 때문에 생기는 예외
+TRANSIENT_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+# 속도 제한 대기 중 회로 차단 여부를 확인하는 간격(초)
+CIRCUIT_POLL_INTERVAL = 0.5
+
+class HttpError(Exception):
+    """4xx/5xx 응답을 나타내는 예외입니다."""
+
+    def __init__(self, status_code: int, url: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(f"HTTP {status_code}: {url}")
+        self.status_code = status_code
+        self.url = url
+        self.headers = headers or {}
+
+class FetchResponse:
+    """본문까지 모두 읽은 HTTP 응답입니다. (requests.Response와 비슷한 인터페이스)"""
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HttpError(self.status_code, self.url, self.headers)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 기다릴 시간(초)으로 바꿉니다."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def _body_size(kwargs: Dict) -> int:
+    """요청 본문 크기입니다. json= 본문은 aiohttp가 직렬화하므로 근사치로 계산합니다."""
+    data = kwargs.get('data')
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
+    if kwargs.get('json') is not None:
+        return len(json.dumps(kwargs['json'], default=str).encode('utf-8'))
+    return 0
+
+class AsyncHttpClient:
+    """모든 크롤러가 공유하는 비동기 HTTP 클라이언트입니다.
+
+    하나의 커넥션 풀을 공유하고, 호스트별 동시 요청 수와 요청 속도를 제한합니다.
+    GET 응답은 디스크 캐시에 저장되고 ETag/Last-Modified로 재검증됩니다.
+    일시적인 실패(429/5xx, 연결 오류)는 지터를 준 지수 백오프나 Retry-After만큼 기다려 다시 보내고,
+    연속으로 실패하는 호스트는 회로 차단기가 잠시 요청을 막아 시간 초과를 기다리지 않고 바로 실패시킵니다.
+    """
+
+    def __init__(self, max_connections: int = None, max_per_host: int = None, timeout: float = None,
+                 rate_limiter: HostRateLimiter = None, cache: ResponseCache = None,
+                 circuit_breaker: HostCircuitBreaker = None, max_retries: int = None):
+        self.max_connections = max_connections or Config.HTTP_MAX_CONNECTIONS
+        self.max_per_host = max_per_host or Config.HTTP_MAX_PER_HOST
+        self.timeout = timeout or Config.HTTP_TIMEOUT
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.circuit_breaker = circuit_breaker or HostCircuitBreaker()
+        self.max_retries = Config.MAX_RETRIES if max_retries is None else max_retries
+        if cache is None and Config.HTTP_CACHE_ENABLED:
+            cache = ResponseCache()
+        self.cache = cache
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._host_limits: Dict[str, int] = {}
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+
+    def set_host_limit(self, host: str, limit: int):
+        """특정 호스트의 동시 요청 수를 지정합니다."""
+        self._host_limits[host] = limit
+        self._host_slots.pop(host, None)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._loop = loop
+            self._host_slots = {}
+        return self._session
+
+    def _host_slot(self, host: str) -> asyncio.Semaphore:
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self._host_limits.get(host, self.max_per_host))
+            self._host_slots[host] = slot
+        return slot
+
+    async def request(self, method: str, url: str, headers: Dict[str, str] = None,
+                      timeout: float = None, rate_limited: bool = True, retries: int = None,
+                      **kwargs) -> FetchResponse:
+        """요청을 보내고 본문까지 읽은 응답을 반환합니다. 일시적인 실패는 retries번까지 다시 보냅니다.
+
+        rate_limited=False는 우리 API처럼 크롤링 대상이 아닌 호스트에 보낼 때만 사용합니다.
+        재시도가 끝나도 실패하면 마지막 응답을 반환하거나 마지막 예외를 그대로 던집니다.
+        """
+        async def send() -> FetchResponse:
+            async with self.stream(method, url, headers=headers, timeout=timeout,
+                                   rate_limited=rate_limited, **kwargs) as response:
+                content = await response.read()
+                return FetchResponse(str(response.url), response.status, dict(response.headers), content)
+
+        return await self._with_retries(method, url, send, rate_limited, retries)
+
+    async def _with_retries(self, method: str, url: str, send: Callable[[], Awaitable[Any]],
+                            rate_limited: bool, retries: Optional[int]) -> Any:
+        """send()를 일시적인 실패가 없을 때까지 retries번까지 다시 부릅니다.
+
+        send()가 반환한 응답의 status_code나 던진 HttpError의 상태 코드로 재시도 여부를 정하고,
+        연결 오류/시간 초과는 멱등 요청일 때만 다시 보냅니다. 회로 차단(CircuitOpenError)은 바로 전달합니다.
+        """
+        retries = self.max_retries if retries is None else retries
+        host = urlsplit(url).netloc
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        for attempt in range(retries + 1):
+            last = attempt >= retries
+            try:
+                result = await send()
+            except HttpError as e:
+                delay = None if last else self._retry_delay(host, idempotent, e.status_code, e.headers, rate_limited, attempt)
+                if delay is None:
+                    raise
+                reason = str(e.status_code)
+            except TRANSIENT_ERRORS as e:
+                if last or not idempotent:
+                    raise
+                reason, delay = type(e).__name__, self._backoff(attempt)
+            else:
+                status = getattr(result, 'status_code', None)
+                delay = None if last or status is None else self._retry_delay(
+                    host, idempotent, status, result.headers, rate_limited, attempt)
+                if delay is None:
+                    return result
+                reason = str(status)
+
+            metrics.observe_retry(host, reason)
+            self.logger.debug(f"{method} {url} 재시도 {attempt + 1}/{retries} ({reason}, {delay:.1f}초 후)")
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    def _retry_delay(self, host: str, idempotent: bool, status: int, headers: Dict[str, str],
+                     rate_limited: bool, attempt: int) -> Optional[float]:
+        """다시 보내기 전에 기다릴 시간(초)입니다. 다시 보내지 않을 응답이면 None입니다."""
+        if status not in RETRYABLE_STATUS or (not idempotent and status not in UNPROCESSED_STATUS):
+            return None
+
+        retry_after = parse_retry_after(CaseInsensitiveDict(headers).get('Retry-After'))
+        if retry_after is None:
+            return self._backoff(attempt)
+        # 오래 기다리라는 응답은 이번 실행에서 다시 보내지 않습니다
+        if retry_after > Config.RETRY_MAX_DELAY:
+            return None
+        if rate_limited:
+            # 같은 호스트로 가는 다른 요청도 함께 기다리도록 속도 제한기를 멈춥니다
+            self.rate_limiter.pause(host, retry_after)
+            return 0.0
+        return retry_after
+
+    def _backoff(self, attempt: int) -> float:
+        """full jitter 지수 백오프: 0 ~ min(최대, 기본 * 2^attempt) 사이의 임의 시간"""
+        return random.uniform(0, min(Config.RETRY_MAX_DELAY, Config.RETRY_BACKOFF_BASE * (2 ** attempt)))
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, headers: Dict[str, str] = None,
+                     timeout: float = None, rate_limited: bool = True, **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+        """본문을 아직 읽지 않은 aiohttp 응답을 엽니다. 큰 본문을 조금씩 읽을 때 씁니다.
+
+        속도 제한, 호스트별 동시 요청 수, 회로 차단, 메트릭은 request()와 같이 적용되며
+        블록이 끝날 때까지 호스트 슬롯을 점유합니다. 재시도는 하지 않습니다.
+        """
+        session = await self._get_session()
+        host = urlsplit(url).netloc
+        breaker = self.circuit_breaker.breaker(host)
+
+        if timeout:
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+
+        # 차단된 호스트는 속도 제한 대기열에 들어가기 전에 바로 실패시킵니다
+        breaker.raise_if_open()
+
+        queued = time.monotonic()
+        if rate_limited:
+            await self._wait_for_token(host, breaker)
+
+        async with self._host_slot(host):
+            # 기다리는 동안 회로가 열렸을 수 있습니다
+            breaker.acquire()
+            started = time.monotonic()
+            metrics.observe_wait(host, started - queued)
+            status = None
+            try:
+                async with session.request(method, url, headers=headers, **kwargs) as response:
+                    # 블록 안에서 예외가 나도 회로 결과가 남도록 본문을 읽기 전에 상태 코드로 기록합니다
+                    status = response.status
+                    if status in RETRYABLE_STATUS:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                    yield response
+            except Exception as e:
+                metrics.observe_request(host, method, status, time.monotonic() - started,
+                                        sent=_body_size(kwargs), error=type(e).__name__)
+                # 본문을 받다가 끊긴 경우도 실패로 셉니다 (이미 실패로 기록한 응답은 한 번만)
+                if isinstance(e, TRANSIENT_ERRORS) and status not in RETRYABLE_STATUS:
+                    breaker.record_failure()
+                raise
+
+            metrics.observe_request(host, method, status, time.monotonic() - started,
+                                    sent=_body_size(kwargs), received=response.content.total_bytes)
+
+    async def _wait_for_token(self, host: str, breaker: CircuitBreaker):
+        """속도 제한 토큰을 기다립니다. 기다리는 사이 회로가 열리면 토큰을 돌려주고 바로 실패합니다."""
+        wait = self.rate_limiter.reserve(host)
+        try:
+            while wait > 0:
+                step = min(wait, CIRCUIT_POLL_INTERVAL)
+                await asyncio.sleep(step)
+                wait -= step
+                breaker.raise_if_open()
+        except BaseException:
+            self.rate_limiter.refund(host)
+            raise
+
+    async def download(self, url: str, path: str, headers: Dict[str, str] = None,
+                       timeout: float = None, chunk_size: int = 64 * 1024, retries: int = None) -> int:
+        """GET 응답 본문을 메모리에 모으지 않고 파일로 내려받아 바이트 수를 반환합니다.
+
+        응답 캐시는 거치지 않으며, 다 받은 뒤에만 path로 옮기므로 중단되어도 반쪽 파일이 남지 않습니다.
+        도중에 끊기면 처음부터 다시 받습니다.
+        """
+        # 같은 path를 동시에 받아도 서로의 임시 파일을 덮어쓰지 않도록 고유한 이름을 씁니다
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.',
+                                        prefix=f"{os.path.basename(path)}.", suffix='.part')
+        os.close(fd)
+
+        async def send() -> int:
+            size = 0
+            error = None
+            async with self.stream('GET', url, headers=headers, timeout=timeout) as response:
+                if response.status >= 400:
+                    # 블록 밖에서 던져야 stream()이 응답을 정상 집계합니다
+                    error = HttpError(response.status, str(response.url), dict(response.headers))
+                else:
+                    with open(tmp_path, 'wb') as f:
+                        async for chunk in response.content.iter_chunked(chunk_size):
+                            f.write(chunk)
+                            size += len(chunk)
+            if error:
+                raise error
+            return size
+
+        try:
+            size = await self._with_retries('GET', url, send, True, retries)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return size
+
+    async def get(self, url: str, headers: Dict[str, str] = None, timeout: float = None,
+                  use_cache: bool = True, **kwargs) -> FetchResponse:
+        """GET 요청을 보냅니다. 캐시가 신선하면 네트워크를 거치지 않습니다."""
+        if not self.cache or not use_cache:
+            return await self.request('GET', url, headers=headers, timeout=timeout, **kwargs)
+
+        host = urlsplit(url).netloc
+        cached = await self.cache.lookup(url)
+        if cached and cached.fresh:
+            metrics.observe_cache(host, 'hit')
+            return FetchResponse(url, cached.status_code, cached.headers, cached.content)
+
+        request_headers = dict(headers or {})
+        if cached:
+            request_headers.update(cached.validation_headers())
+
+        response = await self.request('GET', url, headers=request_headers, timeout=timeout, **kwargs)
+
+        if cached and response.status_code == 304:
+            metrics.observe_cache(host, 'revalidated')
+            await self.cache.refresh(url, response.headers)
+            return FetchResponse(url, cached.status_code, cached.headers, cached.content)
+
+        metrics.observe_cache(host, 'miss')
+        if response.status_code == 200:
+            await self.cache.store(url, response.status_code, response.headers, response.content)
+
+        return response
+
+    async def post(self, url: str, headers: Dict[str, str] = None, timeout: float = None, **kwargs) -> FetchResponse:
+        return await self.request('POST', url, headers=headers, timeout=timeout, **kwargs)
+
+    async def close(self):
+        """커넥션 풀을 닫습니다."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+        if self.cache:
+            self.cache.close()
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+from config import Config
+
+class Progress:
+    """크롤러가 진행 상황을 보고하는 인터페이스입니다. 기본 구현은 아무것도 하지 않습니다."""
+
+    def set_stage(self, stage: str, total: Optional[int] = None):
+        pass
+
+    def advance(self, count: int = 1):
+        pass
+
+    def set_error(self, error: Exception):
+        pass
+
+class Job(Progress):
+    """백그라운드에서 실행되는 크롤링 작업 하나의 상태입니다."""
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = 'queued'
+        self.stage = None
+        self.processed = 0
+        self.total = None
+        self.error = None
+
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self._stage_started = None
+
+    def set_stage(self, stage: str, total: Optional[int] = None):
+        self.stage = stage
+        self.total = total
+        self.processed = 0
+        self._stage_started = time.monotonic()
+
+    def advance(self, count: int = 1):
+        self.processed += count
+
+    def set_error(self, error: Exception):
+        self.error = str(error)
+
+    def throughput(self) -> Optional[float]:
+        """현재 단계의 초당 처리 건수입니다."""
+        if self._stage_started is None:
+            return None
+        elapsed = time.monotonic() - self._stage_started
+        return self.processed / elapsed if elapsed > 0 else None
+
+    def eta_seconds(self) -> Optional[float]:
+        """현재 단계가 끝날 때까지 남은 예상 시간(초)입니다."""
+        rate = self.throughput()
+        if self.status != 'running' or not self.total or not rate:
+            return None
+        return max(0, self.total - self.processed) / rate
+
+    def to_dict(self) -> Dict:
+        throughput = self.throughput()
+        eta = self.eta_seconds()
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'stage': self.stage,
+            'processed': self.processed,
+            'total': self.total,
+            'throughput_per_sec': round(throughput, 3) if throughput is not None else None,
+            'eta_seconds': round(eta, 1) if eta is not None else None,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class JobQueueFull(Exception):
+    pass
+
+class JobAlreadyActive(Exception):
+    pass
+
+class JobManager:
+    """크롤링 작업을 큐에 넣고 제한된 수의 워커로 실행합니다.
+
+    워커는 요청 핸들러와 별도의 태스크로 돌기 때문에, 요청은 작업 ID만 받고 바로 반환됩니다.
+    """
+
+    def __init__(self, workers: int = None, max_queue: int = None, history: int = None):
+        self.workers = workers or Config.JOB_WORKERS
+        self.max_queue = max_queue or Config.JOB_QUEUE_SIZE
+        self.history = history or Config.JOB_HISTORY
+
+        self.jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self.logger.info(f"작업 워커 {self.workers}개 시작")
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, kind: str, run: Callable[[Job], Awaitable], exclusive: bool = False) -> Job:
+        """작업을 큐에 넣고 바로 반환합니다. 큐가 가득 차면 JobQueueFull을 발생시킵니다.
+
+        exclusive=True면 같은 종류의 작업이 대기/실행 중일 때 JobAlreadyActive를 발생시킵니다.
+        """
+        if exclusive:
+            active = next((job for job in self.jobs.values() if job.kind == kind and not job.finished_at), None)
+            if active:
+                raise JobAlreadyActive(f"{kind} 작업이 이미 대기/실행 중입니다 (job_id: {active.id})")
+
+        job = Job(kind)
+        try:
+            self._queue.put_nowait((job, run))
+        except asyncio.QueueFull:
+            raise JobQueueFull(f"대기 중인 작업이 너무 많습니다 (최대 {self.max_queue}개)")
+
+        self.jobs[job.id] = job
+        self._prune()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.jobs.get(job_id)
+
+    def _prune(self):
+        """끝난 작업은 최근 history개만 남깁니다."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished_at]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self.jobs[job_id]
+
+    async def _worker(self, worker_id: int):
+        while True:
+            job, run = await self._queue.get()
+            job.status = 'running'
+            job.started_at = datetime.now()
+            self.logger.info(f"[워커 {worker_id}] {job.kind} 작업 시작: {job.id}")
+
+            try:
+                await run(job)
+                job.status = 'failed' if job.error else 'succeeded'
+            except asyncio.CancelledError:
+                job.status = 'cancelled'
+                raise
+            except Exception as e:
+                job.set_error(e)
+                job.status = 'failed'
+                self.logger.error(f"{job.kind} 작업 실패 ({job.id}): {e}")
+            finally:
+                job.finished_at = datetime.now()
+                self._queue.task_done()
+                self._prune()
+
+            self.logger.info(f"[워커 {worker_id}] {job.kind} 작업 종료: {job.id} ({job.status})")
@@ -1,81 +1,217 @@
 import asyncio
-import json
 import logging
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterable, Iterator
 from gutenberg_crawler import GutenbergCrawler
 from reddit_crawler import RedditCrawler
 from goodreads_crawler import GoodreadsCrawler
 from curated_recommendations import CuratedRecommendations
+from catalog_loader import CatalogLoader
+from resources import ResourcePool
+from metrics import timed_run
+from jobs import Progress
+from watermarks import WatermarkStore
+from uploader import ChunkedUploader
+from backup import BackupWriter, iter_backup
+from readability import ReadabilityScorer
+from checkpoints import Checkpoint, CheckpointStore
 from config import Config
-import requests
 
 class BookRecommendationCrawler:
-    def __init__(self):
-        self.gutenberg = GutenbergCrawler()
-        self.reddit = RedditCrawler()
-        self.goodreads = GoodreadsCrawler()
-        self.curated = CuratedRecommendations()
+    def __init__(self, progress: Progress = None, resources: ResourcePool = None):
+        # 백그라운드 작업으로 실행될 때 진행 상황을 보고받습니다
+        self.progress = progress or Progress()
+        
+        # 모든 크롤러가 하나의 커넥션 풀과 호스트별 속도 제한기를 공유합니다.
+        # API 서버는 lifespan이 가진 자원을 빌려주고, 단독 실행 시에는 직접 만들어 닫습니다
+        self._owns_resources = resources is None
+        self.resources = resources or ResourcePool()
+        self.rate_limiter = self.resources.rate_limiter
+        self.http = self.resources.http
+        self.gutenberg = GutenbergCrawler(self.http)
+        self.goodreads = GoodreadsCrawler(self.http)
+        self.corpus = self.resources.corpus
+        # 도서 보강 결과 메모이제이션은 실행 범위이므로 작업마다 새로 만듭니다
+        self.curated = CuratedRecommendations(self.http, self.corpus)
         
         logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
         self.logger = logging.getLogger(__name__)
 
-    async def run_full_crawl(self):
-        """전체 크롤링을 실행합니다."""
+    @property
+    def reddit(self) -> RedditCrawler:
+        return self.resources.reddit
+
+    @timed_run('full_crawl')
+    async def run_full_crawl(self, resume: bool = False):
+        """전체 크롤링을 실행합니다.
+        
+        단계 결과와 단계 안의 항목별 결과를 CHECKPOINT_PATH에 기록하므로, 중단된 실행은
+        resume=True로 마지막 체크포인트부터 이어서 실행할 수 있습니다.
+        """
         self.logger.info("전체 크롤링 시작")
         
+        store = CheckpointStore()
+        checkpoint = store.resume('full_crawl') if resume else None
+        if resume and checkpoint is None:
+            self.logger.info("이어서 실행할 체크포인트가 없어 처음부터 시작합니다")
+        checkpoint = checkpoint or store.start('full_crawl')
+        
         try:
             # 1. Project Gutenberg 인기 도서 크롤링
-            gutenberg_books = await self.crawl_gutenberg_books()
+            gutenberg_books = await self.crawl_gutenberg_books(checkpoint=checkpoint)
             
             # 2. Reddit 추천 및 리뷰 크롤링
-            reddit_data = await self.crawl_reddit_data()
+            reddit_data = checkpoint.stage_result('reddit')
+            if reddit_data is None:
+                reddit_data = await self.crawl_reddit_data()
+                # 아무것도 받지 못했으면 이어서 실행할 때 다시 시도합니다
+                if any(reddit_data.values()):
+                    checkpoint.complete_stage('reddit', reddit_data)
             
             # 3. 선별된 책들에 대한 Goodreads 정보 크롤링
-            enhanced_books = await self.enhance_with_goodreads(gutenberg_books[:50])
+            # 목록 페이지는 순서 자체가 인기순이지만, 일괄 카탈로그는 다운로드 수를 아는 책까지만 인기순입니다
+            popular_books = gutenberg_books[:50]
+            if Config.GUTENBERG_CATALOG_PATH:
+                popular_books = [book for book in gutenberg_books if book.get('downloads')][:50]
+                if not popular_books:
+                    self.logger.warning("다운로드 수를 아는 도서가 없어 Goodreads 정보 크롤링을 건너뜁니다")
+            enhanced_books = await self.enhance_with_goodreads(popular_books, checkpoint=checkpoint)
             
-            # 4. 데이터 저장
+            # 4. 데이터 저장 (업로드는 청크별 Idempotency-Key가 있어 다시 보내도 안전합니다)
+            self.progress.set_stage('save')
             await self.save_crawled_data(enhanced_books, reddit_data)
             
+            checkpoint.finish()
             self.logger.info("전체 크롤링 완료")
             
         except Exception as e:
             self.logger.error(f"크롤링 중 오류 발생: {e}")
+            self.progress.set_error(e)
+        finally:
+            checkpoint.flush()
+            store.close()
 
-    async def crawl_gutenberg_books(self, max_pages: int = 5) -> List[Dict]:
-        """Project Gutenberg에서 인기 도서를 크롤링합니다."""
+    async def crawl_gutenberg_books(self, max_pages: int = 5, checkpoint: Checkpoint = None) -> List[Dict]:
+        """Project Gutenberg에서 인기 도서를 크롤링합니다. (목록은 단계, 상세 정보는 책 단위로 체크포인트)"""
+        checkpoint = checkpoint or Checkpoint()
         self.logger.info("Project Gutenberg 도서 크롤링 시작")
         
+        # 일괄 카탈로그 파일이 있으면 페이지별 요청 없이 카탈로그에서 인기 도서를 고릅니다
+        if Config.GUTENBERG_CATALOG_PATH:
+            self.progress.set_stage('gutenberg_catalog')
+            loader = CatalogLoader()
+            # CSV 카탈로그에는 다운로드 수가 없어 인기순 목록 페이지에서 가져와 채웁니다
+            downloads = await self.gutenberg.get_download_counts(max_pages) if loader.needs_downloads else None
+            # 목록 페이지 크롤링과 같은 수의 인기 도서만 골라 카탈로그 전체를 메모리에 올리지 않습니다
+            books = await asyncio.to_thread(loader.load, downloads, max_pages * 25)
+            self.progress.advance(len(books))
+            return books
+        
+        all_books = checkpoint.stage_result('gutenberg_catalog')
+        if all_books is None:
+            all_books = await self._crawl_gutenberg_catalog(max_pages)
+            if all_books:
+                checkpoint.complete_stage('gutenberg_catalog', all_books)
+        
+        # 이전 실행에서 받은 상세 정보는 그대로 쓰고 나머지만 동시에 가져오기
+        self.progress.set_stage('gutenberg_details', len(all_books))
+        done = checkpoint.items('gutenberg_details')
+        pending = []
+        for book in all_books:
+            if str(book.get('id')) in done:
+                book.update(done[str(book.get('id'))])
+                self.progress.advance()
+            else:
+                pending.append(book)
+        
+        await asyncio.gather(*(self._add_gutenberg_details(book, checkpoint) for book in pending))
+        checkpoint.flush()
+        
+        self.logger.info(f"총 {len(all_books)}권의 Gutenberg 도서 수집 완료")
+        return all_books
+
+    async def _crawl_gutenberg_catalog(self, max_pages: int) -> List[Dict]:
+        """목록 페이지들을 동시에 요청합니다."""
         all_books = []
         
-        for page in range(1, max_pages + 1):
-            try:
-                books = self.gutenberg.get_book_catalog(page)
-                
-                for book in books:
-                    # 상세 정보 가져오기
-                    if book.get('id'):
-                        details = self.gutenberg.get_book_details(book['id'])
-                        if details:
-                            book.update(details)
-                    
-                    all_books.append(book)
-                
-                self.logger.info(f"페이지 {page}: {len(books)}권 수집")
-                
-                # API 요청 제한 준수
-                await asyncio.sleep(Config.REQUEST_DELAY)
-                
-            except Exception as e:
-                self.logger.error(f"페이지 {page} 크롤링 실패: {e}")
+        self.progress.set_stage('gutenberg_catalog', max_pages)
+        catalog_pages = await asyncio.gather(
+            *(self.gutenberg.get_book_catalog(page) for page in range(1, max_pages + 1)),
+            return_exceptions=True
+        )
+        
+        for page, books in enumerate(catalog_pages, start=1):
+            if isinstance(books, Exception):
+                self.logger.error(f"페이지 {page} 크롤링 실패: {books}")
                 continue
+            
+            all_books.extend(books)
+            self.progress.advance()
+            self.logger.info(f"페이지 {page}: {len(books)}권 수집")
         
-        self.logger.info(f"총 {len(all_books)}권의 Gutenberg 도서 수집 완료")
         return all_books
 
-    async def crawl_reddit_data(self) -> Dict[str, List]:
-        """Reddit에서 책 관련 데이터를 크롤링합니다."""
+    async def _add_gutenberg_details(self, book: Dict, checkpoint: Checkpoint = None) -> bool:
+        """Gutenberg 상세 정보를 책 데이터에 추가하고, 추가했는지 반환합니다."""
+        if not book.get('id'):
+            return False
+        
+        try:
+            details = await self.gutenberg.get_book_details(book['id'])
+            # 크롤러는 실패하면 None을 반환하므로 받은 것만 기록해, 이어서 실행할 때 다시 요청합니다
+            if details:
+                book.update(details)
+                if checkpoint:
+                    checkpoint.record_item('gutenberg_details', book['id'], details)
+                return True
+        except Exception as e:
+            self.logger.warning(f"'{book.get('title', 'Unknown')}' 상세 정보 수집 실패: {e}")
+        finally:
+            self.progress.advance()
+        return False
+
+    async def crawl_new_gutenberg_books(self, watermarks: WatermarkStore) -> List[Dict]:
+        """워터마크(가장 큰 ebook ID) 이후에 새로 공개된 Gutenberg 도서만 수집합니다."""
+        max_ebook_id = watermarks.max_ebook_id
+        new_books = []
+        
+        # 출간일 역순 목록을 워터마크에 닿을 때까지 넘깁니다 (첫 실행이면 첫 페이지만)
+        max_pages = Config.INCREMENTAL_MAX_PAGES if max_ebook_id else 1
+        self.progress.set_stage('gutenberg_catalog', max_pages)
+        
+        for page in range(1, max_pages + 1):
+            books = await self.gutenberg.get_book_catalog(page, sort_order='release_date')
+            self.progress.advance()
+            
+            fresh = [book for book in books
+                     if book.get('id', '').isdigit() and (not max_ebook_id or int(book['id']) > max_ebook_id)]
+            new_books.extend(fresh)
+            
+            if len(fresh) < len(books) or not books:
+                break
+        
+        self.logger.info(f"새 Gutenberg 도서 {len(new_books)}권 (워터마크: {max_ebook_id})")
+        
+        self.progress.set_stage('gutenberg_details', len(new_books))
+        merged = await asyncio.gather(*(self._add_gutenberg_details(book) for book in new_books))
+        
+        # 상세 정보를 받지 못한 책이 있으면 그 앞 ID까지만 워터마크를 올려 다음 실행에서 다시 수집합니다
+        for book, ok in sorted(zip(new_books, merged), key=lambda entry: int(entry[0]['id'])):
+            if not ok:
+                self.logger.warning(f"상세 정보가 없는 도서(ID: {book['id']})부터는 다음 실행에서 다시 수집합니다")
+                break
+            watermarks.update_gutenberg(book)
+        
+        return new_books
+
+    async def crawl_reddit_data(self, since: Dict[str, float] = None) -> Dict[str, List]:
+        """Reddit에서 책 관련 데이터를 크롤링합니다.
+        
+        since(서브레딧/검색어별 created_utc 워터마크)가 주어지면 그 이후의 게시물만 수집하고
+        트렌딩 분석은 건너뜁니다.
+        """
         self.logger.info("Reddit 데이터 크롤링 시작")
+        self.progress.set_stage('reddit')
         
         reddit_data = {
             'recommendations': [],
@@ -83,29 +219,32 @@ class BookRecommendationCrawler:
             'trending': []
         }
         
+        # 인기 클래식 도서들에 대한 리뷰 검색
+        classic_books = [
+            ("Pride and Prejudice", "Jane Austen"),
+            ("Alice's Adventures in Wonderland", "Lewis Carroll"),
+            ("The Adventures of Tom Sawyer", "Mark Twain"),
+            ("Dracula", "Bram Stoker"),
+            ("Frankenstein", "Mary Shelley")
+        ]
+        
         try:
-            # 일반적인 책 추천 게시물
-            recommendations = self.reddit.get_book_recommendations(50)
-            reddit_data['recommendations'].extend(recommendations)
+            # 추천 게시물, 리뷰 검색, 트렌딩을 모두 동시에 실행 (PRAW는 동기 API이므로 스레드에서)
+            review_searches = [asyncio.to_thread(self.reddit.get_book_reviews, title, author, 10, since)
+                               for title, author in classic_books]
+            # 트렌딩 집계는 전체 크롤링(since 없음)에서만 합니다
+            trending_searches = [self._crawl_trending(30)] if since is None else []
+            recommendations, *results = await asyncio.gather(
+                asyncio.to_thread(self.reddit.get_book_recommendations, 50, since),
+                *review_searches,
+                *trending_searches
+            )
             
-            # 트렌딩 책들
-            trending = self.reddit.get_trending_books(30)
-            reddit_data['trending'].extend(trending)
-            
-            # 인기 클래식 도서들에 대한 리뷰 검색
-            classic_books = [
-                ("Pride and Prejudice", "Jane Austen"),
-                ("Alice's Adventures in Wonderland", "Lewis Carroll"),
-                ("The Adventures of Tom Sawyer", "Mark Twain"),
-                ("Dracula", "Bram Stoker"),
-                ("Frankenstein", "Mary Shelley")
-            ]
-            
-            for title, author in classic_books:
-                reviews = self.reddit.get_book_reviews(title, author, 10)
+            reddit_data['recommendations'].extend(recommendations)
+            for reviews in results[:len(review_searches)]:
                 reddit_data['reviews'].extend(reviews)
-                
-                await asyncio.sleep(1)  # API 제한 준수
+            for trending in results[len(review_searches):]:
+                reddit_data['trending'].extend(trending)
             
             self.logger.info(f"Reddit 데이터 수집 완료: "
                            f"추천 {len(reddit_data['recommendations'])}개, "
@@ -117,97 +256,101 @@ class BookRecommendationCrawler:
         
         return reddit_data
 
-    async def enhance_with_goodreads(self, books: List[Dict]) -> List[Dict]:
-        """Gutenberg 책들에 Goodreads 정보를 추가합니다."""
+    async def _crawl_trending(self, limit: int) -> List[Dict]:
+        """카탈로그로 만든 언급 탐색기를 준비해 트렌딩 책을 도서 ID별로 집계합니다."""
+        try:
+            resolver = await self.curated.catalog.get_mention_resolver()
+        except Exception as e:
+            self.logger.warning(f"카탈로그 언급 탐색기 준비 실패, 따옴표 제목으로만 집계합니다: {e}")
+            resolver = None
+        
+        return await asyncio.to_thread(self.reddit.get_trending_books, limit, resolver)
+
+    async def enhance_with_goodreads(self, books: List[Dict], checkpoint: Checkpoint = None) -> List[Dict]:
+        """Gutenberg 책들에 Goodreads 정보를 추가합니다. (성공한 책은 checkpoint에 기록되어 다시 요청하지 않습니다)"""
+        checkpoint = checkpoint or Checkpoint()
         self.logger.info(f"{len(books)}권의 책에 Goodreads 정보 추가")
+        self.progress.set_stage('goodreads', len(books))
         
-        enhanced_books = []
+        done = checkpoint.items('goodreads')
+        if done:
+            self.logger.info(f"체크포인트에서 {len(done)}권 복원")
         
-        for book in books:
-            try:
-                # Goodreads에서 책 검색
-                goodreads_data = self.goodreads.search_book(
-                    book.get('title', ''), 
-                    book.get('author', '')
-                )
-                
-                if goodreads_data and goodreads_data.get('goodreads_url'):
-                    # 상세 정보 가져오기
-                    details = self.goodreads.get_book_details(goodreads_data['goodreads_url'])
-                    if details:
-                        goodreads_data.update(details)
-                
-                # Gutenberg 데이터와 Goodreads 데이터 병합
-                enhanced_book = {**book, **goodreads_data} if goodreads_data else book
-                enhanced_books.append(enhanced_book)
-                
-                await asyncio.sleep(Config.REQUEST_DELAY)
-                
-            except Exception as e:
-                self.logger.warning(f"'{book.get('title', 'Unknown')}' Goodreads 정보 수집 실패: {e}")
-                enhanced_books.append(book)  # 원본 데이터라도 포함
+        async def enhance(index: int, book: Dict) -> Dict:
+            key = str(book.get('id') or index)
+            if key in done:
+                self.progress.advance()
+                return done[key]
+            return await self._enhance_book(book, lambda enhanced: checkpoint.record_item('goodreads', key, enhanced))
+        
+        enhanced_books = await asyncio.gather(*(enhance(index, book) for index, book in enumerate(books)))
+        checkpoint.flush()
         
         self.logger.info(f"Goodreads 정보 추가 완료: {len(enhanced_books)}권")
-        return enhanced_books
+        return list(enhanced_books)
 
-    async def save_crawled_data(self, books: List[Dict], reddit_data: Dict):
-        """크롤링된 데이터를 Firebase에 저장합니다."""
-        self.logger.info("크롤링 데이터 Firebase 저장 시작")
-        
+    async def _enhance_book(self, book: Dict, on_enhanced: Callable[[Dict], None] = None) -> Dict:
+        """책 한 권에 Goodreads 정보를 병합합니다. 정보를 찾지 못하면 원본을 반환하고 on_enhanced는 부르지 않습니다."""
         try:
-            # Firebase Cloud Functions API 엔드포인트
-            api_url = "https://your-project.cloudfunctions.net/api/internal/save-crawled-data"
+            # Goodreads에서 책 검색
+            goodreads_data = await self.goodreads.search_book(
+                book.get('title', ''), 
+                book.get('author', '')
+            )
             
-            payload = {
-                'books': books,
-                'reviews': reddit_data['reviews'],
-                'recommendations': reddit_data['recommendations'] + reddit_data['trending']
-            }
+            if goodreads_data and goodreads_data.get('goodreads_url'):
+                # 상세 정보 가져오기
+                details = await self.goodreads.get_book_details(goodreads_data['goodreads_url'])
+                if details:
+                    goodreads_data.update(details)
             
-            response = requests.post(
-                api_url,
-                json=payload,
-                headers={'Content-Type': 'application/json'},
-                timeout=30
-            )
+            # Gutenberg 데이터와 Goodreads 데이터 병합
+            if not goodreads_data:
+                return book
             
-            if response.status_code == 200:
-                result = response.json()
-                self.logger.info(f"데이터 저장 성공: {result}")
-            else:
-                self.logger.error(f"데이터 저장 실패: {response.status_code} - {response.text}")
-                
-                # 로컬 백업 저장
-                await self.save_local_backup(books, reddit_data)
-                
-        except Exception as e:
-            self.logger.error(f"Firebase 저장 실패: {e}")
+            enhanced = {**book, **goodreads_data}
+            if on_enhanced:
+                on_enhanced(enhanced)
+            return enhanced
             
-            # 로컬 백업 저장
-            await self.save_local_backup(books, reddit_data)
+        except Exception as e:
+            self.logger.warning(f"'{book.get('title', 'Unknown')}' Goodreads 정보 수집 실패: {e}")
+            return book  # 원본 데이터라도 포함
+        finally:
+            self.progress.advance()
 
-    async def save_local_backup(self, books: List[Dict], reddit_data: Dict):
-        """로컬에 백업 파일을 저장합니다."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    async def save_crawled_data(self, books: List[Dict], reddit_data: Dict):
+        """크롤링된 데이터를 청크 단위로 나누어 Firebase에 저장합니다."""
+        self.logger.info("크롤링 데이터 Firebase 저장 시작")
         
-        backup_data = {
-            'timestamp': timestamp,
-            'books': books,
-            'reddit_data': reddit_data,
-            'total_books': len(books),
-            'total_reddit_items': sum(len(v) for v in reddit_data.values())
-        }
+        await self.upload_records(self._iter_records(books, reddit_data))
+
+    async def upload_records(self, records: Iterable[Dict]):
+        """레코드 스트림을 업로드합니다. 실패한 청크의 레코드만 로컬 백업에 기록됩니다."""
+        # Firebase Cloud Functions API 엔드포인트
+        api_url = "https://your-project.cloudfunctions.net/api/internal/save-crawled-data"
         
-        filename = f"crawl_backup_{timestamp}.json"
+        with BackupWriter(self._backup_path('crawl_backup')) as backup:
+            uploader = ChunkedUploader(self.http, api_url, backup=backup)
+            result = await uploader.upload(records)
         
-        try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, ensure_ascii=False, indent=2, default=str)
-            
-            self.logger.info(f"로컬 백업 저장 완료: {filename}")
-            
-        except Exception as e:
-            self.logger.error(f"로컬 백업 저장 실패: {e}")
+        if result.ok:
+            self.logger.info(f"데이터 저장 성공: {result}")
+        else:
+            self.logger.error(f"일부 데이터 저장 실패: {result}, 재전송: python main.py replay {backup.path}")
+
+    def _iter_records(self, books: List[Dict], reddit_data: Dict) -> Iterator[Dict]:
+        """업로드할 레코드를 {'kind', 'data'} 형태로 하나씩 만듭니다."""
+        for book in books:
+            yield {'kind': 'book', 'data': book}
+        for review in reddit_data['reviews']:
+            yield {'kind': 'review', 'data': review}
+        for recommendation in reddit_data['recommendations'] + reddit_data['trending']:
+            yield {'kind': 'recommendation', 'data': recommendation}
+
+    def _backup_path(self, prefix: str) -> str:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return f"{prefix}_{timestamp}.ndjson.gz"
 
     async def save_daily_recommendations(self, recommendations: Dict):
         """일일 추천 도서를 Firebase에 저장합니다."""
@@ -217,7 +360,7 @@ class BookRecommendationCrawler:
             # Firebase Cloud Functions API 엔드포인트
             api_url = "https://your-project.cloudfunctions.net/api/internal/save-daily-recommendations"
             
-            response = requests.post(
+            response = await self.http.post(
                 api_url,
                 json=recommendations,
                 headers={'Content-Type': 'application/json'},
@@ -241,25 +384,41 @@ class BookRecommendationCrawler:
 
     async def save_daily_backup(self, recommendations: Dict):
         """일일 추천을 로컬에 백업합니다."""
-        timestamp = datetime.now().strftime("%Y%m%d")
-        filename = f"daily_recommendations_{timestamp}.json"
-        
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(recommendations, f, ensure_ascii=False, indent=2, default=str)
-            
-            self.logger.info(f"일일 추천 로컬 백업 저장 완료: {filename}")
+            with BackupWriter(self._backup_path('daily_recommendations')) as backup:
+                backup.write({'kind': 'daily_recommendations', 'data': recommendations})
             
         except Exception as e:
             self.logger.error(f"일일 추천 로컬 백업 저장 실패: {e}")
 
+    @timed_run('replay')
+    async def replay_backup(self, path: str):
+        """로컬 백업 파일을 다시 크롤링하지 않고 한 줄씩 읽어 업로드합니다."""
+        self.logger.info(f"백업 재전송 시작: {path}")
+        daily = []
+        
+        def crawled_records():
+            for record in iter_backup(path):
+                if record['kind'] == 'daily_recommendations':
+                    daily.append(record['data'])
+                else:
+                    yield record
+        
+        self.progress.set_stage('replay')
+        await self.upload_records(crawled_records())
+        
+        for recommendations in daily:
+            await self.save_daily_recommendations(recommendations)
+
+    @timed_run('daily_update')
     async def run_daily_update(self):
         """매일 업데이트 - 큐레이션된 추천 도서를 수집합니다."""
         self.logger.info("일일 업데이트 시작")
         
         try:
             # 영어 수준별 및 필사용 추천 도서 수집
-            daily_recommendations = self.curated.get_daily_recommendations()
+            self.progress.set_stage('curated_recommendations')
+            daily_recommendations = await self.curated.get_daily_recommendations()
             
             # 명문장 수집
             all_books = []
@@ -267,37 +426,93 @@ class BookRecommendationCrawler:
                 all_books.extend(level_books)
             all_books.extend(daily_recommendations['all_recommendations']['transcription'])
             
-            quotes = self.curated.get_featured_quotes(all_books)
+            self.progress.set_stage('featured_quotes', len({book.get('id') for book in all_books}))
+            quotes = await self.curated.get_featured_quotes(all_books, self.resources.processes,
+                                                          on_progress=self.progress.advance)
             daily_recommendations['featured_quotes'] = quotes
             
+            # 필사 연습 구간 색인 (본문은 명문장 단계에서 이미 받아 두었습니다)
+            transcription_books = daily_recommendations['all_recommendations']['transcription']
+            self.progress.set_stage('transcription_passages', len(transcription_books))
+            await self.resources.passages.prepare(transcription_books, on_prepared=self.progress.advance)
+            
+            # API가 제공하는 스냅샷 교체 (Firebase 저장 성공 여부와 무관)
+            await asyncio.to_thread(self.resources.daily_snapshot.publish, daily_recommendations)
+            
             # Firebase에 저장
+            self.progress.set_stage('save')
             await self.save_daily_recommendations(daily_recommendations)
             
             self.logger.info("일일 업데이트 완료")
             
         except Exception as e:
             self.logger.error(f"일일 업데이트 중 오류 발생: {e}")
+            self.progress.set_error(e)
+
+    @timed_run('readability')
+    async def run_readability_update(self, max_books: int = None):
+        """카탈로그의 인기 영어 도서 본문을 받아 가독성 점수를 매기고, 전체 영어 수준을 한 번에 다시 나눕니다."""
+        self.logger.info("가독성 분석 시작")
+        
+        try:
+            self.progress.set_stage('readability_catalog')
+            await self.curated.catalog.ensure_loaded()
+            
+            # 점수는 본문이 바뀌지 않는 한 유효하므로 아직 점수가 없는 책만 처리합니다
+            store = self.curated.readability
+            books = [book for book in self.curated.catalog.books
+                     if book.get('id') not in store and 'English' in book.get('language', 'English')]
+            books = books[:max_books or Config.READABILITY_MAX_BOOKS]
+            
+            self.progress.set_stage('readability_texts', len(books))
+            paths = await self.corpus.fetch_many(books, on_fetched=self.progress.advance)
+            
+            self.progress.set_stage('readability_scoring', len(paths))
+            scorer = ReadabilityScorer(self.resources.processes, store)
+            scored = await scorer.score(books, paths, on_scored=self.progress.advance)
+            
+            self.logger.info(f"가독성 분석 완료: {scored}권 (누적 {len(store.books)}권)")
+            
+        except Exception as e:
+            self.logger.error(f"가독성 분석 중 오류 발생: {e}")
+            self.progress.set_error(e)
 
+    @timed_run('incremental_crawl')
     async def run_incremental_crawl(self):
         """증분 크롤링 - 새로운 데이터만 수집합니다."""
         self.logger.info("증분 크롤링 시작")
         
         try:
-            # 최신 Reddit 데이터만 수집
-            reddit_data = await self.crawl_reddit_data()
+            watermarks = WatermarkStore()
             
-            # 새로운 Gutenberg 도서 (첫 페이지만)
-            new_books = self.gutenberg.get_book_catalog(1)
+            # 워터마크 이후의 Reddit 게시물만 수집
+            reddit_data = await self.crawl_reddit_data(since=watermarks.reddit)
             
-            # 일부 책에 대해서만 Goodreads 정보 추가
-            enhanced_books = await self.enhance_with_goodreads(new_books[:10])
+            # 워터마크 이후에 공개된 Gutenberg 도서만 수집
+            new_books = await self.crawl_new_gutenberg_books(watermarks)
             
-            await self.save_crawled_data(enhanced_books, reddit_data)
+            # 새 책에 대해서만 Goodreads 정보 추가
+            enhanced_books = await self.enhance_with_goodreads(new_books)
+            
+            self.progress.set_stage('save')
+            if enhanced_books or any(reddit_data.values()):
+                await self.save_crawled_data(enhanced_books, reddit_data)
+            else:
+                self.logger.info("새로 수집된 데이터가 없습니다")
+            
+            # 저장(또는 로컬 백업)이 끝난 뒤에 워터마크를 올립니다
+            watermarks.save()
             
             self.logger.info("증분 크롤링 완료")
             
         except Exception as e:
             self.logger.error(f"증분 크롤링 중 오류 발생: {e}")
+            self.progress.set_error(e)
+
+    async def close(self):
+        """직접 만든 자원이면 커넥션 풀과 Reddit 워커 스레드를 정리합니다. 빌린 자원은 그대로 둡니다."""
+        if self._owns_resources:
+            await self.resources.close()
 
 async def main():
     """메인 실행 함수"""
@@ -305,21 +520,30 @@ async def main():
     
     import sys
     
-    if len(sys.argv) > 1:
-        if sys.argv[1] == 'full':
-            await crawler.run_full_crawl()
-        elif sys.argv[1] == 'incremental':
-            await crawler.run_incremental_crawl()
-        elif sys.argv[1] == 'daily':
-            await crawler.run_daily_update()
+    try:
+        if len(sys.argv) > 1:
+            if sys.argv[1] == 'full':
+                await crawler.run_full_crawl(resume='--resume' in sys.argv[2:])
+            elif sys.argv[1] == 'incremental':
+                await crawler.run_incremental_crawl()
+            elif sys.argv[1] == 'daily':
+                await crawler.run_daily_update()
+            elif sys.argv[1] == 'readability':
+                await crawler.run_readability_update()
+            elif sys.argv[1] == 'replay' and len(sys.argv) > 2:
+                await crawler.replay_backup(sys.argv[2])
+            else:
+                print("사용법: python main.py [full [--resume]|incremental|daily|readability|replay <백업 파일>]")
+                print("  full: 전체 크롤링 (--resume: 중단된 실행을 마지막 체크포인트부터 이어서)")
+                print("  incremental: 증분 크롤링")
+                print("  daily: 일일 추천 도서 업데이트")
+                print("  readability: 카탈로그 도서 가독성 점수/영어 수준 일괄 계산")
+                print("  replay: 로컬 백업 파일 재전송")
         else:
-            print("사용법: python main.py [full|incremental|daily]")
-            print("  full: 전체 크롤링")
-            print("  incremental: 증분 크롤링")
-            print("  daily: 일일 추천 도서 업데이트")
-    else:
-        # 기본적으로 일일 업데이트 실행
-        await crawler.run_daily_update()
+            # 기본적으로 일일 업데이트 실행
+            await crawler.run_daily_update()
+    finally:
+        await crawler.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
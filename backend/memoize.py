@@ -0,0 +1,88 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+class SingleFlightCache:
+    """실행 범위(run-scoped) 비동기 메모이제이션 캐시입니다.
+
+    같은 키에 대한 조회가 동시에 들어오면 하나의 fetch만 실행하고 결과를 공유합니다(single-flight).
+    성공한 결과는 인스턴스가 살아있는 동안 유지되고, 예외는 캐시하지 않습니다.
+    """
+
+    def __init__(self):
+        self._results: Dict[Hashable, Any] = {}
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """키에 해당하는 결과를 반환하고, 없으면 fetch()로 한 번만 가져옵니다."""
+        if key in self._results:
+            self.hits += 1
+            return self._results[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._settle(key, done))
+        else:
+            self.hits += 1
+
+        # 한 호출자가 취소되어도 공유 중인 fetch는 계속 진행되도록 shield
+        return await asyncio.shield(task)
+
+    def _settle(self, key: Hashable, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self._results[key] = task.result()
+
+    def clear(self):
+        self._results.clear()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+class ByteLRUCache:
+    """크기(바이트) 합이 max_bytes를 넘지 않게 유지하는 LRU 캐시입니다.
+
+    넣을 때 항목 크기를 함께 받고, 넘치면 가장 오래 쓰지 않은 항목부터 버립니다.
+    max_bytes보다 큰 항목은 저장하지 않습니다.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: 'OrderedDict[Hashable, Tuple[Any, int]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._items.move_to_end(key)
+        return item[0]
+
+    def put(self, key: Hashable, value: Any, size: int):
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        if size > self.max_bytes:
+            return
+
+        self._items[key] = (value, size)
+        self.size += size
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self._items.popitem(last=False)
+            self.size -= evicted
+
+    def clear(self):
+        self._items.clear()
+        self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
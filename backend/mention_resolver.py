@@ -0,0 +1,124 @@
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from title_matcher import TitleMatcher, fold, normalize_title
+
+# 카탈로그 제목의 이 비율보다 많이 나오는 단어는 흔한 단어로 봅니다 ('and', 'poems', 'history' 등)
+COMMON_TOKEN_RATIO = 0.002
+
+# 따옴표 안의 문자열은 이 길이 범위일 때만 제목 후보로 봅니다
+QUOTED_TITLE = re.compile(r'["“]([^"“”]{5,100})["”]')
+
+class MentionResolver:
+    """게시물/댓글 텍스트에서 카탈로그 도서 언급을 한 번에 찾습니다.
+
+    정규화된 카탈로그 제목들을 단어 단위 Aho-Corasick 오토마톤으로 만들어, 텍스트 하나를
+    제목 수와 관계없이 한 번만 훑습니다. 겹치는 일치는 왼쪽부터 가장 긴 것을 고릅니다.
+    한 단어짜리 제목이나 흔한 단어로만 된 제목('Poems', 'Short Stories')은 작가의 성이
+    같은 텍스트에 있을 때만 인정합니다. 오토마톤이 찾지 못한 따옴표 속 문자열은
+    TitleMatcher로 퍼지 매칭합니다.
+    """
+
+    def __init__(self, matcher: TitleMatcher):
+        self.matcher = matcher
+
+        # 정규화된 제목 -> 같은 제목의 (책, 작가 성) 목록
+        titles: Dict[str, List[Tuple[Dict, Set[str]]]] = {}
+        for book, title, surnames in matcher.entries():
+            titles.setdefault(title, []).append((book, surnames))
+
+        token_df = Counter(token for title in titles for token in set(title.split()))
+        common = max(2, len(titles) * COMMON_TOKEN_RATIO)
+
+        # 패턴 번호 -> (단어 수, 작가 성이 필요한지, 다운로드 순 (책, 작가 성) 목록)
+        self._patterns: List[Tuple[int, bool, List[Tuple[Dict, Set[str]]]]] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for title, books in titles.items():
+            tokens = title.split()
+            needs_author = len(tokens) < 2 or all(token_df[token] > common for token in tokens)
+            books.sort(key=lambda entry: entry[0].get('downloads') or 0, reverse=True)
+            self._add_pattern(tokens, (len(tokens), needs_author, books))
+
+        self._build_failure_links()
+
+    def _add_pattern(self, tokens: List[str], pattern: Tuple):
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+
+        self._out[state].append(len(self._patterns))
+        self._patterns.append(pattern)
+
+    def _build_failure_links(self):
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(token, 0)
+                # 더 짧은 접미 제목도 이 상태에서 끝납니다
+                self._out[next_state].extend(self._out[self._fail[next_state]])
+
+    def _scan(self, tokens: List[str]) -> List[Tuple[int, int, int]]:
+        """(시작 위치, 끝 위치, 패턴 번호) 목록을 반환합니다."""
+        goto, fail, out = self._goto, self._fail, self._out
+        matches = []
+        state = 0
+        for i, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for pattern_id in out[state]:
+                matches.append((i - self._patterns[pattern_id][0] + 1, i, pattern_id))
+        return matches
+
+    def resolve(self, text: str) -> Tuple[List[Dict], List[str]]:
+        """텍스트에서 언급된 카탈로그 도서들(책마다 한 번)과, 카탈로그에서 찾지 못한 따옴표 속 제목들을 반환합니다."""
+        tokens = fold(text).split()
+        # "Blake's" 는 'blakes' 로 접히므로 작가 성 확인용으로 소유격을 뗀 형태도 넣습니다
+        words = set(tokens)
+        words.update(token[:-1] for token in tokens if token.endswith('s'))
+
+        found: Dict[str, Dict] = {}
+        taken_until = -1
+        # 왼쪽부터, 같은 위치에서는 가장 긴 일치를 고르고 겹치는 일치는 버립니다
+        for start, end, pattern_id in sorted(self._scan(tokens), key=lambda m: (m[0], m[0] - m[1])):
+            if start <= taken_until:
+                continue
+            book = self._pick(pattern_id, words)
+            if book is not None:
+                found.setdefault(book['id'], book)
+                taken_until = end
+
+        unmatched = []
+        for quote in QUOTED_TITLE.findall(text):
+            match = self.matcher.match(quote)
+            if match:
+                found.setdefault(match[0]['id'], match[0])
+            elif normalize_title(quote):
+                unmatched.append(normalize_title(quote))
+
+        return list(found.values()), unmatched
+
+    def resolve_many(self, texts: Iterable[str]) -> List[Tuple[List[Dict], List[str]]]:
+        return [self.resolve(text) for text in texts]
+
+    def _pick(self, pattern_id: int, words: Set[str]) -> Optional[Dict]:
+        """같은 제목의 책들 중 작가의 성이 텍스트에 나온 책, 없으면 가장 많이 내려받은 책을 고릅니다."""
+        _, needs_author, books = self._patterns[pattern_id]
+        for book, surnames in books:
+            if surnames & words:
+                return book
+        return None if needs_author else books[0][0]
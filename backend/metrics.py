@@ -0,0 +1,179 @@
+import functools
+import threading
+import time
+from typing import Dict, Optional, Set
+from prometheus_client import Counter, Gauge, Histogram, generate_latest
+from jobs import Progress
+
+# 응답 한 건의 네트워크 시간 (크롤링 대상은 보통 수백 ms ~ 수 초)
+HTTP_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# 크롤링 단계 하나의 소요 시간 (수 초 ~ 1시간 이상)
+STAGE_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200)
+
+HTTP_REQUESTS = Counter(
+    'crawler_http_requests_total', "호스트별 HTTP 요청 수",
+    ['host', 'method', 'status']
+)
+HTTP_LATENCY = Histogram(
+    'crawler_http_request_duration_seconds', "호스트별 HTTP 요청 소요 시간 (대기 시간 제외)",
+    ['host'], buckets=HTTP_LATENCY_BUCKETS
+)
+HTTP_WAIT = Histogram(
+    'crawler_http_wait_seconds', "속도 제한/동시 요청 제한으로 요청 전에 기다린 시간",
+    ['host'], buckets=HTTP_LATENCY_BUCKETS
+)
+HTTP_ERRORS = Counter(
+    'crawler_http_errors_total', "호스트별 HTTP 오류 수 (4xx/5xx 응답 또는 예외)",
+    ['host', 'kind']
+)
+HTTP_BYTES = Counter(
+    'crawler_http_bytes_total', "호스트별 송수신 바이트 (direction=sent|received)",
+    ['host', 'direction']
+)
+HTTP_RETRIES = Counter(
+    'crawler_http_retries_total', "호스트별 재시도 수 (reason=상태 코드 또는 예외 이름)",
+    ['host', 'reason']
+)
+HTTP_CIRCUIT_STATE = Gauge(
+    'crawler_http_circuit_open', "호스트 회로 차단기가 열려 있으면 1",
+    ['host']
+)
+HTTP_CIRCUIT_REJECTIONS = Counter(
+    'crawler_http_circuit_rejections_total', "회로 차단기가 보내지 않고 바로 실패시킨 요청 수",
+    ['host']
+)
+HTTP_CACHE = Counter(
+    'crawler_http_cache_total', "응답 캐시 조회 결과 (hit|revalidated|miss)",
+    ['host', 'result']
+)
+
+STAGE_DURATION = Histogram(
+    'crawler_stage_duration_seconds', "크롤링 실행 단계별 소요 시간",
+    ['run', 'stage'], buckets=STAGE_BUCKETS
+)
+RUNS = Counter(
+    'crawler_runs_total', "크롤링 실행 횟수",
+    ['run', 'result']
+)
+LAST_SUCCESS = Gauge(
+    'crawler_last_success_timestamp_seconds', "마지막으로 성공한 실행의 종료 시각 (Unix time)",
+    ['run']
+)
+
+# /status 에서 읽는 값 (Prometheus 메트릭은 쓰기 전용으로 다룹니다)
+_lock = threading.Lock()
+last_success: Dict[str, float] = {}
+host_health: Dict[str, Dict[str, float]] = {}
+open_circuits: Set[str] = set()
+
+def observe_request(host: str, method: str, status: Optional[int], elapsed: float,
+                    sent: int = 0, received: int = 0, error: str = None):
+    """HTTP 요청 한 건을 기록합니다. status가 None이면 응답을 받지 못한 경우입니다."""
+    HTTP_REQUESTS.labels(host, method.upper(), str(status) if status is not None else 'error').inc()
+    HTTP_LATENCY.labels(host).observe(elapsed)
+    if sent:
+        HTTP_BYTES.labels(host, 'sent').inc(sent)
+    if received:
+        HTTP_BYTES.labels(host, 'received').inc(received)
+
+    if error is None and status is not None and status >= 400:
+        error = f"http_{status // 100}xx"
+    if error:
+        HTTP_ERRORS.labels(host, error).inc()
+
+    with _lock:
+        health = host_health.setdefault(host, {})
+        health['last_error' if error else 'last_success'] = time.time()
+
+def observe_wait(host: str, elapsed: float):
+    HTTP_WAIT.labels(host).observe(elapsed)
+
+def observe_retry(host: str, reason: str):
+    HTTP_RETRIES.labels(host, reason).inc()
+
+def observe_circuit(host: str, state: str):
+    HTTP_CIRCUIT_STATE.labels(host).set(1 if state == 'open' else 0)
+    with _lock:
+        if state == 'open':
+            open_circuits.add(host)
+        else:
+            open_circuits.discard(host)
+
+def observe_circuit_rejection(host: str):
+    HTTP_CIRCUIT_REJECTIONS.labels(host).inc()
+
+def observe_cache(host: str, result: str):
+    HTTP_CACHE.labels(host, result).inc()
+
+def host_status(host: str) -> str:
+    """회로가 열렸으면 circuit_open, 가장 최근 요청이 실패했으면 degraded, 요청한 적이 없으면 unknown입니다."""
+    with _lock:
+        health = dict(host_health.get(host, {}))
+        if host in open_circuits:
+            return 'circuit_open'
+    if not health:
+        return 'unknown'
+    if health.get('last_error', 0) > health.get('last_success', 0):
+        return 'degraded'
+    return 'available'
+
+def render() -> bytes:
+    return generate_latest()
+
+class RunMetrics(Progress):
+    """실행 하나의 단계별 소요 시간을 기록하고, 받은 진행 보고는 원래 Progress에 넘깁니다."""
+
+    def __init__(self, run: str, progress: Progress):
+        self.run = run
+        self.progress = progress
+        self.failed = False
+        self._stage = None
+        self._stage_started = None
+
+    def set_stage(self, stage: str, total: Optional[int] = None):
+        self._end_stage()
+        self._stage = stage
+        self._stage_started = time.monotonic()
+        self.progress.set_stage(stage, total)
+
+    def advance(self, count: int = 1):
+        self.progress.advance(count)
+
+    def set_error(self, error: Exception):
+        self.failed = True
+        self.progress.set_error(error)
+
+    def _end_stage(self):
+        if self._stage is not None:
+            STAGE_DURATION.labels(self.run, self._stage).observe(time.monotonic() - self._stage_started)
+            self._stage = None
+
+    def finish(self):
+        self._end_stage()
+        RUNS.labels(self.run, 'failed' if self.failed else 'succeeded').inc()
+        if not self.failed:
+            now = time.time()
+            LAST_SUCCESS.labels(self.run).set(now)
+            with _lock:
+                last_success[self.run] = now
+
+def timed_run(run: str):
+    """크롤러의 실행 메서드를 감싸 단계별 소요 시간과 성공 시각을 기록합니다.
+
+    실행 중에는 self.progress를 RunMetrics로 바꿔 두므로 기존 set_stage 호출이 그대로 측정됩니다.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            progress = self.progress
+            self.progress = RunMetrics(run, progress)
+            try:
+                return await method(self, *args, **kwargs)
+            except Exception as e:
+                self.progress.set_error(e)
+                raise
+            finally:
+                self.progress.finish()
+                self.progress = progress
+        return wrapper
+    return decorator
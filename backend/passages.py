@@ -0,0 +1,246 @@
+import asyncio
+import logging
+import os
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from atomic_files import atomic_write
+from config import Config
+from corpus import TextCorpus
+from memoize import ByteLRUCache
+from readability import LEVELS
+from text_spans import lower, sentence_boundaries, word_spans
+
+# 장 끝에 남은 구간이 목표 크기의 이 비율보다 짧으면 앞 구간에 붙입니다
+MIN_TAIL_RATIO = 0.25
+
+# Automated Readability Index: 글자 수/단어 수와 단어 수/문장 수만으로 학년 수준을 구합니다
+ARI_CHARS, ARI_WORDS, ARI_BASE = 4.71, 0.5, -21.43
+
+def build_passages(raw: np.ndarray, paragraphs: np.ndarray, chapters: np.ndarray, target: int) -> Dict[str, np.ndarray]:
+    """본문을 target 바이트 안팎의 연습 구간으로 나누고 구간마다 난이도를 매깁니다.
+
+    구간은 문단 경계에서 시작하고 장 제목을 넘지 않으며, 첫 장 앞의 표제지/목차는 뺍니다.
+    target의 두 배보다 긴 문단은 문장 경계(없으면 단어 경계)에서 자릅니다.
+    난이도는 구간별 ARI 학년이며, 책 안에서 3분위로 수준을 나눕니다.
+    """
+    buf = lower(raw)
+    word_starts, word_ends = word_spans(buf)
+    sentence_ends = sentence_boundaries(raw, buf, word_starts, word_ends) + 1
+
+    def cut(start: int) -> int:
+        # start + target 이후 첫 문장 끝, 너무 멀면 첫 단어 끝
+        position = np.searchsorted(sentence_ends, start + target)
+        if position < len(sentence_ends) and sentence_ends[position] <= start + 2 * target:
+            return int(sentence_ends[position])
+        position = np.searchsorted(word_ends, start + target)
+        return int(word_ends[position]) + 1 if position < len(word_ends) else len(raw)
+
+    def next_word(position: int) -> int:
+        index = np.searchsorted(word_starts, position)
+        return int(word_starts[index]) if index < len(word_starts) else len(raw)
+
+    heading = np.zeros(len(paragraphs), dtype=bool)
+    heading[chapters] = True
+    chapter_of = np.cumsum(heading) - 1
+
+    spans = []
+    current = None
+
+    def flush(end: int, chapter: int):
+        if spans and spans[-1][2] == chapter and end - current < MIN_TAIL_RATIO * target:
+            spans[-1][1] = end
+        else:
+            spans.append([current, end, chapter])
+
+    for index, (start, end) in enumerate(paragraphs):
+        chapter = int(chapter_of[index])
+        # 장 구분이 있는 책에서 첫 장 앞은 표제지와 목차이므로 쓰지 않습니다
+        if chapter < 0 and len(chapters):
+            continue
+        if heading[index]:
+            if current is not None:
+                flush(int(paragraphs[index - 1, 1]), chapter - 1)
+                current = None
+            continue
+
+        if current is None:
+            current = int(start)
+        while end - current > 2 * target:
+            split = cut(current)
+            if split >= end:
+                break
+            spans.append([current, split, chapter])
+            current = next_word(split)
+        if end - current >= target:
+            spans.append([current, int(end), chapter])
+            current = None
+
+    if current is not None and len(paragraphs):
+        flush(int(paragraphs[-1, 1]), int(chapter_of[-1]))
+
+    spans = np.array(spans, dtype=np.int64).reshape(-1, 3)
+    starts, ends = spans[:, 0], spans[:, 1]
+
+    # 구간 안의 단어/글자/문장 수를 누적합의 차로 한 번에 셉니다
+    letters = np.concatenate(([0], np.cumsum(word_ends - word_starts + 1)))
+    first_word, last_word = np.searchsorted(word_starts, starts), np.searchsorted(word_starts, ends)
+    words = np.maximum(last_word - first_word, 1)
+    sentences = np.maximum(np.searchsorted(sentence_ends, ends, side='right')
+                           - np.searchsorted(sentence_ends, starts, side='right'), 1)
+    grades = ARI_CHARS * (letters[last_word] - letters[first_word]) / words + ARI_WORDS * words / sentences + ARI_BASE
+
+    levels = np.zeros(len(spans), dtype=np.int8)
+    if len(spans):
+        levels = np.searchsorted(np.quantile(grades, [1 / 3, 2 / 3]), grades, side='right').astype(np.int8)
+
+    return {
+        'starts': starts,
+        'ends': ends,
+        'chapters': spans[:, 2],
+        'grades': grades.astype(np.float32),
+        'levels': levels,
+        'target': np.array(target)
+    }
+
+class PassageIndex:
+    """책 하나의 연습 구간 위치와 수준별 구간 번호 목록입니다. 페이지 조회는 배열 인덱싱뿐입니다."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.starts = arrays['starts']
+        self.ends = arrays['ends']
+        self.chapters = arrays['chapters']
+        self.grades = arrays['grades']
+        self.levels = arrays['levels']
+        self.by_level = {level: np.flatnonzero(self.levels == index) for index, level in enumerate(LEVELS)}
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.starts, self.ends, self.chapters, self.grades, self.levels, *self.by_level.values())
+        return sum(array.nbytes for array in arrays)
+
+    def _passages(self, difficulty: Optional[str]) -> Optional[np.ndarray]:
+        return self.by_level[difficulty] if difficulty else None
+
+    def pages(self, per_page: int, difficulty: str = None) -> int:
+        passages = self._passages(difficulty)
+        count = len(self) if passages is None else len(passages)
+        return -(-count // per_page)
+
+    def page(self, page: int, per_page: int, difficulty: str = None) -> np.ndarray:
+        """1부터 시작하는 page번째 페이지의 구간 번호들입니다."""
+        first = (page - 1) * per_page
+        passages = self._passages(difficulty)
+        if passages is None:
+            return np.arange(first, min(first + per_page, len(self)))
+        return passages[first:first + per_page]
+
+class PassageStore:
+    """필사 연습용 구간을 제공합니다.
+
+    구간 색인은 책마다 한 번 만들어 '{CORPUS_DIR}/{book_id}.passages.npz' 로 저장하고,
+    응답할 때는 색인에서 위치를 찾아 mmap으로 연 본문의 그 부분만 읽습니다.
+    색인과 디코딩한 구간은 바이트 크기 기준 LRU 캐시(PASSAGE_CACHE_BYTES)에 둡니다.
+    """
+
+    def __init__(self, corpus: TextCorpus, target: int = None, per_page: int = None, cache_bytes: int = None):
+        self.corpus = corpus
+        self.target = target or Config.PASSAGE_BYTES
+        self.per_page = per_page or Config.PASSAGES_PER_PAGE
+        self.cache = ByteLRUCache(cache_bytes or Config.PASSAGE_CACHE_BYTES)
+        self._building: Dict[str, asyncio.Task] = {}
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+
+    def index_path(self, book_id) -> str:
+        return os.path.join(self.corpus.directory, f"{book_id}.passages.npz")
+
+    async def index(self, book_id) -> Optional[PassageIndex]:
+        """책의 구간 색인입니다. 본문이 없으면 None이고, 색인이 없으면 한 번만 만듭니다."""
+        book_id = str(book_id)
+        index = self.cache.get(('index', book_id))
+        if index is not None:
+            return index
+        if not self.corpus.has(book_id):
+            return None
+
+        task = self._building.get(book_id)
+        if task is None:
+            task = asyncio.ensure_future(asyncio.to_thread(self._load, book_id))
+            self._building[book_id] = task
+            task.add_done_callback(lambda _, book_id=book_id: self._building.pop(book_id, None))
+        index = await asyncio.shield(task)
+
+        self.cache.put(('index', book_id), index, index.nbytes)
+        return index
+
+    async def prepare(self, books: List[Dict], on_prepared: Callable[[], None] = None) -> int:
+        """본문이 있는 책들의 구간 색인을 미리 만들고, 준비된 책 수를 반환합니다."""
+        prepared = 0
+        for book_id in {str(book['id']) for book in books if book.get('id')}:
+            try:
+                if await self.index(book_id) is not None:
+                    prepared += 1
+            except Exception as e:
+                self.logger.warning(f"구간 색인 생성 실패 (ID: {book_id}): {e}")
+            finally:
+                if on_prepared:
+                    on_prepared()
+        return prepared
+
+    async def page(self, book_id, page: int, difficulty: str = None) -> Optional[Dict]:
+        """page번째 페이지의 구간들입니다. 본문이 없는 책이면 None입니다."""
+        index = await self.index(book_id)
+        if index is None:
+            return None
+
+        book_id = str(book_id)
+        return {
+            'book_id': book_id,
+            'page': page,
+            'pages': index.pages(self.per_page, difficulty),
+            'difficulty': difficulty,
+            'passages': [self._passage(book_id, index, int(passage))
+                         for passage in index.page(page, self.per_page, difficulty)]
+        }
+
+    def _passage(self, book_id: str, index: PassageIndex, passage: int) -> Dict:
+        key = ('passage', book_id, passage)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        text = self.corpus.open(book_id)
+        content = text.slice(index.starts[passage], index.ends[passage])
+        chapter = int(index.chapters[passage])
+        cached = {
+            'index': passage,
+            'chapter': text.chapter_title(chapter),
+            'level': LEVELS[index.levels[passage]],
+            'grade': round(float(index.grades[passage]), 1),
+            'text': bytes(content).decode('utf-8', errors='replace')
+        }
+        self.cache.put(key, cached, len(content))
+        return cached
+
+    def _load(self, book_id: str) -> PassageIndex:
+        path = self.index_path(book_id)
+        if os.path.exists(path):
+            with np.load(path) as arrays:
+                if int(arrays['target']) == self.target:
+                    return PassageIndex(dict(arrays))
+
+        # 목표 크기가 바뀌었거나 처음이면 다시 만듭니다
+        self.corpus.ensure_index(book_id)
+        with np.load(self.corpus.index_path(book_id)) as corpus_index:
+            paragraphs, chapters = corpus_index['paragraphs'], corpus_index['chapters']
+        raw = np.fromfile(self.corpus.path(book_id), dtype=np.uint8)
+        arrays = build_passages(raw, paragraphs, chapters, self.target)
+
+        # 같은 책을 동시에 처음 읽는 요청들이 서로의 임시 파일을 덮어쓰지 않습니다
+        with atomic_write(path) as f:
+            np.savez(f, **arrays)
+        return PassageIndex(arrays)
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import mmap
+import os
+from concurrent.futures import Executor
+from typing import Callable, Dict, FrozenSet, List, Tuple
+import numpy as np
+from config import Config
+from text_spans import TERMINAL, byte_table, hash_words, lower, sentence_boundaries, shift, word_hashes, word_spans
+
+# 인용문 단어 수, 쉼표/세미콜론/콜론 수, 흔하지 않은 단어 비율의 이상적인 값과 허용 폭
+IDEAL_WORDS, WORDS_SPREAD = 18, 8
+IDEAL_CLAUSES, CLAUSES_SPREAD = 2, 1.5
+IDEAL_RARE_SHARE, RARE_SHARE_SPREAD = 0.2, 0.15
+MIN_WORDS, MAX_WORDS = 6, 45
+
+# 격언처럼 일반적인 진술에 자주 나오는 단어 (하나당 15%, 최대 3개까지 가산)
+APHORISM_WORDS = ('all', 'every', 'never', 'always', 'nothing', 'no', 'one', 'life', 'love', 'heart',
+                  'truth', 'world', 'man', 'men', 'woman', 'happiness', 'mind', 'soul', 'we', 'our')
+APHORISM_BONUS = 0.15
+
+# 같은 장면에서 여러 개를 뽑지 않도록 인용문 사이에 둘 최소 거리 (바이트)
+MIN_QUOTE_DISTANCE = 5000
+
+CLAUSE = byte_table(b',;:')
+# 숫자, 밑줄(기울임 표시), 대괄호(각주/삽화 표시)가 있는 문장은 인용문으로 쓰지 않습니다
+NOISE = byte_table(b'0123456789_[]*|<>{}#')
+UPPER = byte_table(bytes(range(ord('A'), ord('Z') + 1)))
+
+QUOTE_STRIP = ' \t\r\n"\'“”‘’_'
+
+def _quote_marks(raw: np.ndarray) -> np.ndarray:
+    """큰따옴표 위치: ASCII " 와 UTF-8 “ ” (E2 80 9C/9D) 의 마지막 바이트"""
+    curly = np.isin(raw, (0x9c, 0x9d)) & shift(raw == 0x80, 1) & shift(raw == 0xe2, 2)
+    return (raw == ord('"')) | curly
+
+def _per_sentence(positions: np.ndarray, boundaries: np.ndarray, count: int, weights=None) -> np.ndarray:
+    return np.bincount(np.searchsorted(boundaries, positions), weights=weights, minlength=count)[:count]
+
+def mine_quotes(raw: np.ndarray, common_hashes: np.ndarray, limit: int) -> List[Tuple[str, float, int]]:
+    """본문 바이트 배열에서 인용하기 좋은 문장 limit개를 (문장, 점수, 바이트 위치)로 반환합니다.
+
+    문장마다 길이, 구절 리듬(쉼표 등의 수), 흔하지 않은 단어 비율, 격언 단어 수를 numpy로 한 번에 계산해
+    점수를 매기고, 대사 조각/제목/각주처럼 인용문이 될 수 없는 문장은 뺍니다.
+    """
+    buf = lower(raw)
+    starts, ends = word_spans(buf)
+    if len(starts) < MIN_WORDS:
+        return []
+
+    # 문장 k 는 (boundaries[k-1], boundaries[k]] 구간입니다. 마지막 경계 뒤의 조각은 쓰지 않습니다
+    boundaries = sentence_boundaries(raw, buf, starts, ends)
+    count = len(boundaries)
+    if not count:
+        return []
+
+    sentence_of_word = np.searchsorted(boundaries, starts)
+    words = np.bincount(sentence_of_word, minlength=count + 1)[:count]
+    first_word = np.minimum(np.searchsorted(sentence_of_word, np.arange(count)), len(starts) - 1)
+    sentence_start = starts[first_word]
+
+    hashes = word_hashes(buf, starts, ends)
+    aphorisms = np.bincount(sentence_of_word, weights=np.isin(hashes, APHORISM_HASHES), minlength=count + 1)[:count]
+    clauses = _per_sentence(np.flatnonzero(CLAUSE[raw]), boundaries, count)
+    noise = _per_sentence(np.flatnonzero(NOISE[raw]), boundaries, count)
+    uppercase = _per_sentence(np.flatnonzero(UPPER[raw]), boundaries, count)
+    letters = _per_sentence(starts, boundaries, count, weights=ends - starts + 1)
+
+    # 첫 단어 뒤에 따옴표가 있으면 서술과 대사가 섞인 문장입니다
+    marks = np.flatnonzero(_quote_marks(raw))
+    mark_sentence = np.searchsorted(boundaries, marks)
+    interior = marks[mark_sentence < count] > sentence_start[mark_sentence[mark_sentence < count]]
+    mixed = np.bincount(mark_sentence[mark_sentence < count][interior], minlength=count)[:count]
+
+    valid = ((words >= MIN_WORDS) & (words <= MAX_WORDS)
+             & TERMINAL[raw[boundaries]]
+             & (noise == 0) & (mixed == 0)
+             & ~((raw[sentence_start] >= ord('a')) & (raw[sentence_start] <= ord('z')))
+             & (uppercase <= 0.3 * letters))
+
+    score = (np.exp(-((words - IDEAL_WORDS) / WORDS_SPREAD) ** 2)
+             * np.exp(-((clauses - IDEAL_CLAUSES) / CLAUSES_SPREAD) ** 2)
+             * (1 + APHORISM_BONUS * np.minimum(aphorisms, 3)))
+    if len(common_hashes):
+        rare = np.bincount(sentence_of_word, weights=~np.isin(hashes, common_hashes), minlength=count + 1)[:count]
+        rare_share = rare / np.maximum(words, 1)
+        score *= np.exp(-((rare_share - IDEAL_RARE_SHARE) / RARE_SHARE_SPREAD) ** 2)
+
+    candidates = np.flatnonzero(valid)
+    candidates = candidates[np.argsort(-score[candidates], kind='stable')]
+
+    picked = []
+    for sentence in candidates:
+        start = int(sentence_start[sentence])
+        if any(abs(start - other) < MIN_QUOTE_DISTANCE for _, _, other in picked):
+            continue
+        text = bytes(raw[start:boundaries[sentence] + 1]).decode('utf-8', errors='replace')
+        text = ' '.join(text.split()).strip(QUOTE_STRIP)
+        # 후렴처럼 같은 문장이 되풀이되는 경우
+        if any(text == other for other, _, _ in picked):
+            continue
+        picked.append((text, round(float(score[sentence]), 4), start))
+        if len(picked) >= limit:
+            break
+    return picked
+
+APHORISM_HASHES = hash_words(APHORISM_WORDS)
+
+def _mine_file(path: str, common_hashes: np.ndarray, limit: int) -> List[Tuple[str, float, int]]:
+    """본문 파일을 메모리 매핑해 읽습니다. (복사 없이 numpy 배열로 봅니다)"""
+    if not os.path.getsize(path):
+        return []
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return mine_quotes(np.frombuffer(mapped, dtype=np.uint8), common_hashes, limit)
+    finally:
+        mapped.close()
+
+class QuoteMiner:
+    """추천 도서들의 본문에서 명문장을 한 번에 골라냅니다.
+
+    책마다 본문 파일을 공유 프로세스 풀(ResourcePool.processes)의 워커가 메모리 매핑해 문장 단위로 점수를 매깁니다.
+    풀은 다른 작업과 함께 쓰므로 흔한 단어 해시와 책당 인용문 수는 작업마다 함께 보냅니다.
+    흔하지 않은 단어 비율은 가독성 분석의 흔한 단어 기준을 쓰며, 기준이 없으면 이 항목은 빼고 계산합니다.
+    """
+
+    def __init__(self, executor: Executor, common_words: FrozenSet[str] = frozenset(), per_book: int = None):
+        self.executor = executor
+        self.common_hashes = hash_words(common_words) if common_words else np.zeros(0, dtype=np.uint64)
+        self.per_book = per_book or Config.QUOTES_PER_BOOK
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+
+    async def mine(self, books: List[Dict], paths: Dict[str, str],
+                   on_mined: Callable[[], None] = None) -> List[Dict]:
+        """paths({book_id: 본문 파일})에 있는 책마다 명문장을 골라 책 순서대로 반환합니다."""
+        books = [book for book in books if str(book.get('id')) in paths]
+        if not books:
+            return []
+
+        loop = asyncio.get_running_loop()
+
+        async def mine(book):
+            try:
+                return await loop.run_in_executor(self.executor, _mine_file, paths[str(book['id'])],
+                                                  self.common_hashes, self.per_book)
+            except Exception as e:
+                self.logger.warning(f"'{book.get('title', 'Unknown')}' 명문장 추출 실패: {e}")
+                return []
+            finally:
+                if on_mined:
+                    on_mined()
+
+        results = await asyncio.gather(*(mine(book) for book in books))
+
+        quotes = []
+        for book, picked in zip(books, results):
+            for quote, score, offset in picked:
+                quotes.append({
+                    'book_title': book.get('title'),
+                    'author': book.get('author'),
+                    'quote': quote,
+                    'book_id': book.get('id'),
+                    'score': score,
+                    'offset': offset
+                })
+        return quotes
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from config import Config
+
+class TokenBucket:
+    """초당 rate개의 토큰이 차오르고 최대 burst개까지 쌓이는 토큰 버킷입니다.
+
+    토큰이 부족하면 음수로 예약해 두고 그만큼 기다리므로,
+    동시에 여러 요청이 와도 전체 속도는 정확히 rate를 넘지 않습니다.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """토큰 하나를 예약하고 기다려야 할 시간(초)을 반환합니다."""
+        if self.rate <= 0:
+            return max(0.0, self.paused_until - time.monotonic())
+
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return max(0.0, -self.tokens) / self.rate
+
+    def refund(self):
+        """예약해 놓고 보내지 않은 요청의 토큰을 돌려줍니다."""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + 1)
+
+    def pause(self, seconds: float):
+        """seconds 동안 토큰을 내주지 않습니다. (429/503 응답의 Retry-After)"""
+        with self._lock:
+            now = time.monotonic()
+            resume = now + seconds
+            if self.rate <= 0:
+                self.paused_until = max(self.paused_until, resume)
+                return
+            if self.updated >= resume:
+                return
+            # resume 시각에 한 건만 보내고 그 뒤로는 rate 간격으로 보내도록 버킷을 비웁니다
+            self.tokens = min(1.0, self.tokens + max(0.0, now - self.updated) * self.rate)
+            self.updated = resume
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def acquire_sync(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+class HostRateLimiter:
+    """호스트별 토큰 버킷을 관리하는 중앙 속도 제한기입니다."""
+
+    def __init__(self, rate: float = None, burst: int = None, overrides: Dict[str, Tuple[float, int]] = None):
+        self.rate = Config.RATE_LIMIT_RPS if rate is None else rate
+        self.burst = Config.RATE_LIMIT_BURST if burst is None else burst
+        self.overrides = overrides if overrides is not None else parse_rate_limits(Config.RATE_LIMIT_OVERRIDES)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.overrides.get(host, (self.rate, self.burst))
+                bucket = TokenBucket(rate, burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    async def acquire(self, host: str):
+        """해당 호스트로 요청을 보내도 될 때까지 기다립니다."""
+        await self.bucket(host).acquire()
+
+    def acquire_sync(self, host: str):
+        """동기 클라이언트(PRAW 등)용 acquire입니다."""
+        self.bucket(host).acquire_sync()
+
+    def reserve(self, host: str) -> float:
+        """토큰을 예약하고 기다려야 할 시간(초)을 반환합니다. 기다리는 도중 그만둘 때는 refund()를 부릅니다."""
+        return self.bucket(host).reserve()
+
+    def refund(self, host: str):
+        self.bucket(host).refund()
+
+    def pause(self, host: str, seconds: float):
+        """호스트가 요청한 시간(Retry-After) 동안 그 호스트로 가는 모든 요청을 멈춥니다."""
+        self.bucket(host).pause(seconds)
+
+def parse_rate_limits(spec: Optional[str]) -> Dict[str, Tuple[float, int]]:
+    """'host=rps:burst,host2=rps' 형식의 설정을 파싱합니다."""
+    overrides = {}
+    if not spec:
+        return overrides
+
+    for item in spec.split(','):
+        if '=' not in item:
+            continue
+        host, value = item.split('=', 1)
+        rate, _, burst = value.partition(':')
+        overrides[host.strip()] = (float(rate), int(burst) if burst else Config.RATE_LIMIT_BURST)
+
+    return overrides
@@ -0,0 +1,242 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import unicodedata
+from collections import Counter
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+import numpy as np
+from atomic_files import atomic_write
+from config import Config
+from text_spans import VOWEL, lower, sentence_boundaries, shift, word_spans
+
+LEVELS = ('beginner', 'intermediate', 'advanced')
+
+# 기준 도서 중 이 비율 이상에 소문자로 나오는 단어를 흔한 단어로 봅니다
+COMMON_WORD_RATIO = 0.1
+
+# 난이도 = Flesch-Kincaid 학년 + 드문 단어 비율 x 이 값 (드문 단어 5%면 +1학년)
+RARE_WORD_WEIGHT = 20
+
+WORD = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)*")
+
+def _ascii(text: str) -> bytes:
+    """발음 구별 기호를 떼고 ASCII 바이트로 바꿉니다. (’ 은 ' 로)"""
+    text = text.replace('’', "'").replace('“', '"').replace('”', '"')
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore')
+
+def vocabulary(text: str) -> FrozenSet[str]:
+    """본문에 소문자로 한 번이라도 나온 단어들입니다. (대문자로만 나오는 인명/지명 제외)"""
+    return frozenset(word for word in set(WORD.findall(_ascii(text).decode('ascii'))) if word.islower())
+
+def text_metrics(text: str, common_words: FrozenSet[str]) -> Optional[Dict]:
+    """본문 전체의 문장 길이, 음절 수, 드문 단어 비율과 난이도를 계산합니다.
+
+    글자 단위 numpy 배열에서 단어/모음 묶음/문장 경계를 한 번에 찾고 (text_spans)
+    bincount/searchsorted로 단어별 음절 수와 문장별 단어 수를 셉니다.
+    """
+    data = _ascii(text)
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if not len(raw):
+        return None
+
+    buf = lower(raw)
+    starts, ends = word_spans(buf)
+    if not len(starts):
+        return None
+
+    # 음절: 단어 안의 모음 묶음 수, 끝의 묵음 e 와 -ed 를 빼고 최소 1
+    vowel = VOWEL[buf]
+    groups = np.flatnonzero(vowel & ~shift(vowel, 1))
+    word = np.searchsorted(ends, groups)
+    in_word = (word < len(starts)) & (starts[np.minimum(word, len(starts) - 1)] <= groups)
+    syllables = np.bincount(word[in_word], minlength=len(starts))
+    last, before = buf[ends], buf[np.maximum(ends - 1, 0)]
+    before_ed = buf[np.maximum(ends - 2, 0)]
+    silent_e = (last == ord('e')) & ~VOWEL[before] & (before != ord('l'))
+    silent_ed = (last == ord('d')) & (before == ord('e')) & ~np.isin(before_ed, (ord('t'), ord('d')))
+    syllables = np.maximum(syllables - ((silent_e | silent_ed) & (syllables > 1)), 1)
+
+    boundaries = sentence_boundaries(raw, buf, starts, ends)
+    sentence_lengths = np.bincount(np.searchsorted(boundaries, starts))
+    sentence_lengths = sentence_lengths[sentence_lengths > 0]
+
+    # 드문 단어: 인명처럼 대문자로만 나오는 단어는 빼고, 흔한 단어 목록에 없는 단어의 비율
+    forms = Counter(WORD.findall(data.decode('ascii')))
+    counts = Counter()
+    for word, count in forms.items():
+        counts[word.lower()] += count
+    words = [word for word in counts if word in forms]
+    word_counts = np.fromiter((counts[word] for word in words), dtype=np.int64, count=len(words))
+    rare = np.fromiter((word not in common_words for word in words), dtype=bool, count=len(words))
+    rare_word_ratio = float(word_counts[rare].sum() / word_counts.sum()) if len(words) else 0.0
+
+    words_per_sentence = float(len(starts) / len(sentence_lengths))
+    syllables_per_word = float(syllables.mean())
+    grade = 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59
+
+    return {
+        'words': int(len(starts)),
+        'sentences': int(len(sentence_lengths)),
+        'words_per_sentence': round(words_per_sentence, 2),
+        'sentence_length_p90': float(np.percentile(sentence_lengths, 90)),
+        'syllables_per_word': round(syllables_per_word, 3),
+        'polysyllable_ratio': round(float((syllables >= 3).mean()), 4),
+        'rare_word_ratio': round(rare_word_ratio, 4),
+        'flesch_kincaid_grade': round(grade, 2),
+        'difficulty': round(grade + RARE_WORD_WEIGHT * rare_word_ratio, 2)
+    }
+
+def _read(path: str) -> str:
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+def _file_vocabulary(path: str) -> FrozenSet[str]:
+    return vocabulary(_read(path))
+
+def _file_metrics(path: str, common_words: FrozenSet[str]) -> Optional[Dict]:
+    return text_metrics(_read(path), common_words)
+
+def assign_levels(difficulties: np.ndarray) -> List[str]:
+    """카탈로그 전체 난이도의 3분위로 초급/중급/고급을 나눕니다."""
+    thresholds = np.quantile(difficulties, [1 / 3, 2 / 3])
+    return [LEVELS[index] for index in np.searchsorted(thresholds, difficulties, side='right')]
+
+class ReadabilityStore:
+    """책별 가독성 점수와 수준, 흔한 단어 기준 목록을 JSON 파일에 보관합니다.
+
+    본문은 바뀌지 않으므로 한 번 점수를 매긴 책은 다시 계산하지 않고,
+    새로 점수를 매길 때마다 저장된 카탈로그 전체의 수준을 다시 나눕니다.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or Config.READABILITY_PATH
+        self.books: Dict[str, Dict] = {}
+        self.common_words: FrozenSet[str] = frozenset()
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.books = data.get('books', {})
+            self.common_words = frozenset(data.get('common_words', []))
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"가독성 점수 파일을 읽지 못했습니다 ({self.path}): {e}")
+
+    def save(self):
+        data = {
+            'books': self.books,
+            'common_words': sorted(self.common_words),
+            'updated_at': datetime.now().isoformat()
+        }
+
+        # 예약 작업과 수동 업데이트가 동시에 저장해도 서로의 임시 파일을 덮어쓰지 않습니다
+        with atomic_write(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+        self.logger.info(f"가독성 점수 저장 완료: {self.path} ({len(self.books)}권)")
+
+    def __contains__(self, book_id) -> bool:
+        return str(book_id) in self.books
+
+    def get(self, book_id) -> Optional[Dict]:
+        return self.books.get(str(book_id)) if book_id is not None else None
+
+    def update(self, book: Dict, scores: Dict):
+        self.books[str(book['id'])] = {
+            'title': book.get('title'),
+            'author': book.get('author'),
+            'downloads': book.get('downloads') or 0,
+            **scores
+        }
+
+    def assign_levels(self):
+        if not self.books:
+            return
+        ids = list(self.books)
+        difficulties = np.array([self.books[book_id]['difficulty'] for book_id in ids])
+        for book_id, level in zip(ids, assign_levels(difficulties)):
+            self.books[book_id]['level'] = level
+
+    def books_by_level(self, level: str, limit: int = None) -> List[Dict]:
+        """수준별 책을 다운로드 수 순서로 반환합니다."""
+        books = [{'id': book_id, **scores} for book_id, scores in self.books.items() if scores.get('level') == level]
+        books.sort(key=lambda book: book['downloads'], reverse=True)
+        return books[:limit] if limit else books
+
+class ReadabilityScorer:
+    """본문 파일들을 공유 프로세스 풀(ResourcePool.processes)에서 분석해 가독성 점수를 매깁니다.
+
+    풀은 다른 작업과 함께 쓰므로 워커 초기화 대신 흔한 단어 목록을 작업마다 함께 보냅니다.
+    흔한 단어 목록은 처음 한 번 다운로드 수가 많은 기준 도서들의 어휘로 만들어 저장하므로,
+    이후 실행에서 새로 추가되는 책도 같은 기준으로 비교됩니다.
+    """
+
+    def __init__(self, executor: Executor, store: ReadabilityStore = None):
+        self.executor = executor
+        self.store = store or ReadabilityStore()
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+
+    async def score(self, books: Iterable[Dict], paths: Dict[str, str],
+                    on_scored: Callable[[], None] = None) -> int:
+        """paths({book_id: 본문 파일})에 있는 책들의 점수를 매겨 저장소에 넣고, 점수를 매긴 책 수를 반환합니다.
+
+        흔한 단어 기준은 다운로드 수를 아는 책 중 많은 순서로 고릅니다.
+        """
+        books = [book for book in books if str(book.get('id')) in paths]
+        if not books:
+            return 0
+
+        loop = asyncio.get_running_loop()
+
+        if not self.store.common_words:
+            popular = sorted((book for book in books if book.get('downloads')),
+                             key=lambda book: book['downloads'], reverse=True)
+            if not popular:
+                self.logger.warning("다운로드 수를 아는 책이 없어 흔한 단어 기준 도서를 주어진 순서대로 고릅니다")
+            reference = [paths[str(book['id'])] for book in (popular or books)[:Config.READABILITY_REFERENCE_BOOKS]]
+            vocabularies = await asyncio.gather(
+                *(loop.run_in_executor(self.executor, _file_vocabulary, path) for path in reference)
+            )
+            self.store.common_words = self._common_words(vocabularies)
+            self.logger.info(f"흔한 단어 기준 생성: 기준 도서 {len(reference)}권, 단어 {len(self.store.common_words)}개")
+
+        common_words = self.store.common_words
+
+        async def analyze(book):
+            try:
+                return book, await loop.run_in_executor(self.executor, _file_metrics, paths[str(book['id'])], common_words)
+            except Exception as e:
+                self.logger.warning(f"'{book.get('title', 'Unknown')}' 가독성 분석 실패: {e}")
+                return book, None
+            finally:
+                if on_scored:
+                    on_scored()
+
+        scored = 0
+        for book, scores in await asyncio.gather(*(analyze(book) for book in books)):
+            if scores:
+                self.store.update(book, scores)
+                scored += 1
+
+        self.store.assign_levels()
+        await asyncio.to_thread(self.store.save)
+        return scored
+
+    def _common_words(self, vocabularies: List[FrozenSet[str]]) -> FrozenSet[str]:
+        document_frequency = Counter(word for words in vocabularies for word in words)
+        min_books = max(2, COMMON_WORD_RATIO * len(vocabularies))
+        return frozenset(word for word, count in document_frequency.items() if count >= min_books)
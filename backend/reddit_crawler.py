@@ -1,19 +1,123 @@
 import praw
+import prawcore
 import logging
-from typing import Dict, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
 from config import Config
+from rate_limiter import HostRateLimiter
+import metrics
+from mention_resolver import MentionResolver
+
+REDDIT_HOST = 'oauth.reddit.com'
+
+class RedditRateGate:
+    """Reddit 응답의 X-Ratelimit 헤더(PRAW auth.limits)를 보고 한도 소진 시 리셋까지 대기합니다."""
+
+    def __init__(self, min_remaining: float = None):
+        self.min_remaining = Config.REDDIT_MIN_REMAINING if min_remaining is None else min_remaining
+        self.remaining = None
+        self.reset_timestamp = None
+        self._lock = threading.Lock()
+
+    def update(self, limits: Dict):
+        if not limits or limits.get('remaining') is None:
+            return
+        with self._lock:
+            self.remaining = limits['remaining']
+            self.reset_timestamp = limits.get('reset_timestamp')
+
+    def wait(self):
+        with self._lock:
+            if self.remaining is None or self.remaining > self.min_remaining or not self.reset_timestamp:
+                if self.remaining is not None:
+                    self.remaining -= 1
+                return
+            wait = self.reset_timestamp - time.time()
+            # 리셋 이후에는 다시 헤더를 받을 때까지 제한하지 않습니다
+            self.remaining = None
+
+        if wait > 0:
+            time.sleep(wait)
+
+class InstrumentedRequestor(prawcore.Requestor):
+    """PRAW가 보내는 HTTP 요청마다 호스트별 요청 수, 소요 시간, 오류, 바이트를 기록합니다."""
+
+    def request(self, method: str, url: str, *args, **kwargs):
+        host = urlsplit(url).netloc
+        started = time.monotonic()
+        try:
+            response = super().request(method, url, *args, **kwargs)
+        except Exception as e:
+            metrics.observe_request(host, method, None, time.monotonic() - started, error=type(e).__name__)
+            raise
+
+        metrics.observe_request(host, method, response.status_code, time.monotonic() - started,
+                                received=len(response.content))
+        return response
 
 class RedditCrawler:
-    def __init__(self):
-        self.reddit = praw.Reddit(
-            client_id=Config.REDDIT_CLIENT_ID,
-            client_secret=Config.REDDIT_CLIENT_SECRET,
-            user_agent=Config.REDDIT_USER_AGENT
+    def __init__(self, rate_limiter: HostRateLimiter = None):
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.rate_gate = RedditRateGate()
+        
+        # PRAW 인스턴스는 스레드 안전하지 않으므로 워커 스레드마다 따로 만듭니다
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(
+            max_workers=Config.REDDIT_CONCURRENCY,
+            thread_name_prefix='reddit'
         )
         
         logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
         self.logger = logging.getLogger(__name__)
 
+    def _create_client(self) -> praw.Reddit:
+        return praw.Reddit(
+            client_id=Config.REDDIT_CLIENT_ID,
+            client_secret=Config.REDDIT_CLIENT_SECRET,
+            user_agent=Config.REDDIT_USER_AGENT,
+            requestor_class=InstrumentedRequestor
+        )
+
+    def _client(self) -> praw.Reddit:
+        client = getattr(self._local, 'reddit', None)
+        if client is None:
+            client = self._create_client()
+            self._local.reddit = client
+        return client
+
+    def _listing(self, subreddit_name: str, method: str, *args, **kwargs) -> List:
+        """워커 스레드에서 서브레딧 목록/검색 결과를 끝까지 가져옵니다."""
+        client = self._client()
+        queued = time.monotonic()
+        self.rate_gate.wait()
+        self.rate_limiter.acquire_sync(REDDIT_HOST)
+        metrics.observe_wait(REDDIT_HOST, time.monotonic() - queued)
+        try:
+            return list(getattr(client.subreddit(subreddit_name), method)(*args, **kwargs))
+        finally:
+            self.rate_gate.update(client.auth.limits)
+
+    def _fan_out(self, queries: List[Tuple[str, str, tuple, dict]]) -> List[Union[List, Exception]]:
+        """여러 목록/검색 요청을 동시에 보내고, 요청 순서대로 결과(또는 예외)를 반환합니다."""
+        futures = [
+            self._executor.submit(self._listing, subreddit_name, method, *args, **kwargs)
+            for subreddit_name, method, args, kwargs in queries
+        ]
+        
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
     def search_book_discussions(self, book_title: str, author: str = None, limit: int = 10) -> List[Dict]:
         """Reddit에서 특정 책에 대한 토론을 검색합니다."""
         search_query = f'"{book_title}"'
@@ -24,20 +128,21 @@ class RedditCrawler:
             discussions = []
             subreddits = ['books', 'booksuggestions', 'literature', 'reading', 'bookclub']
             
-            for subreddit_name in subreddits:
-                try:
-                    subreddit = self.reddit.subreddit(subreddit_name)
-                    submissions = subreddit.search(search_query, limit=limit//len(subreddits))
-                    
-                    for submission in submissions:
-                        discussion_data = self._parse_submission(submission)
-                        if discussion_data:
-                            discussion_data['subreddit'] = subreddit_name
-                            discussions.append(discussion_data)
-                            
-                except Exception as e:
-                    self.logger.warning(f"서브레딧 {subreddit_name} 검색 실패: {e}")
+            results = self._fan_out([
+                (subreddit_name, 'search', (search_query,), {'limit': limit//len(subreddits)})
+                for subreddit_name in subreddits
+            ])
+            
+            for subreddit_name, submissions in zip(subreddits, results):
+                if isinstance(submissions, Exception):
+                    self.logger.warning(f"서브레딧 {subreddit_name} 검색 실패: {submissions}")
                     continue
+                
+                for submission in submissions:
+                    discussion_data = self._parse_submission(submission)
+                    if discussion_data:
+                        discussion_data['subreddit'] = subreddit_name
+                        discussions.append(discussion_data)
             
             self.logger.info(f"'{book_title}'에 대한 {len(discussions)}개의 토론을 찾았습니다.")
             return discussions
@@ -64,8 +169,12 @@ class RedditCrawler:
             self.logger.error(f"게시물 파싱 실패: {e}")
             return None
 
-    def get_book_recommendations(self, limit: int = 50) -> List[Dict]:
-        """책 추천 관련 게시물들을 가져옵니다."""
+    def get_book_recommendations(self, limit: int = 50, since: Dict[str, float] = None) -> List[Dict]:
+        """책 추천 관련 게시물들을 가져옵니다.
+        
+        since(워터마크)가 주어지면 인기 게시물 대신 최신 게시물 중 워터마크 이후의 것만 가져오고,
+        since를 새로 본 가장 최근 created_utc로 갱신합니다.
+        """
         try:
             recommendations = []
             
@@ -78,24 +187,28 @@ class RedditCrawler:
                 'literature'
             ]
             
-            for subreddit_name in book_subreddits:
-                try:
-                    subreddit = self.reddit.subreddit(subreddit_name)
-                    
-                    # 인기 게시물 가져오기
-                    hot_posts = subreddit.hot(limit=limit//len(book_subreddits))
-                    
-                    for post in hot_posts:
-                        if self._is_recommendation_post(post):
-                            rec_data = self._parse_submission(post)
-                            if rec_data:
-                                rec_data['subreddit'] = subreddit_name
-                                rec_data['type'] = 'recommendation'
-                                recommendations.append(rec_data)
-                                
-                except Exception as e:
-                    self.logger.warning(f"서브레딧 {subreddit_name} 크롤링 실패: {e}")
+            # 인기(증분 크롤링이면 최신) 게시물을 서브레딧별로 동시에 가져오기
+            listing = 'hot' if since is None else 'new'
+            results = self._fan_out([
+                (subreddit_name, listing, (), {'limit': limit//len(book_subreddits)})
+                for subreddit_name in book_subreddits
+            ])
+            
+            for subreddit_name, hot_posts in zip(book_subreddits, results):
+                if isinstance(hot_posts, Exception):
+                    self.logger.warning(f"서브레딧 {subreddit_name} 크롤링 실패: {hot_posts}")
                     continue
+                
+                if since is not None:
+                    hot_posts = self._after_watermark(hot_posts, since, f"r/{subreddit_name}/new")
+                
+                for post in hot_posts:
+                    if self._is_recommendation_post(post):
+                        rec_data = self._parse_submission(post)
+                        if rec_data:
+                            rec_data['subreddit'] = subreddit_name
+                            rec_data['type'] = 'recommendation'
+                            recommendations.append(rec_data)
             
             self.logger.info(f"{len(recommendations)}개의 추천 게시물을 찾았습니다.")
             return recommendations
@@ -115,8 +228,9 @@ class RedditCrawler:
         title_lower = submission.title.lower()
         return any(keyword in title_lower for keyword in recommendation_keywords)
 
-    def get_book_reviews(self, book_title: str, author: str = None, limit: int = 20) -> List[Dict]:
-        """특정 책에 대한 리뷰를 검색합니다."""
+    def get_book_reviews(self, book_title: str, author: str = None, limit: int = 20,
+                         since: Dict[str, float] = None) -> List[Dict]:
+        """특정 책에 대한 리뷰를 검색합니다. since가 주어지면 검색어별 워터마크 이후 게시물만 반환합니다."""
         search_terms = [
             f'"{book_title}" review',
             f'"{book_title}" thoughts',
@@ -129,12 +243,19 @@ class RedditCrawler:
         try:
             reviews = []
             
-            for search_term in search_terms:
-                submissions = self.reddit.subreddit('books').search(
-                    search_term, 
-                    limit=limit//len(search_terms),
-                    sort='relevance'
-                )
+            sort = 'relevance' if since is None else 'new'
+            results = self._fan_out([
+                ('books', 'search', (search_term,), {'limit': limit//len(search_terms), 'sort': sort})
+                for search_term in search_terms
+            ])
+            
+            for search_term, submissions in zip(search_terms, results):
+                if isinstance(submissions, Exception):
+                    self.logger.warning(f"'{search_term}' 검색 실패: {submissions}")
+                    continue
+                
+                if since is not None:
+                    submissions = self._after_watermark(submissions, since, f"r/books/search/{search_term}")
                 
                 for submission in submissions:
                     if self._is_review_post(submission):
@@ -151,6 +272,16 @@ class RedditCrawler:
             self.logger.error(f"리뷰 검색 실패: {e}")
             return []
 
+    def _after_watermark(self, submissions: List, since: Dict[str, float], key: str) -> List:
+        """워터마크 이후에 작성된 게시물만 남기고 워터마크를 갱신합니다."""
+        watermark = since.get(key, 0)
+        newer = [submission for submission in submissions if submission.created_utc > watermark]
+        
+        if newer:
+            since[key] = max(submission.created_utc for submission in newer)
+        
+        return newer
+
     def _is_review_post(self, submission) -> bool:
         """게시물이 리뷰/감상문인지 판단합니다."""
         review_keywords = [
@@ -161,33 +292,53 @@ class RedditCrawler:
         title_lower = submission.title.lower()
         return any(keyword in title_lower for keyword in review_keywords)
 
-    def get_trending_books(self, limit: int = 30) -> List[Dict]:
-        """현재 트렌딩하는 책들을 찾습니다."""
+    def get_trending_books(self, limit: int = 30, resolver: MentionResolver = None) -> List[Dict]:
+        """현재 트렌딩하는 책들을 찾습니다.
+
+        resolver가 있으면 언급을 카탈로그 도서로 연결해 도서 ID별로 집계하고,
+        카탈로그에서 찾지 못한 따옴표 속 제목은 정규화된 제목별로 집계합니다.
+        """
         try:
-            trending_books = []
-            
             # 최근 인기 게시물에서 언급되는 책들 추출
-            subreddit = self.reddit.subreddit('books')
-            hot_posts = subreddit.hot(limit=limit)
-            
-            for post in hot_posts:
-                if post.score > 100:  # 인기 게시물만
-                    book_mentions = self._extract_book_mentions(post)
-                    for book in book_mentions:
-                        book['reddit_score'] = post.score
-                        book['reddit_comments'] = post.num_comments
-                        trending_books.append(book)
-            
-            # 중복 제거 및 점수순 정렬
-            unique_books = {}
-            for book in trending_books:
-                title = book.get('title', '')
-                if title not in unique_books or book['reddit_score'] > unique_books[title]['reddit_score']:
-                    unique_books[title] = book
-            
-            sorted_books = sorted(unique_books.values(), key=lambda x: x['reddit_score'], reverse=True)
-            
-            self.logger.info(f"{len(sorted_books)}개의 트렌딩 책을 찾았습니다.")
+            hot_posts = [post for post in self._listing('books', 'hot', limit=limit) if post.score > 100]
+            texts = [f"{post.title}\n{post.selftext}" for post in hot_posts]
+            
+            if resolver:
+                resolved = resolver.resolve_many(texts)
+            else:
+                resolved = [([], [mention['title'] for mention in self._extract_book_mentions(post)])
+                            for post in hot_posts]
+            
+            trending = {}
+            for post, (books, unmatched) in zip(hot_posts, resolved):
+                mentions = [(book['id'], book) for book in books]
+                mentions += [(f"title:{title}", {'title': title}) for title in unmatched]
+                
+                for key, book in mentions:
+                    entry = trending.get(key)
+                    if entry is None:
+                        entry = trending[key] = {
+                            'book_id': book.get('id'),
+                            'title': book.get('title'),
+                            'author': book.get('author'),
+                            'url': book.get('url'),
+                            'mentions': 0,
+                            'reddit_score': 0,
+                            'reddit_comments': 0,
+                            'mentioned_in': [],
+                            'context': 'reddit_trending'
+                        }
+                    if post.id in entry['mentioned_in']:
+                        continue
+                    entry['mentions'] += 1
+                    entry['reddit_score'] += post.score
+                    entry['reddit_comments'] += post.num_comments
+                    entry['mentioned_in'].append(post.id)
+            
+            sorted_books = sorted(trending.values(), key=lambda x: (x['mentions'], x['reddit_score']), reverse=True)
+            
+            linked = sum(1 for book in sorted_books if book['book_id'])
+            self.logger.info(f"{len(sorted_books)}개의 트렌딩 책을 찾았습니다. (카탈로그 연결 {linked}개)")
             return sorted_books
             
         except Exception as e:
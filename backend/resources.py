@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from config import Config
+from http_client import AsyncHttpClient
+from rate_limiter import HostRateLimiter
+from reddit_crawler import RedditCrawler
+from snapshot import SnapshotStore
+from catalog_loader import CatalogLoader
+from similarity import SimilarityIndex
+from corpus import TextCorpus
+from passages import PassageStore
+
+# 워커 프로세스 시작 방식: 이벤트 루프와 여러 스레드가 도는 서버 프로세스를 fork하면 다른 스레드가 쥔
+# 잠금까지 복제되어 워커가 멈출 수 있으므로, 깨끗한 서버 프로세스에서 워커를 띄웁니다
+PROCESS_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+class ResourcePool:
+    """여러 크롤링 작업이 함께 쓰는 오래 사는 자원입니다.
+
+    API 서버에서는 lifespan이 하나를 만들어 닫을 때까지 유지하므로, 작업이 바뀌어도
+    커넥션/TLS 세션, 디스크 캐시, 속도 제한 상태, Reddit 클라이언트와 워커 스레드,
+    mmap으로 열어 둔 본문 파일, 본문 분석용 워커 프로세스가 재사용됩니다.
+    일일 추천 스냅샷도 여기에 두어, 작업이 새 스냅샷을 만들면 API가 바로 그것을 제공합니다.
+    """
+
+    def __init__(self):
+        self.rate_limiter = HostRateLimiter()
+        self.http = AsyncHttpClient(rate_limiter=self.rate_limiter)
+        self._reddit: Optional[RedditCrawler] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self.daily_snapshot = SnapshotStore()
+        self.similarity: Optional[SimilarityIndex] = None
+        self.corpus = TextCorpus(self.http)
+        self.passages = PassageStore(self.corpus)
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def reddit(self) -> RedditCrawler:
+        # Reddit 자격 증명이 없어도 나머지 기능은 쓸 수 있도록 처음 필요할 때 만듭니다
+        if self._reddit is None:
+            self._reddit = RedditCrawler(self.rate_limiter)
+        return self._reddit
+
+    @property
+    def processes(self) -> ProcessPoolExecutor:
+        """본문 분석(가독성 점수, 명문장 추출)이 함께 쓰는 프로세스 풀입니다. 워커는 첫 작업을 넘길 때 뜹니다."""
+        # 워커가 비정상 종료하면(메모리 부족 등) 풀이 깨져 이후 작업을 받지 않으므로 새로 만듭니다
+        if self._processes is None or self._processes._broken:
+            self._processes = ProcessPoolExecutor(max_workers=Config.PROCESS_WORKERS or os.cpu_count(),
+                                                  mp_context=multiprocessing.get_context(PROCESS_START_METHOD))
+        return self._processes
+
+    async def build_similarity_index(self):
+        """일괄 카탈로그의 주제어/서재로 유사 도서 색인을 만듭니다 (HTML 목록에는 주제어가 없으므로 파일이 필요합니다)."""
+        if not Config.GUTENBERG_CATALOG_PATH:
+            self.logger.info("GUTENBERG_CATALOG_PATH가 없어 유사 도서 색인을 만들지 않습니다")
+            return
+
+        try:
+            self.similarity = await asyncio.to_thread(lambda: SimilarityIndex(CatalogLoader().iter_books()))
+        except Exception as e:
+            self.logger.error(f"유사 도서 색인 생성 실패: {e}")
+
+    def status(self) -> dict:
+        session = self.http._session
+        return {
+            "http_pool": "open" if session is not None and not session.closed else "idle",
+            "http_cache": "enabled" if self.http.cache else "disabled",
+            "open_circuits": self.http.circuit_breaker.open_hosts(),
+            "reddit_client": "ready" if self._reddit is not None else "not_created",
+            "process_pool": "ready" if self._processes is not None else "not_created",
+            "daily_snapshot": self.daily_snapshot.current.created_at.isoformat() if self.daily_snapshot.current else None,
+            "similarity_index": len(self.similarity) if self.similarity else None,
+            "open_texts": len(self.corpus._open),
+            "passage_cache_bytes": self.passages.cache.size
+        }
+
+    async def close(self):
+        self.corpus.close()
+        await self.http.close()
+        if self._reddit is not None:
+            self._reddit.close()
+            self._reddit = None
+        if self._processes is not None:
+            # 대기 중인 분석은 취소하고, 워커 종료는 스레드에서 기다려 이벤트 루프를 막지 않습니다
+            await asyncio.to_thread(self._processes.shutdown, cancel_futures=True)
+            self._processes = None
+        self.logger.info("공유 자원 정리 완료")
@@ -0,0 +1,207 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+from config import Config
+
+class CachedResponse:
+    """디스크 캐시에서 읽은 응답과 재검증 정보입니다."""
+
+    def __init__(self, status_code: int, headers: Dict[str, str], content: bytes,
+                 etag: Optional[str], last_modified: Optional[str], stored_at: float, ttl: float):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+        self.ttl = ttl
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.stored_at < self.ttl
+
+    def validation_headers(self) -> Dict[str, str]:
+        """조건부 요청(If-None-Match / If-Modified-Since) 헤더를 만듭니다."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+class ResponseCache:
+    """GET 응답을 디스크에 저장하는 HTTP 캐시입니다.
+
+    본문은 SHA-256 해시 이름의 파일로 저장(content-addressed)되어 같은 내용은 한 번만 저장되고,
+    URL별 메타데이터(ETag, Last-Modified, 저장/접근 시각)는 SQLite 색인에 기록됩니다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 접근하지 않은 항목부터 지웁니다.
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None, default_ttl: float = None, host_ttls: Dict[str, float] = None):
+        self.cache_dir = cache_dir or Config.HTTP_CACHE_DIR
+        self.max_bytes = max_bytes or Config.HTTP_CACHE_MAX_BYTES
+        self.default_ttl = Config.HTTP_CACHE_DEFAULT_TTL if default_ttl is None else default_ttl
+        self.host_ttls = host_ttls if host_ttls is not None else parse_host_ttls(Config.HTTP_CACHE_TTLS)
+
+        os.makedirs(os.path.join(self.cache_dir, 'blobs'), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(self.cache_dir, 'index.sqlite'), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                body_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access)")
+        self._db.commit()
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+
+    def ttl_for(self, url: str) -> float:
+        return self.host_ttls.get(urlsplit(url).netloc, self.default_ttl)
+
+    def _blob_path(self, body_hash: str) -> str:
+        return os.path.join(self.cache_dir, 'blobs', body_hash[:2], body_hash)
+
+    async def lookup(self, url: str) -> Optional[CachedResponse]:
+        return await asyncio.to_thread(self._lookup, url)
+
+    async def store(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        await asyncio.to_thread(self._store, url, status_code, headers, content)
+
+    async def refresh(self, url: str, headers: Dict[str, str]):
+        """304 응답을 받은 항목의 저장 시각과 검증자를 갱신합니다."""
+        await asyncio.to_thread(self._refresh, url, headers)
+
+    def _lookup(self, url: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body_hash, status, headers, etag, last_modified, stored_at FROM entries WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if not row:
+                return None
+
+            body_hash, status, headers, etag, last_modified, stored_at = row
+            try:
+                with open(self._blob_path(body_hash), 'rb') as f:
+                    content = f.read()
+            except OSError:
+                self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+                self._db.commit()
+                return None
+
+            self._db.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+
+        return CachedResponse(status, json.loads(headers), content, etag, last_modified, stored_at, self.ttl_for(url))
+
+    def _store(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        if self.ttl_for(url) <= 0:
+            return
+        if 'no-store' in headers.get('Cache-Control', ''):
+            return
+
+        body_hash = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(body_hash)
+
+        if not os.path.exists(blob_path):
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = f"{blob_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, blob_path)
+
+        now = time.time()
+        with self._lock:
+            previous = self._db.execute("SELECT body_hash FROM entries WHERE url = ?", (url,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, body_hash, len(content), status_code, json.dumps(dict(headers)),
+                 headers.get('ETag'), headers.get('Last-Modified'), now, now)
+            )
+            if previous and previous[0] != body_hash:
+                self._remove_blob_if_unused(previous[0])
+            self._evict()
+            self._db.commit()
+
+    def _refresh(self, url: str, headers: Dict[str, str]):
+        with self._lock:
+            now = time.time()
+            self._db.execute(
+                "UPDATE entries SET stored_at = ?, last_access = ?, "
+                "etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE url = ?",
+                (now, now, headers.get('ETag'), headers.get('Last-Modified'), url)
+            )
+            self._db.commit()
+
+    def _total_size(self) -> int:
+        row = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT body_hash, size FROM entries)"
+        ).fetchone()
+        return row[0]
+
+    def _evict(self):
+        """크기 한도를 넘으면 LRU 순서로 항목을 지웁니다. (호출 측에서 lock 보유)"""
+        total = self._total_size()
+        if total <= self.max_bytes:
+            return
+
+        rows = self._db.execute("SELECT url, body_hash FROM entries ORDER BY last_access ASC").fetchall()
+        evicted = 0
+        for url, body_hash in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            total -= self._remove_blob_if_unused(body_hash)
+            evicted += 1
+
+        self.logger.info(f"HTTP 캐시 정리: {evicted}개 항목 삭제")
+
+    def _remove_blob_if_unused(self, body_hash: str) -> int:
+        """다른 URL이 참조하지 않는 본문 파일을 지우고 지운 크기를 반환합니다."""
+        in_use = self._db.execute("SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1", (body_hash,)).fetchone()
+        if in_use:
+            return 0
+
+        blob_path = self._blob_path(body_hash)
+        try:
+            size = os.path.getsize(blob_path)
+            os.remove(blob_path)
+            return size
+        except OSError:
+            return 0
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+def parse_host_ttls(spec: Optional[str]) -> Dict[str, float]:
+    """'host=초,host2=초' 형식의 TTL 설정을 파싱합니다."""
+    ttls = {}
+    if not spec:
+        return ttls
+
+    for item in spec.split(','):
+        if '=' not in item:
+            continue
+        host, value = item.split('=', 1)
+        ttls[host.strip()] = float(value)
+
+    return ttls
@@ -0,0 +1,136 @@
+import logging
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from scipy import sparse
+from config import Config
+from title_matcher import fold
+
+# 필드별 가중치 (주제어가 가장 구체적이고, Goodreads 장르는 넓은 분류입니다)
+FIELD_WEIGHTS = {
+    'subject': 1.0,
+    'bookshelf': 0.8,
+    'genre': 0.6
+}
+
+@lru_cache(maxsize=65536)
+def _feature_names(field: str, value: str) -> Tuple[str, ...]:
+    # 같은 주제어/서재가 카탈로그 전체에 반복되므로 정규화 결과를 재사용합니다
+    parts = [fold(part) for part in value.split('--')]
+    names = {fold(value), *(parts if len(parts) > 1 else [])}
+    return tuple(f"{field}:{name}" for name in names if name)
+
+def book_features(book: Dict) -> List[Tuple[str, float]]:
+    """책의 주제어, 서재, 장르를 'field:value' 특징으로 바꿉니다.
+
+    'England -- Fiction' 같은 LCSH 주제어는 전체 문구와 각 부분을 모두 특징으로 씁니다.
+    """
+    features = {}
+    for field, key in (('subject', 'subjects'), ('bookshelf', 'bookshelves'), ('genre', 'genres')):
+        weight = FIELD_WEIGHTS[field]
+        for value in book.get(key) or []:
+            for name in _feature_names(field, value):
+                features[name] = weight
+    return list(features.items())
+
+class SimilarityIndex:
+    """주제어/서재/장르 TF-IDF 벡터로 비슷한 책을 찾는 색인입니다.
+
+    행이 L2 정규화된 희소 행렬을 CSC로도 들고 있어, 질의 책들이 가진 특징 열만 잘라
+    행렬 곱 한 번으로 전체 카탈로그와의 코사인 유사도를 구한 뒤 argpartition으로 상위 k개만 정렬합니다.
+    """
+
+    def __init__(self, books: Iterable[Dict]):
+        started = time.perf_counter()
+
+        self.books: List[Dict] = []
+        self.row_of: Dict[str, int] = {}
+        vocabulary: Dict[str, int] = {}
+        rows, cols, values = [], [], []
+
+        for book in books:
+            features = book_features(book)
+            if not features or not book.get('id'):
+                continue
+
+            row = len(self.books)
+            self.row_of[str(book['id'])] = row
+            self.books.append({key: book.get(key) for key in ('id', 'title', 'author', 'url', 'downloads')})
+            for name, weight in features:
+                rows.append(row)
+                cols.append(vocabulary.setdefault(name, len(vocabulary)))
+                values.append(weight)
+
+        shape = (len(self.books), len(vocabulary))
+        matrix = sparse.csr_matrix((np.array(values, dtype=np.float32), (rows, cols)), shape=shape)
+
+        # idf = log((1 + N) / (1 + df)) + 1, 이후 행마다 L2 정규화
+        df = np.bincount(matrix.indices, minlength=shape[1])
+        idf = np.log((1 + shape[0]) / (1 + df)).astype(np.float32) + 1
+        matrix = matrix @ sparse.diags(idf)
+        norms = np.sqrt(matrix.multiply(matrix).sum(axis=1)).A1
+        norms[norms == 0] = 1
+        self.matrix = sparse.csr_matrix(sparse.diags(1 / norms) @ matrix, dtype=np.float32)
+        self._columns = self.matrix.tocsc()
+        self.vocabulary = vocabulary
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+        self.logger.info(f"유사도 색인 생성: {shape[0]}권, 특징 {shape[1]}개, "
+                         f"{time.perf_counter() - started:.1f}초")
+
+    def __len__(self) -> int:
+        return len(self.books)
+
+    def __contains__(self, book_id) -> bool:
+        return str(book_id) in self.row_of
+
+    def book(self, book_id) -> Optional[Dict]:
+        row = self.row_of.get(str(book_id))
+        return self.books[row] if row is not None else None
+
+    def similar(self, book_id, k: int = 10) -> List[Dict]:
+        return self.similar_many([book_id], k)[0]
+
+    def similar_many(self, book_ids: List, k: int = 10, batch_size: int = 16) -> List[List[Dict]]:
+        """책마다 가장 비슷한 책 k권을 (점수 내림차순으로) 반환합니다. 모르는 ID는 빈 목록입니다."""
+        rows = [self.row_of.get(str(book_id)) for book_id in book_ids]
+        known = [row for row in rows if row is not None]
+        results: Dict[int, List[Dict]] = {}
+
+        for start in range(0, len(known), batch_size):
+            batch = known[start:start + batch_size]
+            queries = self.matrix[batch]
+            features = np.unique(queries.indices)
+
+            # (질의 x 특징) @ (특징 x 카탈로그) -> (질의 x 카탈로그), 질의에 없는 특징 열은 읽지 않습니다
+            scores = (self._columns[:, features] @ queries[:, features].T.toarray()).T
+            # 질의마다 한 행으로 모아야 argpartition이 빠릅니다 (배치가 작아야 이 복사가 캐시 안에서 끝납니다)
+            scores = np.ascontiguousarray(scores)
+            scores[np.arange(len(batch)), batch] = -1  # 자기 자신 제외
+
+            for row, top in zip(batch, self._top_k(scores, k)):
+                results[row] = [
+                    {**self.books[other], 'score': round(float(score), 4)}
+                    for other, score in top
+                ]
+
+        return [results.get(row, []) if row is not None else [] for row in rows]
+
+    def _top_k(self, scores: np.ndarray, k: int) -> List[List[Tuple[int, float]]]:
+        """질의(행)마다 점수가 0보다 큰 상위 k개 (행 번호, 점수)를 내림차순으로 반환합니다."""
+        k = min(k, scores.shape[1] - 1)
+        if k <= 0:
+            return [[] for _ in range(len(scores))]
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        return [
+            [(int(row), float(score)) for row, score in zip(rows, row_scores) if score > 0]
+            for rows, row_scores in zip(top, top_scores)
+        ]
@@ -0,0 +1,72 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Optional
+from atomic_files import atomic_write
+from config import Config
+
+class Snapshot:
+    """직렬화와 압축을 미리 끝내 둔 응답 본문입니다. 만든 뒤에는 바뀌지 않습니다."""
+
+    def __init__(self, body: bytes, gzipped: bytes = None, created_at: datetime = None):
+        self.body = body
+        self.gzipped = gzipped if gzipped is not None else gzip.compress(body, mtime=0)
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.created_at = created_at or datetime.now()
+
+    @classmethod
+    def from_data(cls, data: Dict) -> 'Snapshot':
+        return cls(json.dumps(data, ensure_ascii=False, default=str).encode('utf-8'))
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """If-None-Match 헤더가 현재 ETag를 가리키는지 확인합니다."""
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in tags or any(tag.removeprefix('W/') == self.etag for tag in tags)
+
+class SnapshotStore:
+    """가장 최근의 일일 추천 스냅샷을 메모리와 파일에 보관합니다.
+
+    새 스냅샷은 파일에 먼저 쓰고 current 참조를 한 번에 바꾸므로,
+    읽는 쪽은 항상 완전한 이전 스냅샷이나 새 스냅샷 중 하나를 보게 됩니다.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or Config.DAILY_SNAPSHOT_PATH
+        self.current: Optional[Snapshot] = None
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+
+    def load(self) -> bool:
+        """저장된 스냅샷 파일(gzip 압축 JSON)을 읽어 옵니다."""
+        if not os.path.exists(self.path):
+            return False
+
+        try:
+            with open(self.path, 'rb') as f:
+                gzipped = f.read()
+            snapshot = Snapshot(gzip.decompress(gzipped), gzipped,
+                                datetime.fromtimestamp(os.path.getmtime(self.path)))
+        except (OSError, EOFError, gzip.BadGzipFile) as e:
+            self.logger.warning(f"일일 추천 스냅샷을 읽지 못했습니다 ({self.path}): {e}")
+            return False
+
+        self.current = snapshot
+        self.logger.info(f"일일 추천 스냅샷 로드: {self.path}")
+        return True
+
+    def publish(self, data: Dict) -> Snapshot:
+        snapshot = Snapshot.from_data(data)
+
+        # 예약 작업과 수동 업데이트가 동시에 발행해도 서로의 임시 파일을 덮어쓰지 않습니다
+        with atomic_write(self.path) as f:
+            f.write(snapshot.gzipped)
+
+        self.current = snapshot
+        self.logger.info(f"일일 추천 스냅샷 교체: {self.path} ({len(snapshot.body)} bytes)")
+        return snapshot
@@ -0,0 +1,96 @@
+from typing import Iterable, Tuple
+import numpy as np
+
+# 마침표가 문장 끝이 아닌 약어 (소문자로 비교)
+ABBREVIATIONS = {'mr', 'mrs', 'ms', 'dr', 'st', 'messrs', 'jr', 'sr', 'capt', 'col', 'gen', 'lieut',
+                 'rev', 'prof', 'hon', 'esq', 'vol', 'ch', 'viz', 'vs', 'etc'}
+
+def byte_table(chars: bytes) -> np.ndarray:
+    table = np.zeros(256, dtype=bool)
+    table[np.frombuffer(chars, dtype=np.uint8)] = True
+    return table
+
+VOWEL = byte_table(b'aeiouy')
+TERMINAL = byte_table(b'.!?')
+# 문장 부호 뒤에 이 문자가 오면 문장 끝으로 봅니다 (\xe2 는 UTF-8 ” ’ 의 첫 바이트)
+AFTER_TERMINAL = byte_table(b' \r\n\t"\')]_\xe2')
+
+def shift(mask: np.ndarray, step: int) -> np.ndarray:
+    """step > 0 이면 앞 글자, step < 0 이면 뒤 글자의 값을 같은 위치에 놓습니다."""
+    shifted = np.zeros_like(mask)
+    if step > 0:
+        shifted[step:] = mask[:-step]
+    else:
+        shifted[:step] = mask[-step:]
+    return shifted
+
+def lower(raw: np.ndarray) -> np.ndarray:
+    """ASCII 대문자만 소문자로 바꾼 사본입니다. (UTF-8 멀티바이트 문자는 그대로)"""
+    return raw | ((raw >= ord('A')) & (raw <= ord('Z'))).astype(np.uint8) * 32
+
+def word_spans(buf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """소문자 바이트 배열에서 단어(알파벳 연속 구간, 단어 안의 ' 포함)의 시작과 마지막 글자 위치입니다.
+
+    UTF-8 멀티바이트 문자는 글자로 보지 않으므로 'naïve' 는 두 단어가 됩니다.
+    """
+    letter = (buf >= ord('a')) & (buf <= ord('z'))
+    in_word = letter | ((buf == ord("'")) & shift(letter, 1) & shift(letter, -1))
+    starts = np.flatnonzero(in_word & ~shift(in_word, 1))
+    ends = np.flatnonzero(in_word & ~shift(in_word, -1))
+    return starts, ends
+
+def word_hashes(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """단어마다 바이트 다항식 해시(mod 2^64)를 구합니다. 같은 단어는 어느 본문에서든 같은 값입니다."""
+    if not len(starts):
+        return np.zeros(0, dtype=np.uint64)
+    lengths = ends - starts + 1
+    word_of = np.repeat(np.arange(len(starts)), lengths)
+    positions = np.arange(len(word_of)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    chars = buf[starts[word_of] + positions].astype(np.uint64)
+    with np.errstate(over='ignore'):
+        powers = np.uint64(1099511628211) ** positions.astype(np.uint64)
+        return np.add.reduceat(chars * powers, np.cumsum(lengths) - lengths, dtype=np.uint64)
+
+def hash_words(words: Iterable[str]) -> np.ndarray:
+    """word_hashes와 같은 방식으로 단어 목록의 해시를 구합니다. (정렬된 배열)"""
+    text = ' '.join(words).encode('ascii', 'ignore').lower()
+    buf = np.frombuffer(text, dtype=np.uint8)
+    return np.unique(word_hashes(buf, *word_spans(buf)))
+
+def sentence_boundaries(raw: np.ndarray, buf: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """문장이 끝나는 위치입니다: 연속된 .!? 의 마지막 뒤에 공백/따옴표가 오거나, 빈 줄.
+
+    'Mr.' 같은 약어와 이름 머리글자('J.') 뒤의 마침표는 경계가 아닙니다.
+    """
+    terminal = TERMINAL[buf] & ~shift(TERMINAL[buf], -1) & AFTER_TERMINAL[np.append(buf[1:], ord(' '))]
+    newline = buf == ord('\n')
+    boundaries = np.flatnonzero(terminal | (newline & shift(newline, -1)))
+    if not len(starts):
+        return boundaries
+
+    periods = boundaries[raw[boundaries] == ord('.')]
+    word = np.minimum(np.searchsorted(ends, periods - 1), len(ends) - 1)
+    lengths = ends[word] - starts[word] + 1
+    attached = (ends[word] == periods - 1) & (lengths <= ABBREVIATION_LENGTH)
+    periods, word, lengths = periods[attached], word[attached], lengths[attached]
+
+    initial = raw[starts[word]]
+    is_initial = ((lengths == 1) & (initial >= ord('A')) & (initial <= ord('Z'))
+                  & ~np.isin(initial, (ord('A'), ord('I'))))
+    is_abbreviation = np.isin(_word_keys(buf, starts[word], lengths), ABBREVIATION_KEYS)
+
+    return np.setdiff1d(boundaries, periods[is_initial | is_abbreviation], assume_unique=True)
+
+def _word_keys(buf: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """ABBREVIATION_LENGTH 글자 이하 단어를 바이트를 이어 붙인 정수 하나로 바꿉니다."""
+    offsets = np.arange(ABBREVIATION_LENGTH)
+    index = np.minimum(starts[:, None] + offsets, len(buf) - 1)
+    chars = np.where(offsets < lengths[:, None], buf[index], 0).astype(np.uint64)
+    return (chars << (np.uint64(8) * offsets.astype(np.uint64))).sum(axis=1, dtype=np.uint64)
+
+ABBREVIATION_LENGTH = max(map(len, ABBREVIATIONS))
+ABBREVIATION_KEYS = _word_keys(
+    np.frombuffer(' '.join(sorted(ABBREVIATIONS)).encode('ascii'), dtype=np.uint8),
+    np.cumsum([0] + [len(word) + 1 for word in sorted(ABBREVIATIONS)][:-1]),
+    np.array([len(word) for word in sorted(ABBREVIATIONS)])
+)
@@ -0,0 +1,162 @@
+import math
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# 제목 맨 앞에서 떼어 낼 관사 (영어 외에 카탈로그에 흔한 프랑스어/독일어/스페인어 관사 포함)
+ARTICLES = {'the', 'a', 'an', 'le', 'la', 'les', 'l', 'der', 'die', 'das', 'el', 'los', 'las'}
+
+# 후보 검색에서 꼭 필요한 것보다 더 읽을 포스팅 목록 수 (많을수록 후보가 줄고 목록 읽기가 늘어남)
+PREFIX_SLACK = 2
+
+# 이름 뒤에 붙는 호칭은 성으로 보지 않습니다
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv'}
+
+def fold(text: str) -> str:
+    """소문자로 바꾸고 'Brontë' 의 ë 같은 발음 구별 기호를 없앤 뒤, 문장 부호를 공백으로 바꿉니다."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.casefold().replace('&', ' and ')
+    text = re.sub(r"['’]", '', text)
+    return ' '.join(re.sub(r'[\W_]+', ' ', text).split())
+
+def normalize_title(title: str) -> str:
+    """비교용 제목: 부제(';' ':' ' - ' 뒤, 괄호 안)와 앞의 관사를 뗀 형태입니다.
+
+    'The Strange Case of Dr. Jekyll and Mr. Hyde' -> 'strange case of dr jekyll and mr hyde'
+    'Moby Dick; Or, The Whale' -> 'moby dick'
+    """
+    title = re.sub(r'\([^)]*\)|\[[^\]]*\]', ' ', title or '')
+    main = re.split(r'[;:]|\s[-–—]\s|,\s*or,?\s', title, maxsplit=1, flags=re.IGNORECASE)[0]
+    words = fold(main).split() or fold(title).split()
+    if len(words) > 1 and words[0] in ARTICLES:
+        words = words[1:]
+    return ' '.join(words)
+
+def author_surnames(author: str) -> Set[str]:
+    """'Jane Austen, Charlotte Brontë' 처럼 쉼표로 이어진 작가 이름들에서 성을 모읍니다."""
+    surnames = set()
+    for name in (author or '').split(','):
+        words = [word for word in fold(name).split() if word not in NAME_SUFFIXES and not word.isdigit()]
+        if words:
+            surnames.add(words[-1])
+    return surnames
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def dice(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+class TitleMatcher:
+    """정규화된 제목의 트라이그램 역색인으로 후보를 좁히고, 제목/작가 유사도로 점수를 매깁니다.
+
+    - 점수: 제목 유사도 0.75 + 작가 성 유사도 0.25 (작가를 모르면 제목 유사도만),
+      동점이면 다운로드 수가 많은 책
+    - 제목 유사도: 트라이그램 Dice 계수, 또는 질의 트라이그램이 제목에 포함된 비율 x 0.85
+      ('Alice in Wonderland' 처럼 줄여 부르는 제목을 위해) 중 큰 값
+    - 후보 검색: min_score를 넘으려면 질의 트라이그램 중 최소 몇 개가 겹쳐야 하는지 계산하고,
+      가장 드문 트라이그램들의 포스팅 목록만 훑습니다 (prefix filtering).
+      놓치는 후보가 없으면서도 흔한 트라이그램의 긴 목록은 읽지 않습니다.
+    """
+
+    def __init__(self, min_score: float = 0.8):
+        self.min_score = min_score
+
+        self.books: List[Dict] = []
+        self._titles: List[str] = []
+        self._grams: List[Set[str]] = []
+        self._surnames: List[Dict[str, Set[str]]] = []
+        self._postings: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.books)
+
+    def add(self, book: Dict):
+        title = normalize_title(book.get('title', ''))
+        if not title:
+            return
+
+        doc_id = len(self.books)
+        grams = trigrams(title)
+
+        self.books.append(book)
+        self._titles.append(title)
+        self._grams.append(grams)
+        self._surnames.append({name: trigrams(name) for name in author_surnames(book.get('author', ''))})
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(doc_id)
+
+    def entries(self) -> Iterator[Tuple[Dict, str, Set[str]]]:
+        """색인된 (책, 정규화된 제목, 작가 성 집합)을 차례로 반환합니다."""
+        for book, title, surnames in zip(self.books, self._titles, self._surnames):
+            yield book, title, set(surnames)
+
+    def match(self, title: str, author: str = None) -> Optional[Tuple[Dict, float]]:
+        """가장 잘 맞는 책과 점수(0~1)를 반환합니다. min_score에 못 미치면 None입니다."""
+        query = normalize_title(title)
+        if not query:
+            return None
+        surnames = {name: trigrams(name) for name in author_surnames(author)} if author else {}
+        query_grams = trigrams(query)
+        needed = self._needed_title_score(bool(surnames))
+
+        best, best_key = None, None
+        for doc_id in self._candidates(query_grams, needed):
+            score = self._score(doc_id, query, query_grams, surnames, needed)
+            if score < self.min_score:
+                continue
+            key = (score, self.books[doc_id].get('downloads') or 0, -doc_id)
+            if best_key is None or key > best_key:
+                best, best_key = doc_id, key
+
+        if best is None:
+            return None
+        return self.books[best], best_key[0]
+
+    def _needed_title_score(self, has_author: bool) -> float:
+        """작가가 완전히 일치해도 min_score를 넘으려면 필요한 최소 제목 유사도입니다."""
+        return (self.min_score - 0.25) / 0.75 if has_author else self.min_score
+
+    def _candidates(self, query_grams: Set[str], needed: float) -> List[int]:
+        # 최소 제목 유사도를 얻는 데 필요한 최소 겹침 비율
+        if needed <= 0:
+            return list(range(len(self.books)))
+        overlap_ratio = min(needed / (2 - needed), needed / 0.85, 1.0)
+        min_overlap = max(1, math.ceil(overlap_ratio * len(query_grams) - 1e-9))
+
+        # 최소 min_overlap개가 겹치는 제목은 드문 순서로 앞쪽 (n - min_overlap + 1)개 중 하나는 반드시 가집니다.
+        # 앞쪽을 PREFIX_SLACK개 더 읽고, 나머지에서 채울 수 있는 것보다 적게 겹친 후보는 버립니다
+        grams = sorted(query_grams, key=lambda gram: len(self._postings.get(gram, ())))
+        prefix = min(len(grams), len(grams) - min_overlap + 1 + PREFIX_SLACK)
+        required = min_overlap - (len(grams) - prefix)
+
+        counts = Counter()
+        for gram in grams[:prefix]:
+            counts.update(self._postings.get(gram, ()))
+        return [doc_id for doc_id, count in counts.items() if count >= required]
+
+    def _score(self, doc_id: int, query: str, query_grams: Set[str],
+               surnames: Dict[str, Set[str]], needed: float) -> float:
+        if self._titles[doc_id] == query:
+            title_score = 1.0
+        else:
+            grams = self._grams[doc_id]
+            shared = len(query_grams & grams)
+            title_score = max(2 * shared / (len(query_grams) + len(grams)), 0.85 * shared / len(query_grams))
+        if not surnames:
+            return title_score
+        if title_score < needed:
+            # 작가가 일치해도 min_score에 못 미치므로 작가 유사도는 계산하지 않습니다
+            return 0.75 * title_score
+
+        book_surnames = self._surnames[doc_id]
+        if surnames.keys() & book_surnames.keys():
+            author_score = 1.0
+        else:
+            author_score = max((dice(a, b) for a in surnames.values() for b in book_surnames.values()), default=0.0)
+        return 0.75 * title_score + 0.25 * author_score
@@ -0,0 +1,118 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+from typing import Dict, Iterable, Iterator, List
+from config import Config
+from http_client import AsyncHttpClient, RETRYABLE_STATUS
+from backup import BackupWriter
+
+class UploadResult:
+    """청크 업로드 결과입니다."""
+
+    def __init__(self):
+        self.uploaded_chunks = 0
+        self.uploaded_records = 0
+        self.failed_chunks = 0
+        self.failed_records = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.failed_chunks == 0
+
+    def __str__(self) -> str:
+        return (f"성공 {self.uploaded_chunks}개 청크({self.uploaded_records}건), "
+                f"실패 {self.failed_chunks}개 청크({self.failed_records}건)")
+
+def encode_chunk(records: List[Dict]) -> bytes:
+    """레코드들을 gzip으로 압축한 NDJSON 본문으로 만듭니다."""
+    lines = ''.join(json.dumps(record, ensure_ascii=False, default=str) + '\n' for record in records)
+    # mtime을 고정해야 같은 내용이 같은 바이트(=같은 멱등 키)가 됩니다
+    return gzip.compress(lines.encode('utf-8'), mtime=0)
+
+def chunked(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class ChunkedUploader:
+    """크롤링 결과를 일정 크기의 청크로 나누어 병렬로 업로드합니다.
+
+    - 본문: gzip 압축 NDJSON (한 줄에 {"kind": ..., "data": ...} 레코드 하나)
+    - Idempotency-Key: 청크 본문의 SHA-256이므로 재시도/재실행 시 서버가 중복을 걸러낼 수 있습니다
+    - 청크마다 지수 백오프로 재시도하고, 실패는 해당 청크에만 영향을 줍니다
+    - 동시에 업로드 중인 청크 수를 제한하므로 레코드 스트림 전체를 메모리에 올리지 않습니다
+    - 끝내 실패한 청크의 레코드는 backup에 바로 기록됩니다
+    """
+
+    def __init__(self, http: AsyncHttpClient, url: str, chunk_size: int = None,
+                 concurrency: int = None, max_retries: int = None, backup: BackupWriter = None):
+        self.http = http
+        self.url = url
+        self.backup = backup
+        self.chunk_size = chunk_size or Config.UPLOAD_CHUNK_SIZE
+        self.concurrency = concurrency or Config.UPLOAD_CONCURRENCY
+        self.max_retries = Config.MAX_RETRIES if max_retries is None else max_retries
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+
+    async def upload(self, records: Iterable[Dict]) -> UploadResult:
+        result = UploadResult()
+        slots = asyncio.Semaphore(self.concurrency)
+        tasks = []
+
+        for index, chunk in enumerate(chunked(records, self.chunk_size)):
+            await slots.acquire()
+            task = asyncio.create_task(self._upload_chunk(index, chunk, result))
+            task.add_done_callback(lambda _: slots.release())
+            tasks.append(task)
+
+        await asyncio.gather(*tasks)
+
+        self.logger.info(f"청크 업로드 완료: {result}")
+        return result
+
+    async def _upload_chunk(self, index: int, records: List[Dict], result: UploadResult):
+        body = encode_chunk(records)
+        headers = {
+            'Content-Type': 'application/x-ndjson',
+            'Content-Encoding': 'gzip',
+            'Idempotency-Key': hashlib.sha256(body).hexdigest(),
+            'X-Chunk-Index': str(index),
+            'X-Record-Count': str(len(records))
+        }
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                # 재시도와 백업은 여기서 직접 처리합니다
+                response = await self.http.post(self.url, data=body, headers=headers, timeout=30,
+                                                rate_limited=False, retries=0)
+                if response.status_code < 300:
+                    result.uploaded_chunks += 1
+                    result.uploaded_records += len(records)
+                    return
+
+                error = f"{response.status_code} - {response.text[:200]}"
+                # 청크마다 Idempotency-Key가 있으므로 POST여도 재시도 가능한 응답은 모두 다시 보냅니다
+                if response.status_code not in RETRYABLE_STATUS:
+                    break
+            except Exception as e:
+                error = str(e)
+
+            if attempt < self.max_retries:
+                delay = Config.UPLOAD_RETRY_BACKOFF * (2 ** attempt)
+                self.logger.warning(f"청크 {index} 업로드 실패 ({error}), {delay:.1f}초 후 재시도")
+                await asyncio.sleep(delay)
+
+        self.logger.error(f"청크 {index} 업로드 최종 실패: {error}")
+        result.failed_chunks += 1
+        result.failed_records += len(records)
+        if self.backup:
+            self.backup.write_many(records)
@@ -0,0 +1,76 @@
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Optional
+from atomic_files import atomic_write
+from config import Config
+
+class WatermarkStore:
+    """소스별 증분 크롤링 워터마크를 JSON 파일에 저장합니다.
+
+    - gutenberg: 지금까지 본 가장 큰 ebook ID와 가장 최근 출간일
+    - reddit: 서브레딧 목록/검색어별로 본 가장 최근 created_utc
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or Config.WATERMARK_PATH
+        self.gutenberg: Dict = {}
+        self.reddit: Dict[str, float] = {}
+
+        logging.basicConfig(level=getattr(logging, Config.LOG_LEVEL))
+        self.logger = logging.getLogger(__name__)
+
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.gutenberg = data.get('gutenberg', {})
+            self.reddit = data.get('reddit', {})
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"워터마크 파일을 읽지 못했습니다 ({self.path}): {e}")
+
+    def save(self):
+        """고유한 임시 파일에 쓴 뒤 교체하여, 저장 도중 중단되거나 동시에 저장해도 온전한 워터마크가 남도록 합니다."""
+        data = {
+            'gutenberg': self.gutenberg,
+            'reddit': self.reddit,
+            'updated_at': datetime.now().isoformat()
+        }
+
+        with atomic_write(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+        self.logger.info(f"워터마크 저장 완료: {self.path}")
+
+    @property
+    def max_ebook_id(self) -> Optional[int]:
+        return self.gutenberg.get('max_ebook_id')
+
+    def update_gutenberg(self, book: Dict):
+        """수집한 책의 ID와 출간일로 Gutenberg 워터마크를 올립니다."""
+        try:
+            book_id = int(book.get('id', ''))
+        except ValueError:
+            return
+
+        if book_id > self.gutenberg.get('max_ebook_id', 0):
+            self.gutenberg['max_ebook_id'] = book_id
+
+        release_date = _parse_release_date(book.get('release_date', ''))
+        if release_date and release_date > self.gutenberg.get('latest_release_date', ''):
+            self.gutenberg['latest_release_date'] = release_date
+
+def _parse_release_date(text: str) -> Optional[str]:
+    """'Jun 1, 1998' 형태의 출간일을 비교 가능한 ISO 날짜로 바꿉니다."""
+    for fmt in ('%b %d, %Y', '%B %d, %Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(text.strip(), fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None